@@ -0,0 +1,126 @@
+# benchmarks/bench_auth.py
+# Run with: python -m benchmarks.bench_auth
+# In-process (Flask test client) on a scratch SQLite DB:
+#   - authenticated requests with and without the load_user cache
+#   - a login storm from CLIENTS addresses at once, while one more client
+#     keeps reading GET /posts, for several hashing costs and pool sizes
+#   - repeated logins from a single address against the rate limit
+import collections
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+CLIENTS = 16
+LOGINS_PER_CLIENT = 4
+AUTHED_REQUESTS = 2000
+
+STORMS = [
+    ("260k iterations, 16 hash threads", 'pbkdf2:sha256:260000', 16),
+    ("260k iterations, 2 hash threads", 'pbkdf2:sha256:260000', 2),
+    ("50k iterations, 2 hash threads", 'pbkdf2:sha256:50000', 2),
+]
+
+
+def client_for(fb, address):
+    client = fb.app.test_client()
+    client.environ_base['REMOTE_ADDR'] = address
+    return client
+
+
+def percentiles(values):
+    return np.percentile(values, [50, 99]) * 1000
+
+
+def authed_requests(fb, ttl):
+    fb.user_cache.ttl = ttl
+    client = client_for(fb, '10.1.0.1')
+    client.post('/login', json={'username': 'reader', 'password': 'secret'})
+    t0 = time.perf_counter()
+    for _ in range(AUTHED_REQUESTS):
+        client.get('/test_auth')
+    return AUTHED_REQUESTS / (time.perf_counter() - t0)
+
+
+def storm(fb, prefix):
+    login_latencies, read_latencies, statuses = [], [], []
+    done = threading.Event()
+    lock = threading.Lock()
+
+    def login_loop(index):
+        client = client_for(fb, f'10.0.{index // 250}.{index % 250}')
+        local, codes = [], []
+        for _ in range(LOGINS_PER_CLIENT):
+            t0 = time.perf_counter()
+            codes.append(client.post('/login', json={'username': f'{prefix}{index}', 'password': 'secret'}).status_code)
+            local.append(time.perf_counter() - t0)
+        with lock:
+            login_latencies.extend(local)
+            statuses.extend(codes)
+
+    def read_loop():
+        client = client_for(fb, '10.2.0.1')
+        client.post('/login', json={'username': 'reader', 'password': 'secret'})
+        while not done.is_set():
+            t0 = time.perf_counter()
+            client.get('/posts')
+            read_latencies.append(time.perf_counter() - t0)
+
+    reader = threading.Thread(target=read_loop)
+    reader.start()
+    threads = [threading.Thread(target=login_loop, args=(i,)) for i in range(CLIENTS)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    done.set()
+    reader.join()
+    return len(login_latencies) / elapsed, percentiles(login_latencies), percentiles(read_latencies), statuses
+
+
+def main():
+    os.environ['FORUM_DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'forum.db')}"
+    os.environ['FORUM_AUTH_RATE_LIMIT'] = '1000'
+    os.environ['FORUM_ADDRESS_RATE_LIMIT'] = '100000'
+    os.environ['FORUM_REGISTER_RATE_LIMIT'] = '100000'
+    import forum_backend as fb
+    from forum_auth import AuthMetrics, PasswordHasher, RateLimiter
+    logging.getLogger('forum_backend').setLevel(logging.ERROR)
+
+    fb.password_hasher = PasswordHasher('pbkdf2:sha256:1000', workers=2)
+    client_for(fb, '10.9.0.1').post('/register', json={'username': 'reader', 'password': 'secret'})
+    session_db = fb.Session()
+    session_db.add_all([fb.Post(title=f'Post {i}', content='Body', upvotes=0, tags='') for i in range(100)])
+    session_db.commit()
+    fb.Session.remove()
+
+    print(f"authenticated GET /test_auth: no user cache {authed_requests(fb, 0):7,.0f} req/s, "
+          f"cached {authed_requests(fb, 60):7,.0f} req/s")
+
+    print(f"login storm: {CLIENTS} clients x {LOGINS_PER_CLIENT} logins, one reader on GET /posts "
+          f"({os.cpu_count()} CPUs)")
+    for number, (name, method, workers) in enumerate(STORMS):
+        fb.password_hasher = PasswordHasher(method, workers=workers)
+        prefix = f'storm{number}_'
+        for i in range(CLIENTS):
+            client_for(fb, '10.9.0.1').post('/register', json={'username': f'{prefix}{i}', 'password': 'secret'})
+        fb.auth_metrics = AuthMetrics()
+        rate, (login_p50, login_p99), (read_p50, read_p99), statuses = storm(fb, prefix)
+        print(f"  {name:<34} {rate:6.1f} logins/s  login p50 {login_p50:6.0f} ms p99 {login_p99:6.0f} ms  "
+              f"reader p50 {read_p50:5.1f} ms p99 {read_p99:6.1f} ms  "
+              f"status {dict(sorted(collections.Counter(statuses).items()))}")
+    print(f"  /auth/metrics after the last storm: {fb.auth_metrics.snapshot()['login']}")
+
+    fb.rate_limiter = RateLimiter(limit=20, window=60)
+    client = client_for(fb, '10.3.0.1')
+    codes = [client.post('/login', json={'username': 'reader', 'password': 'wrong'}).status_code for _ in range(30)]
+    print(f"30 failed logins from one address, limit 20/min: {codes.count(401)} x 401, {codes.count(429)} x 429")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_downsample.py
+# Run with: python -m benchmarks.bench_downsample
+# Builds the main price chart the way sections/price_chart.py does, with and without
+# downsampling, and reports figure build time and JSON payload size.
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from downsample import DEFAULT_MAX_POINTS, downsample_indices
+
+
+def build_figure(data):
+    fig = px.line(data, x='Date', y='Adj Close', title="Stock Price",
+                  labels={'Adj Close': 'Adjusted Close'})
+    fig.update_traces(
+        line=dict(color='#00f'),
+        hoverinfo='text',
+        hovertemplate="<b>Date:</b> %{x|%B %d, %Y}<br><b>Index:</b> %{customdata[0]}<br><b>Adjusted Close:</b> %{y:.2f}",
+        customdata=data[['Index']]
+    )
+    return fig.to_json()
+
+
+def synthetic_frame(rows, freq):
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        'Date': pd.date_range('1990-01-01', periods=rows, freq=freq),
+        'Adj Close': 100 * np.cumprod(1 + rng.normal(0.0003, 0.02, size=rows)),
+    })
+    data['Index'] = data.index
+    return data
+
+
+def main():
+    # First figure pays plotly's import-time template setup; keep it out of the numbers
+    build_figure(synthetic_frame(10, 'B'))
+    for label, rows, freq in (('10y daily', 2520, 'B'), ('35y daily', 8800, 'B'),
+                              ('1y of 1-minute bars', 98_280, 'min')):
+        data = synthetic_frame(rows, freq)
+        for method in (None, 'lttb', 'minmax'):
+            t0 = time.perf_counter()
+            if method:
+                rows_kept = downsample_indices(data['Date'].to_numpy(), data['Adj Close'].to_numpy(),
+                                               DEFAULT_MAX_POINTS, method)
+                plotted = data.iloc[rows_kept]
+            else:
+                plotted = data
+            payload = build_figure(plotted)
+            elapsed = time.perf_counter() - t0
+            print(f"{label:<20} {method or 'full':<7} {len(plotted):>7} points  "
+                  f"{len(payload) / 1024:9.1f} KiB  {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
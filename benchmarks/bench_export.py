@@ -0,0 +1,68 @@
+# benchmarks/bench_export.py
+# Run with: python -m benchmarks.bench_export
+# Offline dataset export over a pre-filled price cache and a synthetic news
+# archive (three articles per business day), for growing universes. Peak RSS
+# of the writing process should stay flat as the universe grows.
+import datetime
+import json
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset_export import ArchivedNews, DatasetWriter, export
+from price_cache import PriceCache
+from benchmarks.fakes import FakePriceFetcher
+
+START, END = datetime.date(2019, 1, 1), datetime.date(2024, 1, 1)
+
+
+def write_news(news_dir, ticker):
+    days = pd.bdate_range(START, END, inclusive='left')
+    rng = np.random.default_rng(sum(ord(c) for c in ticker))
+    with open(os.path.join(news_dir, f'{ticker}.jsonl'), 'w') as f:
+        for day in days:
+            for hour in (9, 13, 17):
+                f.write(json.dumps({
+                    'published': f'{day:%Y-%m-%d}T{hour:02d}:00:00Z',
+                    'title': '', 'summary': '', 'url': None, 'image_url': None,
+                    'sentiment_title': round(float(rng.uniform(-1, 1)), 3),
+                    'sentiment_summary': round(float(rng.uniform(-1, 1)), 3),
+                }) + '\n')
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    workers = os.cpu_count()
+    print(f"{workers} worker(s), {START} to {END}")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir, news_dir = os.path.join(tmp, 'prices'), os.path.join(tmp, 'news')
+        os.makedirs(news_dir)
+        cache = PriceCache(FakePriceFetcher(), cache_dir=cache_dir)
+        prepared = 0
+        for count in (25, 100, 400):
+            tickers = [f"T{i:04d}" for i in range(count)]
+            for ticker in tickers[prepared:]:
+                cache.get(ticker, START, END)
+                write_news(news_dir, ticker)
+            prepared = count
+
+            writer = DatasetWriter(os.path.join(tmp, 'data.csv'), os.path.join(tmp, 'data.parquet'))
+            t0 = time.perf_counter()
+            errors = export(tickers, START, END, writer, workers, cache_dir, ArchivedNews(news_dir), offline=True)
+            writer.close()
+            elapsed = time.perf_counter() - t0
+            size = os.path.getsize(os.path.join(tmp, 'data.csv')) / 2 ** 20
+            print(f"{count:>4} tickers  {writer.rows:>9,} rows  {elapsed:6.1f} s  "
+                  f"{writer.rows / elapsed:>9,.0f} rows/sec  csv {size:6.1f} MiB  "
+                  f"peak RSS {peak_rss_mb():6.1f} MiB  errors {len(errors)}")
+
+
+if __name__ == '__main__':
+    main()
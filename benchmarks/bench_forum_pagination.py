@@ -0,0 +1,87 @@
+# benchmarks/bench_forum_pagination.py
+# Run with: python -m benchmarks.bench_forum_pagination [posts]
+# Fills a scratch SQLite DB with posts (1M by default), then times GET /posts
+# pages at increasing depth, for both sort orders and a tag filter, against
+# the old query(Post).all() and an OFFSET-based page for comparison.
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+TAGS = ['earnings', 'aapl', 'tsla', 'msft', 'dividends', 'options', 'crypto', 'etf', 'macro', 'ipo']
+
+
+def fill(path, count):
+    random.seed(0)
+    conn = sqlite3.connect(path)
+    conn.executemany("INSERT INTO tags (id, name) VALUES (?, ?)", enumerate(TAGS, start=1))
+    batch, tag_batch = [], []
+    for post_id in range(1, count + 1):
+        picked = random.sample(range(1, len(TAGS) + 1), 2)
+        batch.append((post_id, f"Post {post_id}", "Lorem ipsum dolor sit amet. " * 40,
+                      random.randint(0, 500), ', '.join(TAGS[t - 1] for t in picked)))
+        tag_batch.extend((t, post_id) for t in picked)
+        if len(batch) == 50_000:
+            conn.executemany("INSERT INTO posts (id, title, content, upvotes, tags) VALUES (?, ?, ?, ?, ?)", batch)
+            conn.executemany("INSERT INTO post_tags (tag_id, post_id) VALUES (?, ?)", tag_batch)
+            batch, tag_batch = [], []
+    conn.executemany("INSERT INTO posts (id, title, content, upvotes, tags) VALUES (?, ?, ?, ?, ?)", batch)
+    conn.executemany("INSERT INTO post_tags (tag_id, post_id) VALUES (?, ?)", tag_batch)
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'forum.db')
+    os.environ['FORUM_DATABASE_URL'] = f'sqlite:///{path}'
+    import logging
+    import forum_backend
+    logging.getLogger('forum_backend').setLevel(logging.WARNING)
+
+    t0 = time.perf_counter()
+    fill(path, count)
+    print(f"inserted {count:,} posts in {time.perf_counter() - t0:.1f} s")
+
+    client = forum_backend.app.test_client()
+    client.post('/register', json={'username': 'bench', 'password': 'bench'})
+    client.post('/login', json={'username': 'bench', 'password': 'bench'})
+
+    for label, params in (('newest', {'sort': 'new'}), ('top', {'sort': 'top'}),
+                          ('tag=etf newest', {'sort': 'new', 'tag': 'etf'})):
+        cursor, page, timings = None, 0, {}
+        while page < 1000:
+            page += 1
+            query = dict(params, **({'cursor': cursor} if cursor else {}))
+            t0 = time.perf_counter()
+            resp = client.get('/posts', query_string=query)
+            elapsed = time.perf_counter() - t0
+            if page in (1, 10, 100, 1000):
+                timings[page] = elapsed
+            cursor = resp.headers.get('X-Next-Cursor')
+            if not cursor:
+                break
+        print(f"{label:<16} " + "  ".join(f"page {p:>4}: {t * 1000:6.2f} ms" for p, t in timings.items()))
+
+    # What page 1000 costs with OFFSET, and what the old endpoint did on every call
+    session_db = forum_backend.Session()
+    Post = forum_backend.Post
+    t0 = time.perf_counter()
+    session_db.query(Post.id, Post.title).order_by(Post.id.desc()).offset(999 * 20).limit(20).all()
+    print(f"OFFSET page 1000: {(time.perf_counter() - t0) * 1000:.2f} ms")
+    if count <= 200_000:
+        t0 = time.perf_counter()
+        session_db.query(Post).all()
+        print(f"old GET /posts (load every post): {time.perf_counter() - t0:.2f} s")
+    else:
+        # Every post as an ORM object with full content would need several GB
+        print("old GET /posts (load every post): skipped above 200,000 posts")
+    session_db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_forum_search.py
+# Run with: python -m benchmarks.bench_forum_search [posts]
+# Fills a scratch SQLite DB with posts (1M by default) whose words follow a
+# Zipf distribution over a synthetic vocabulary, so queries range from words
+# in most posts to words in a handful. Times the first and tenth page of
+# search_posts (FTS5, ranked) against the LIKE scan for each query.
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+VOCABULARY = 50_000
+TITLE_WORDS = 5
+CONTENT_WORDS = 40
+SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ru', 'ta', 'vo', 'shi', 'pa', 'de', 'qu', 'zo', 'fi', 'ge', 'bu', 'xa']
+
+
+def vocabulary(rng):
+    words = set()
+    while len(words) < VOCABULARY:
+        words.add(''.join(rng.choice(SYLLABLES, rng.integers(2, 5))))
+    return np.array(sorted(words, key=lambda w: (len(w), w)))
+
+
+def fill(path, count, words, rng):
+    conn = sqlite3.connect(path)
+    batch_size = 50_000
+    for first in range(1, count + 1, batch_size):
+        size = min(batch_size, count - first + 1)
+        # Zipf ranks, clipped to the vocabulary: rank 1 is in most posts
+        ranks = np.minimum(rng.zipf(1.3, size * (TITLE_WORDS + CONTENT_WORDS)), VOCABULARY) - 1
+        text = words[ranks].reshape(size, -1)
+        rows = [(first + i, ' '.join(text[i, :TITLE_WORDS]), ' '.join(text[i, TITLE_WORDS:]), int(i % 500), 'aapl')
+                for i in range(size)]
+        conn.executemany("INSERT INTO posts (id, title, content, upvotes, tags) VALUES (?, ?, ?, ?, ?)", rows)
+        conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    path = os.path.join(tempfile.mkdtemp(), 'forum.db')
+    os.environ['FORUM_DATABASE_URL'] = f'sqlite:///{path}'
+    import logging
+    import forum_backend as fb
+    logging.getLogger('forum_backend').setLevel(logging.WARNING)
+
+    rng = np.random.default_rng(0)
+    words = vocabulary(rng)
+    t0 = time.perf_counter()
+    fill(path, count, words, rng)
+    print(f"inserted and indexed {count:,} posts in {time.perf_counter() - t0:.1f} s, "
+          f"database {os.path.getsize(path) / 2 ** 20:,.0f} MiB")
+
+    session_db = fb.Session()
+    queries = [("most common word", words[0]), ("rank 100 word", words[99]), ("rank 10,000 word", words[9999]),
+               ("two words", f"{words[5]} {words[50]}"), ("prefix", words[30][:-1]), ("no match", "zzzz")]
+    print(f"{'query':<18} {'matches':>9}  {'FTS p1':>9} {'FTS p10':>9}  {'LIKE p1':>9} {'LIKE p10':>9}")
+    for label, query in queries:
+        matches = session_db.execute(fb.text("SELECT count(*) FROM posts_fts WHERE posts_fts MATCH :q"),
+                                     {'q': fb.fts_query(fb.search_words(query))}).scalar()
+        fts1, _ = timed(lambda: fb.search_posts(session_db, query))
+        fts10, _ = timed(lambda: fb.search_posts(session_db, query, offset=9 * fb.PAGE_SIZE))
+        like1, _ = timed(lambda: fb.search_posts_like(session_db, fb.search_words(query)), repeat=1)
+        like10, _ = timed(lambda: fb.search_posts_like(session_db, fb.search_words(query), offset=9 * fb.PAGE_SIZE),
+                          repeat=1)
+        print(f"{label:<18} {matches:>9,}  {fts1:7.1f}ms {fts10:7.1f}ms  {like1:7.1f}ms {like10:7.1f}ms")
+    session_db.close()
+
+
+if __name__ == '__main__':
+    main()
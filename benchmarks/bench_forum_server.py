@@ -0,0 +1,116 @@
+# benchmarks/bench_forum_server.py
+# Run with: python -m benchmarks.bench_forum_server [seconds]
+# Local load test of the forum backend over HTTP. Starts the backend on a
+# scratch SQLite DB under the development server and under gunicorn, logs
+# in CLIENTS users, then has each of them loop over a mix of requests
+# (80% GET /posts, 10% POST /posts, 10% upvotes) for a fixed time.
+# Reports req/sec and p50/p99 latency per server.
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import requests
+
+CLIENTS = 16
+SEED_POSTS = 200
+DURATION = 10
+
+SERVERS = [
+    ("dev server (threaded)", ['--server', 'dev']),
+    ("gunicorn 1 worker x 8 threads", ['--workers', '1', '--threads', '8']),
+    ("gunicorn default (1 worker x 16)", []),
+    ("gunicorn 4 workers x 8 threads", ['--workers', '4', '--threads', '8']),
+]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(args, db_path):
+    port = free_port()
+    env = dict(os.environ, FORUM_DATABASE_URL=f"sqlite:///{db_path}")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen([sys.executable, 'forum_server.py', '--bind', f'127.0.0.1:{port}'] + args,
+                               cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            requests.post(f"{url}/login", json={'username': '', 'password': ''}, timeout=1)
+            return process, url
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("forum server did not start")
+
+
+def logged_in(url, name):
+    client = requests.Session()
+    client.post(f"{url}/register", json={'username': name, 'password': 'secret'})
+    client.post(f"{url}/login", json={'username': name, 'password': 'secret'}).raise_for_status()
+    return client
+
+
+def load(url, clients, duration):
+    latencies, statuses = [], []
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def client_loop(index, client):
+        rng = random.Random(index)
+        local, codes = [], []
+        while time.perf_counter() < stop:
+            roll = rng.random()
+            t0 = time.perf_counter()
+            if roll < 0.8:
+                resp = client.get(f"{url}/posts", params={'sort': rng.choice(['new', 'top'])})
+            elif roll < 0.9:
+                resp = client.post(f"{url}/posts", json={'title': 'Load', 'content': 'Body', 'tags': 'aapl'})
+            else:
+                resp = client.post(f"{url}/posts/{rng.randint(1, SEED_POSTS)}/upvote")
+            local.append(time.perf_counter() - t0)
+            codes.append(resp.status_code)
+        with lock:
+            latencies.extend(local)
+            statuses.extend(codes)
+
+    threads = [threading.Thread(target=client_loop, args=(i, client)) for i, client in enumerate(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    # 409 is a repeat upvote, which is the expected answer
+    failed = sum(1 for code in statuses if code >= 500 or code in (401, 404))
+    return len(latencies) / elapsed, np.percentile(latencies, [50, 99]) * 1000, failed
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else DURATION
+    print(f"{CLIENTS} clients, {duration:.0f} s per server, {os.cpu_count()} CPUs")
+    for name, args in SERVERS:
+        with tempfile.TemporaryDirectory() as tmp:
+            process, url = start_server(args, os.path.join(tmp, 'forum.db'))
+            try:
+                clients = [logged_in(url, f"user{i}") for i in range(CLIENTS)]
+                for i in range(SEED_POSTS):
+                    clients[0].post(f"{url}/posts", json={'title': f'Post {i}', 'content': 'Body', 'tags': 'aapl'})
+                rate, (p50, p99), failed = load(url, clients, duration)
+                print(f"{name:<32} {rate:8,.0f} req/s  p50 {p50:6.1f} ms  p99 {p99:7.1f} ms  failed: {failed}")
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == '__main__':
+    main()
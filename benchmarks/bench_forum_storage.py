@@ -0,0 +1,98 @@
+# benchmarks/bench_forum_storage.py
+# Run with: python -m benchmarks.bench_forum_storage
+# Mixed forum traffic (80% list pages, 10% new posts, 10% upvotes) from
+# several threads against each storage configuration. Set
+# FORUM_BENCH_POSTGRES_URL=postgresql://... to include a local Postgres.
+import os
+import random
+import tempfile
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+THREADS = 8
+OPS_PER_THREAD = 300
+SEED_POSTS = 5000
+
+
+def configs(workdir):
+    from forum_storage import create_forum_engine, storage_config
+    yield 'sqlite, original settings', create_engine(
+        f"sqlite:///{os.path.join(workdir, 'original.db')}", connect_args={'check_same_thread': False})
+    yield 'sqlite, WAL + tuned pragmas', create_forum_engine(
+        storage_config(url=f"sqlite:///{os.path.join(workdir, 'tuned.db')}"))
+    if os.environ.get('FORUM_BENCH_POSTGRES_URL'):
+        yield 'postgres', create_forum_engine(storage_config(url=os.environ['FORUM_BENCH_POSTGRES_URL']))
+
+
+def run(engine, fb):
+    from forum_votes import VoteBatcher
+    fb.Base.metadata.drop_all(engine)
+    fb.init_db(engine)
+    Session = scoped_session(sessionmaker(bind=engine))
+    session_db = Session()
+    session_db.add_all(fb.Post(title=f"Post {i}", content="Body " * 50, upvotes=0, tags="aapl, earnings")
+                       for i in range(SEED_POSTS))
+    session_db.commit()
+    Session.remove()
+    votes = VoteBatcher(engine)
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker(thread_index):
+        rng = random.Random(thread_index)
+        local = []
+        for i in range(OPS_PER_THREAD):
+            session_db = Session()
+            t0 = time.perf_counter()
+            try:
+                roll = rng.random()
+                if roll < 0.8:
+                    fb.list_posts(session_db, rng.choice(['new', 'top']), tag=rng.choice([None, 'aapl']))
+                elif roll < 0.9:
+                    post = fb.Post(title='New', content='Body', upvotes=0, tags='aapl')
+                    session_db.add(post)
+                    session_db.flush()
+                    fb.tag_post(session_db, post.id, post.tags)
+                    session_db.commit()
+                else:
+                    votes.submit(rng.randint(1, SEED_POSTS), thread_index * OPS_PER_THREAD + i)
+            except Exception as e:
+                session_db.rollback()
+                with lock:
+                    errors.append(type(e).__name__)
+            local.append(time.perf_counter() - t0)
+            Session.remove()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(THREADS)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    engine.dispose()
+    return THREADS * OPS_PER_THREAD / elapsed, np.percentile(latencies, [50, 99]) * 1000, errors
+
+
+def main():
+    workdir = tempfile.mkdtemp()
+    os.environ['FORUM_DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'app.db')}"
+    import logging
+    import forum_backend as fb
+    logging.getLogger('forum_backend').setLevel(logging.WARNING)
+
+    for name, engine in configs(workdir):
+        ops, (p50, p99), errors = run(engine, fb)
+        print(f"{name:<28} {ops:8,.0f} ops/s  p50 {p50:6.2f} ms  p99 {p99:7.2f} ms  "
+              f"errors: {len(errors)} {sorted(set(errors))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# benchmarks/bench_fundamentals.py
+# Run with: python -m benchmarks.bench_fundamentals
+# Time-to-first-render of the Financial Data statements with a fake provider
+# that takes LATENCY seconds per statement.
+import tempfile
+import time
+
+from fundamentals import STATEMENTS, FundamentalsStore
+from benchmarks.fakes import FakeFundamentals
+
+LATENCY = 0.5
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def main():
+    fetcher = FakeFundamentals(latency=LATENCY)
+    _, sequential = timed(lambda: [fetcher.fetch('AAPL', name) for name in STATEMENTS])
+    print(f"previous code, 3 statements in a row:  {sequential:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        now = [time.time()]
+        store = FundamentalsStore(fetcher, cache_dir=cache_dir, clock=lambda: now[0])
+        (_, _, refreshing), cold = timed(lambda: store.get('AAPL'))
+        print(f"store, never fetched (parallel fetch):  {cold:8.1f} ms")
+        (_, _, refreshing), warm = timed(lambda: store.get('AAPL'))
+        print(f"store, fresh on disk:                   {warm:8.1f} ms")
+
+        now[0] += store.ttl + 1
+        calls = fetcher.calls
+        (_, _, refreshing), stale = timed(lambda: store.get('AAPL'))
+        print(f"store, stale on disk (refresh queued):  {stale:8.1f} ms  refreshing={refreshing}")
+        time.sleep(LATENCY * 2)
+        (_, fetched_at, refreshing), after = timed(lambda: store.get('AAPL'))
+        print(f"store, after background refresh:        {after:8.1f} ms  refreshing={refreshing}  "
+              f"provider calls during refresh: {fetcher.calls - calls}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_http_client.py
+# Run with: python -m benchmarks.bench_http_client
+# Compares bare requests calls with the pooled HttpClient against a local Flask
+# stand-in for the forum backend, counting new TCP connections on the server.
+import logging
+import socket
+import threading
+import time
+
+import requests
+from flask import Flask, jsonify, make_response, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from http_client import HttpClient
+
+CALLS = 300
+
+
+def stand_in_app(ports):
+    app = Flask(__name__)
+
+    @app.route('/posts')
+    def posts():
+        ports.add(request.environ.get('REMOTE_PORT'))
+        return jsonify([{'id': 1, 'title': 't', 'content': 'c', 'upvotes': 0, 'tags': ''}])
+
+    @app.route('/login', methods=['POST'])
+    def login():
+        ports.add(request.environ.get('REMOTE_PORT'))
+        resp = make_response(jsonify({'message': 'Login successful'}))
+        resp.set_cookie('session', 'secret', httponly=True)
+        return resp
+
+    return app
+
+
+# Same settings as forum_backend.KeepAliveRequestHandler (not imported here
+# because importing forum_backend opens forum.db)
+class KeepAliveHandler(WSGIRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+def main():
+    ports = set()
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, stand_in_app(ports), threaded=True, request_handler=KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}'
+    try:
+        t0 = time.perf_counter()
+        for _ in range(CALLS):
+            requests.get(f'{url}/posts', cookies={'session': 'x'}).raise_for_status()
+        bare = time.perf_counter() - t0
+        bare_connections = len(ports)
+
+        ports.clear()
+        client = HttpClient(base_url=url)
+        t0 = time.perf_counter()
+        for _ in range(CALLS):
+            client.get('/posts', cookies={'session': 'x'}).raise_for_status()
+        pooled = time.perf_counter() - t0
+        pooled_connections = len(ports)
+
+        print(f"bare requests: {CALLS} calls  {bare * 1000 / CALLS:6.2f} ms/call  {bare_connections} connections")
+        print(f"HttpClient   : {CALLS} calls  {pooled * 1000 / CALLS:6.2f} ms/call  {pooled_connections} connections")
+
+        # Login cookies come back on the response but never stick to the shared session
+        response = client.post('/login', json={'username': 'u', 'password': 'p'})
+        print(f"login cookie on response: {response.cookies.get('session')!r}, "
+              f"cookies kept by shared session: {len(client.session.cookies)}")
+        for endpoint, summary in client.metrics().items():
+            print(f"{endpoint}: count={summary['count']} p50<={summary['p50']}s p99<={summary['p99']}s")
+    finally:
+        server.shutdown()
+
+    # With the backend gone, the breaker opens and later calls fail fast
+    client = HttpClient(base_url=url, retries=1, backoff=0.01, breaker_threshold=3)
+    t0 = time.perf_counter()
+    errors = []
+    for _ in range(10):
+        try:
+            client.get('/posts')
+        except requests.exceptions.RequestException as e:
+            errors.append(type(e).__name__)
+    print(f"10 calls to a dead backend: {(time.perf_counter() - t0) * 1000:.1f} ms, {errors}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_intraday.py
+# Run with: python -m benchmarks.bench_intraday
+# Memory and time for one ticker-year of 1-minute bars: the DataFrame a
+# yf.download-style path holds versus the typed records of the intraday
+# store, for the full range and after resampling to hourly bars.
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from intraday import IntradayStore, resample
+from benchmarks.fakes import FakeIntradayFetcher
+
+START, END = '2023-01-01', '2024-01-01'
+
+
+def yfinance_frame(bars):
+    # The shape yf.download returns for intraday bars: tz-aware index, float64 prices
+    index = pd.to_datetime(bars['time'], unit='s', utc=True).tz_convert('America/New_York').rename('Datetime')
+    frame = pd.DataFrame({name.capitalize(): bars[name].astype('float64') for name in ('open', 'high', 'low', 'close')},
+                         index=index)
+    frame['Adj Close'] = frame['Close']
+    frame['Volume'] = bars['volume']
+    return frame
+
+
+def measured(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed * 1000, peak / 2 ** 20
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = IntradayStore(FakeIntradayFetcher(), cache_dir=os.path.join(tmp, 'intraday'))
+        store.get('AAPL', START, END, '1m')
+        frame = yfinance_frame(store.get('AAPL', START, END, '1m'))
+        frame_path = os.path.join(tmp, 'frame.pkl')
+        with open(frame_path, 'wb') as f:
+            pickle.dump(frame, f)
+        print(f"{len(frame):,} one-minute bars ({START} to {END})")
+
+        df, ms, peak = measured(lambda: pd.read_pickle(frame_path))
+        held = df.memory_usage(deep=True).sum() / 2 ** 20
+        print(f"DataFrame, load year      {ms:7.1f} ms  held {held:6.1f} MiB  peak {peak:6.1f} MiB")
+        hourly, ms, peak = measured(lambda: df.resample('1h').agg(
+            {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}).dropna())
+        print(f"DataFrame, resample 1h    {ms:7.1f} ms  held {hourly.memory_usage(deep=True).sum() / 2 ** 20:6.1f} MiB"
+              f"  peak {peak:6.1f} MiB")
+        del df, hourly
+
+        bars, ms, peak = measured(lambda: store.get('AAPL', START, END, '1m'))
+        print(f"store, load year          {ms:7.1f} ms  held {bars.nbytes / 2 ** 20:6.1f} MiB  peak {peak:6.1f} MiB")
+        hourly, ms, peak = measured(lambda: resample(bars, 3600))
+        print(f"store, resample 1h        {ms:7.1f} ms  held {hourly.nbytes / 2 ** 20:6.1f} MiB  peak {peak:6.1f} MiB")
+        week, ms, peak = measured(lambda: store.get('AAPL', '2023-06-05', '2023-06-10', '1m'))
+        print(f"store, load one week      {ms:7.1f} ms  held {week.nbytes / 2 ** 20:6.1f} MiB  peak {peak:6.1f} MiB")
+
+        disk = sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(os.path.join(tmp, 'intraday')) for name in names)
+        print(f"on disk: store {disk / 2 ** 20:.1f} MiB, pickled DataFrame {os.path.getsize(frame_path) / 2 ** 20:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
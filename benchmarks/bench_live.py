@@ -0,0 +1,81 @@
+# benchmarks/bench_live.py
+# Run with: python -m benchmarks.bench_live
+# One LiveStream producer on the simulated feed (TICKERS tickers, a quote
+# each every PRODUCER_INTERVAL) and a growing number of subscriber threads,
+# each following one ticker at REFRESH like LiveChart.follow(). Subscribers
+# either take only the appended points (what add_rows sends) or rebuild the
+# whole visible window on every refresh, the way a rerun would redraw it.
+# Reports how old the newest point is when a subscriber picks it up, and
+# the CPU time each subscriber spends per second.
+import threading
+import time
+
+import numpy as np
+
+from live_feed import LiveStream, SimulatedQuoteFeed
+from sections.live_chart import quote_frame
+
+TICKERS = 50
+PRODUCER_INTERVAL = 0.05
+REFRESH = 0.25
+WINDOW = 2000
+DURATION = 5.0
+
+
+def subscribe(stream, ticker, incremental, stop, results):
+    buffer = stream.buffer(ticker)
+    seq, rows = buffer.since(buffer.count - WINDOW)
+    quote_frame(rows)
+    latencies = []
+    cpu_start = time.thread_time()
+    while not stop.is_set():
+        time.sleep(REFRESH)
+        if incremental:
+            seq, rows = buffer.since(seq)
+            if not len(rows):
+                continue
+            quote_frame(rows)
+        else:
+            rows = buffer.last(WINDOW)
+            quote_frame(rows)
+        latencies.append(time.time() - rows[-1, 2])
+    results.append((latencies, time.thread_time() - cpu_start))
+
+
+def run(subscribers, incremental):
+    stream = LiveStream(SimulatedQuoteFeed(seed=0), interval=PRODUCER_INTERVAL)
+    tickers = [f"T{i:03d}" for i in range(TICKERS)]
+    stream.watch(tickers)
+    # A full window of history first, so full redraws have WINDOW points to rebuild
+    for _ in range(WINDOW):
+        stream.poll_once()
+    stop, results = threading.Event(), []
+    threads = [threading.Thread(target=subscribe, args=(stream, tickers[i % TICKERS], incremental, stop, results))
+               for i in range(subscribers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(DURATION)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    stream.stop()
+    latencies = np.concatenate([r[0] for r in results]) * 1000
+    cpu_ms_per_s = np.mean([r[1] for r in results]) / elapsed * 1000
+    return np.percentile(latencies, [50, 99]), cpu_ms_per_s, stream.stats()
+
+
+def main():
+    print(f"{TICKERS} tickers, a quote every {PRODUCER_INTERVAL * 1000:.0f} ms, subscribers refresh every "
+          f"{REFRESH * 1000:.0f} ms for {DURATION:.0f} s")
+    for subscribers in (1, 10, 100):
+        for incremental in (True, False):
+            (p50, p99), cpu, stats = run(subscribers, incremental)
+            mode = "appended points" if incremental else f"full {WINDOW}-point window"
+            print(f"{subscribers:>4} subscribers, {mode:<24} newest point age p50 {p50:6.1f} ms p99 {p99:6.1f} ms   "
+                  f"CPU {cpu:6.2f} ms/s per subscriber   producer poll {stats['last_poll_ms']:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
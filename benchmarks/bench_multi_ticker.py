@@ -0,0 +1,35 @@
+# benchmarks/bench_multi_ticker.py
+# Run with: python -m benchmarks.bench_multi_ticker
+import datetime
+import tempfile
+import time
+
+from price_cache import PriceCache, load_many
+from benchmarks.fakes import FakePriceFetcher
+
+LATENCY = 0.02  # Simulated round trip per ticker, in seconds
+START, END = datetime.date(2023, 1, 1), datetime.date(2024, 1, 1)
+
+
+def sequential(cache, tickers):
+    # What the comparison tab used to do: one download after another
+    return {t: cache.get(t, START, END) for t in tickers}
+
+
+def main():
+    print(f"simulated latency {LATENCY * 1000:.0f} ms per ticker")
+    for count in (5, 50, 500):
+        tickers = [f"T{i:04d}" for i in range(count)]
+        for name, run in (('sequential', lambda c: sequential(c, tickers)),
+                          ('pool x16', lambda c: load_many(c, tickers, START, END, max_workers=16)),
+                          ('pool x64', lambda c: load_many(c, tickers, START, END, max_workers=64))):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                cache = PriceCache(FakePriceFetcher(latency=LATENCY), cache_dir=cache_dir)
+                t0 = time.perf_counter()
+                run(cache)
+                elapsed = time.perf_counter() - t0
+            print(f"{count:>4} tickers  {name:<10} {elapsed:7.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/bench_news_cache.py
+# Run with: python -m benchmarks.bench_news_cache
+import concurrent.futures
+import time
+
+from news_cache import NewsCache, fetch_polygon_news
+from benchmarks.stub_server import StubServer
+
+
+def main():
+    with StubServer(latency=0.2) as server:
+        base_url = f'{server.url}/v2/reference/news'
+        cache = NewsCache(ttl=60)
+
+        def load(ticker):
+            return cache.get(('polygon', ticker), lambda: fetch_polygon_news(ticker, 'key', base_url=base_url))
+
+        # 32 concurrent reruns asking for the same ticker share one request
+        t0 = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(32) as pool:
+            entries = list(pool.map(load, ['AAPL'] * 32))
+        print(f"32 concurrent cold gets: {time.perf_counter() - t0:.3f} s, "
+              f"{server.requests} upstream request(s), {len(entries[0]['articles'])} articles")
+
+        t0 = time.perf_counter()
+        for _ in range(1000):
+            load('AAPL')
+        print(f"1000 warm gets: {(time.perf_counter() - t0) * 1000:.2f} ms total")
+
+        t0 = time.perf_counter()
+        for _ in range(5):
+            fetch_polygon_news('AAPL', 'key', base_url=base_url)
+        print(f"uncached fetch: {(time.perf_counter() - t0) / 5 * 1000:.1f} ms each")
+
+        # Size budget: 300 tickers into a cache that only fits a handful
+        server.latency = 0.0
+        small = NewsCache(ttl=60, max_bytes=64 * 1024)
+        for i in range(300):
+            small.get(('polygon', f'T{i}'), lambda: fetch_polygon_news(f'T{i}', 'key', base_url=base_url))
+        print(f"bounded cache after 300 tickers: {small.stats()}")
+        print(f"cache stats: {cache.stats()}")
+
+
+if __name__ == '__main__':
+    main()
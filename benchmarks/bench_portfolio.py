@@ -0,0 +1,52 @@
+# benchmarks/bench_portfolio.py
+# Run with: python -m benchmarks.bench_portfolio
+# Portfolio count versus time for random portfolios, plus the optimizers, and
+# what a weight change costs once the model and its optimizers are cached.
+import time
+
+import numpy as np
+
+from portfolio import PortfolioModel
+
+DAYS = 1260
+
+
+def synthetic_prices(tickers, rng):
+    loadings = rng.normal(0, 0.01, size=tickers)
+    market = rng.normal(0.0004, 0.01, size=DAYS)
+    returns = market[:, None] * (1 + loadings * 50) + rng.normal(0.0002, 0.015, size=(DAYS, tickers))
+    return 100 * np.cumprod(1 + returns, axis=0)
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for tickers in (5, 20, 50):
+        prices = synthetic_prices(tickers, rng)
+        build = timed(lambda: PortfolioModel(prices))
+        model = PortfolioModel(prices)
+        print(f"{tickers} tickers, {DAYS} days: build model {build:.2f} ms, "
+              f"min variance {timed(model.min_variance):.1f} ms, "
+              f"max Sharpe {timed(model.max_sharpe):.1f} ms, frontier {timed(model.frontier):.1f} ms")
+        for count in (1_000, 10_000, 100_000, 1_000_000):
+            simulate = timed(lambda: model.random_portfolios(count, seed=1))
+            weights = model.random_portfolios(count, seed=1)[0]
+            reuse = timed(lambda: model.performance(weights))
+            print(f"  {count:>9,} portfolios  draw + evaluate {simulate:8.1f} ms   "
+                  f"re-evaluate the same weights {reuse:8.1f} ms")
+        rebuild = timed(lambda: PortfolioModel(prices).max_sharpe())
+        custom = np.full(tickers, 1 / tickers)
+        print(f"  weight change: rebuild model + max Sharpe {rebuild:.1f} ms, "
+              f"cached model {timed(lambda: model.performance(custom)):.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
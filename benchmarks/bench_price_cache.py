@@ -0,0 +1,32 @@
+# benchmarks/bench_price_cache.py
+# Run with: python -m benchmarks.bench_price_cache
+import datetime
+import tempfile
+import time
+
+from price_cache import PriceCache
+from benchmarks.fakes import FakePriceFetcher
+
+
+def main():
+    fetcher = FakePriceFetcher(latency=0.2)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = PriceCache(fetcher, cache_dir=cache_dir)
+        end = datetime.date(2024, 1, 1)
+        scenarios = [
+            ('cold, 10 years', end - datetime.timedelta(days=3650), end),
+            ('warm, same range', end - datetime.timedelta(days=3650), end),
+            ('warm, sub-range', end - datetime.timedelta(days=365), end),
+            ('head top-up, +1 year', end - datetime.timedelta(days=4015), end),
+            ('tail top-up, +30 days', end - datetime.timedelta(days=365), end + datetime.timedelta(days=30)),
+        ]
+        for name, start, stop in scenarios:
+            t0 = time.perf_counter()
+            df = cache.get('AAPL', start, stop)
+            elapsed = time.perf_counter() - t0
+            print(f"{name:<24} {len(df):>6} rows  {elapsed * 1000:8.1f} ms  {cache.stats()}")
+        print(f"provider calls: {fetcher.calls}")
+
+
+if __name__ == '__main__':
+    main()
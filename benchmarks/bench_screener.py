@@ -0,0 +1,75 @@
+# benchmarks/bench_screener.py
+# Run with: python -m benchmarks.bench_screener
+# Synthetic universe of TICKERS random-walk tickers written to a temporary
+# price cache, then screened from the cache at several worker counts. A
+# per-ticker loop (load one frame, compute its metrics and indicators) is
+# timed on a sample for comparison. Reports tickers/sec.
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from indicators import rsi, sma
+from metrics import compute_metrics
+from price_cache import PriceCache, to_day
+from screener import rank, screen
+
+TICKERS = 5000
+START, END = '2019-01-01', '2024-01-01'
+NAIVE_SAMPLE = 500
+
+
+def fill_cache(cache, tickers, rng):
+    # Written straight into the store: going through get() would spend most
+    # of the benchmark building one fetched frame per ticker
+    dates = pd.bdate_range(START, END, inclusive='left').values.astype('datetime64[D]')
+    for ticker in tickers:
+        # Different drift and volatility per ticker, so the filters have something to separate
+        close = 50 * np.exp(np.cumsum(rng.normal(rng.normal(0.0003, 0.0005), rng.uniform(0.01, 0.04), len(dates))))
+        values = np.column_stack([close, close * 1.01, close * 0.99, close, close, np.full(len(dates), 1e6)])
+        cache._save(ticker, dates, values, to_day(START), to_day(END))
+
+
+def naive(cache, tickers):
+    # One ticker at a time through the app's single-ticker path
+    rows = {}
+    for ticker in tickers:
+        close = cache.get(ticker, START, END)['Adj Close'].to_numpy()
+        metrics = compute_metrics(close, correlation=False)
+        rows[ticker] = {'sharpe': metrics['Sharpe Ratio'][0], 'rsi': rsi(close)[-1],
+                        'above_sma50': close[-1] / sma(close, 50)[-1] - 1}
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, 'price_cache')
+        cache = PriceCache(cache_dir=cache_dir)
+        tickers = [f"T{i:05d}" for i in range(TICKERS)]
+        t0 = time.perf_counter()
+        fill_cache(cache, tickers, np.random.default_rng(0))
+        print(f"{TICKERS} tickers, {START} to {END}, cached in {time.perf_counter() - t0:.1f} s "
+              f"({os.cpu_count()} CPUs)")
+
+        t0 = time.perf_counter()
+        naive(cache, tickers[:NAIVE_SAMPLE])
+        elapsed = time.perf_counter() - t0
+        print(f"per-ticker loop, {NAIVE_SAMPLE} tickers:      {elapsed:6.2f} s  ({NAIVE_SAMPLE / elapsed:8,.0f} tickers/sec)")
+
+        for workers in sorted({1, 2, os.cpu_count() or 1}):
+            t0 = time.perf_counter()
+            table, errors = screen(tickers, START, END, workers=workers, cache_dir=cache_dir)
+            elapsed = time.perf_counter() - t0
+            print(f"screen, {workers} worker(s):               {elapsed:6.2f} s  ({TICKERS / elapsed:8,.0f} tickers/sec)"
+                  f"  {len(errors)} errors")
+
+        t0 = time.perf_counter()
+        ranked = rank(table, 'sharpe > 0.5 and rsi < 70 and max_drawdown > -0.4', 'annual_return')
+        print(f"filter + sort:                     {(time.perf_counter() - t0) * 1000:6.1f} ms  "
+              f"({len(ranked)} of {len(table)} match)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_startup.py
+# Run with: python -m benchmarks.bench_startup [--save-baseline] [--runs N]
+# Cold start of the Streamlit app, each sample in a fresh interpreter:
+#   streamlit_import  importing streamlit itself (not ours to optimize)
+#   app_import        the modules stockanalyzer.py imports at the top
+#   first_run         executing the script once with its default widget values
+# The first run uses streamlit's bare mode (no server) and the default empty
+# date range, so it needs no network. Results are compared with the baseline
+# in benchmarks/baselines/startup.json; --save-baseline overwrites it.
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'stockanalyzer.py')
+BASELINE = os.path.join(ROOT, 'benchmarks', 'baselines', 'startup.json')
+
+# Libraries that should only load once a section needs them
+HEAVY_MODULES = ['plotly.express', 'yfinance', 'stocknews', 'forum', 'fundamentals', 'news_cache']
+
+
+def top_level_imports(path):
+    tree = ast.parse(open(path).read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return [m for m in modules if m.split('.')[0] != 'streamlit']
+
+
+def child():
+    # One cold sample; prints a JSON line on stdout
+    import importlib
+    import runpy
+
+    t0 = time.perf_counter()
+    import streamlit  # noqa: F401
+    t1 = time.perf_counter()
+    for module in top_level_imports(SCRIPT):
+        importlib.import_module(module)
+    t2 = time.perf_counter()
+    loaded_at_import = [m for m in HEAVY_MODULES if m in sys.modules]
+    runpy.run_path(SCRIPT)
+    t3 = time.perf_counter()
+    print(json.dumps({
+        'streamlit_import': (t1 - t0) * 1000,
+        'app_import': (t2 - t1) * 1000,
+        'first_run': (t3 - t2) * 1000,
+        'heavy_at_import': loaded_at_import,
+        'heavy_after_run': [m for m in HEAVY_MODULES if m in sys.modules],
+    }))
+
+
+def sample():
+    result = subprocess.run([sys.executable, '-m', 'benchmarks.bench_startup', '--child'], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child()
+
+    samples = [sample() for _ in range(args.runs)]
+    result = {key: statistics.median(s[key] for s in samples)
+              for key in ('streamlit_import', 'app_import', 'first_run')}
+    baseline = None
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+
+    print(f"median of {args.runs} cold starts")
+    for key, ms in result.items():
+        line = f"  {key:17s} {ms:8.1f} ms"
+        if baseline and key in baseline:
+            line += f"   baseline {baseline[key]:8.1f} ms  ({(ms - baseline[key]) / baseline[key]:+.0%})"
+        print(line)
+    print(f"  loaded by the imports:  {', '.join(samples[-1]['heavy_at_import']) or '-'}")
+    print(f"  loaded by the first run: {', '.join(samples[-1]['heavy_after_run']) or '-'}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(BASELINE), exist_ok=True)
+        with open(BASELINE, 'w') as f:
+            json.dump({key: round(ms, 1) for key, ms in result.items()}, f, indent=2)
+            f.write('\n')
+        print(f"baseline saved to {os.path.relpath(BASELINE, ROOT)}")
+
+
+if __name__ == '__main__':
+    main()
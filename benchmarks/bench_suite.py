@@ -0,0 +1,393 @@
+# benchmarks/bench_suite.py
+# Run with: python -m benchmarks.bench_suite [--repeat N] [--only PREFIX ...]
+#                                            [--output PATH] [--compare PATH] [--save-baseline]
+# Offline regression suite. Replays the recorded provider responses in
+# benchmarks/fixtures (see benchmarks/replay.py) through the price cache,
+# the metrics and indicators, the comparison section's tables and portfolio
+# model and both news sources, then runs forum API scenarios through the
+# Flask test client against a scratch SQLite DB. Any connection to a
+# non-loopback address fails the run.
+#
+# Each scenario is timed --repeat times after one warm-up call, per call. The results
+# are written as JSON (benchmarks/results/<commit>.json by default) and
+# compared with benchmarks/baselines/suite.json, or with --compare PATH, e.g.
+# a results file from another commit. A scenario whose median and fastest
+# run are both more than --threshold slower than the baseline's is a
+# regression, and the exit status is 1 if there is any.
+import argparse
+import datetime
+import gc
+import itertools
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.replay import ReplayPriceFetcher, ReplaySession, manifest, offline, replay_rss
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, 'benchmarks', 'baselines', 'suite.json')
+RESULTS = os.path.join(ROOT, 'benchmarks', 'results')
+
+FORUM_POSTS = 500
+MIN_SAMPLE_MS = 20
+# Changes smaller than this are timer noise whatever the ratio
+MIN_REGRESSION_MS = 0.05
+
+SCENARIOS = {}  # name -> setup(context) returning the callable to time
+
+
+def scenario(name):
+    def register(setup):
+        SCENARIOS[name] = setup
+        return setup
+    return register
+
+
+class Context:
+    """Shared fixtures and scratch space, built once per run."""
+
+    def __init__(self, workdir):
+        self.workdir = workdir
+        self.fixtures = manifest()
+        self.tickers = self.fixtures['tickers']
+        self.start, self.end = self.fixtures['start'], self.fixtures['end']
+        self.fetcher = ReplayPriceFetcher()
+        self._counter = itertools.count()
+        self._prices = None
+        self._forum = None
+
+    def scratch(self, name):
+        return os.path.join(self.workdir, f'{name}-{next(self._counter)}')
+
+    def prices(self):
+        # One warm cache holding every fixture ticker, and its load_many frame
+        if self._prices is None:
+            from price_cache import PriceCache, load_many
+            cache = PriceCache(self.fetcher, self.scratch('prices'))
+            frame, errors = load_many(cache, self.tickers, self.start, self.end)
+            if errors:
+                raise RuntimeError(f"Fixture tickers failed to load: {errors}")
+            self._prices = cache, frame
+        return self._prices
+
+    def forum(self):
+        # forum_backend builds its engine on import, so the scratch DB is set first
+        if self._forum is None:
+            os.environ['FORUM_DATABASE_URL'] = f"sqlite:///{os.path.join(self.workdir, 'forum.db')}"
+            os.environ['FORUM_AUTH_RATE_LIMIT'] = str(10 ** 9)
+            import forum_backend as fb
+            logging.getLogger('forum_backend').setLevel(logging.WARNING)
+            fb.init_db()
+            client = fb.app.test_client()
+            credentials = {'username': 'bench', 'password': 'bench-password'}
+            client.post('/register', json=credentials)
+            check(client.post('/login', json=credentials))
+            words = ['earnings', 'dividend', 'breakout', 'valuation', 'guidance', 'options', 'momentum', 'hedge']
+            rng = np.random.default_rng(0)
+            for i in range(FORUM_POSTS):
+                check(client.post('/posts', json={
+                    'title': f"{self.tickers[i % len(self.tickers)]} {' '.join(rng.choice(words, 4))}",
+                    'content': ' '.join(rng.choice(words, 60)),
+                    'tags': self.tickers[i % len(self.tickers)].lower(),
+                }))
+            self._forum = fb, client
+        return self._forum
+
+
+def check(response):
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.path}: {response.status_code} "
+                           f"{response.get_data(as_text=True)[:200]}")
+    return response
+
+
+@scenario('prices.cold_load')
+def prices_cold_load(ctx):
+    # Every fixture ticker into an empty on-disk cache
+    from price_cache import PriceCache, load_many
+
+    def run():
+        cache = PriceCache(ctx.fetcher, ctx.scratch('cold'))
+        load_many(cache, ctx.tickers, ctx.start, ctx.end)
+        shutil.rmtree(cache.cache_dir)
+    return run
+
+
+@scenario('prices.warm_load')
+def prices_warm_load(ctx):
+    from price_cache import load_many
+    cache, _ = ctx.prices()
+    return lambda: load_many(cache, ctx.tickers, ctx.start, ctx.end)
+
+
+@scenario('prices.one_year_slice')
+def prices_one_year_slice(ctx):
+    cache, _ = ctx.prices()
+    return lambda: cache.get(ctx.tickers[0], '2022-01-01', '2023-01-01')
+
+
+@scenario('metrics.compute')
+def metrics_compute(ctx):
+    from metrics import compute_metrics
+    _, frame = ctx.prices()
+    adj_close = frame['Adj Close'].to_numpy()
+    return lambda: compute_metrics(adj_close, market_index=0)
+
+
+@scenario('metrics.indicators')
+def metrics_indicators(ctx):
+    import indicators
+    _, frame = ctx.prices()
+    close = frame['Close'][ctx.tickers[0]].dropna().to_numpy()
+
+    def run():
+        indicators.sma(close, 50)
+        indicators.ema(close, 20)
+        indicators.bollinger_bands(close)
+        indicators.rsi(close)
+        indicators.macd(close)
+        indicators.rolling_volatility(close)
+    return run
+
+
+@scenario('comparison.tables')
+def comparison_tables(ctx):
+    # Without a Streamlit runtime cache_data keeps nothing between calls,
+    # so every call computes the tables
+    from sections.comparison import comparison_tables
+    _, frame = ctx.prices()
+    compared = tuple(ctx.tickers[1:])
+    return lambda: comparison_tables(frame, compared, ctx.tickers[0], ctx.start, ctx.end)
+
+
+@scenario('comparison.portfolio')
+def comparison_portfolio(ctx):
+    from sections.comparison import portfolio_model
+    _, frame = ctx.prices()
+    compared = tuple(ctx.tickers)
+
+    def run():
+        model = portfolio_model(frame, compared, ctx.start, ctx.end)[0]
+        model.random_portfolios(20000, seed=0)
+    return run
+
+
+@scenario('news.polygon')
+def news_polygon(ctx):
+    # Fetch, normalize and aggregate every ticker's recorded Polygon response
+    from news_cache import fetch_polygon_news
+    session = ReplaySession()
+    return lambda: [fetch_polygon_news(t, 'key', session=session) for t in ctx.tickers]
+
+
+@scenario('news.rss')
+def news_rss(ctx):
+    from news_cache import fetch_rss_news
+    reader = replay_rss()
+    return lambda: [fetch_rss_news(t, reader=reader) for t in ctx.tickers]
+
+
+@scenario('news.cache_hits')
+def news_cache_hits(ctx):
+    from news_cache import NewsCache, fetch_polygon_news
+    cache, session = NewsCache(ttl=900), ReplaySession()
+
+    def run():
+        for _ in range(100):
+            for t in ctx.tickers:
+                cache.get(('polygon', t), lambda: fetch_polygon_news(t, 'key', session=session))
+    return run
+
+
+@scenario('forum.list_new')
+def forum_list_new(ctx):
+    _, client = ctx.forum()
+
+    def run():
+        # The first three pages, following the cursor
+        cursor = None
+        for _ in range(3):
+            response = check(client.get('/posts', query_string={'sort': 'new', **({'cursor': cursor} if cursor else {})}))
+            cursor = response.headers.get('X-Next-Cursor')
+    return run
+
+
+@scenario('forum.list_top_by_tag')
+def forum_list_top_by_tag(ctx):
+    _, client = ctx.forum()
+    return lambda: check(client.get('/posts', query_string={'sort': 'top', 'tag': ctx.tickers[0].lower()}))
+
+
+@scenario('forum.search')
+def forum_search(ctx):
+    _, client = ctx.forum()
+    return lambda: check(client.get('/posts/search', query_string={'q': 'earnings momentum'}))
+
+
+@scenario('forum.get_post')
+def forum_get_post(ctx):
+    _, client = ctx.forum()
+    post_ids = itertools.cycle(range(1, FORUM_POSTS + 1))
+    return lambda: check(client.get(f'/posts/{next(post_ids)}'))
+
+
+@scenario('forum.create_post')
+def forum_create_post(ctx):
+    _, client = ctx.forum()
+    return lambda: check(client.post('/posts', json={'title': 'Benchmark post', 'content': 'Created by the suite.',
+                                                     'tags': 'bench'}))
+
+
+@scenario('forum.upvote')
+def forum_upvote(ctx):
+    # A new vote on the next post each call; past FORUM_POSTS calls they are
+    # repeats, which are rejected (409) after the same insert attempt
+    _, client = ctx.forum()
+    post_ids = itertools.cycle(range(1, FORUM_POSTS + 1))
+    return lambda: client.post(f'/posts/{next(post_ids)}/upvote')
+
+
+@scenario('forum.login')
+def forum_login(ctx):
+    # Dominated by password hashing at the configured cost
+    _, client = ctx.forum()
+    return lambda: check(client.post('/login', json={'username': 'bench', 'password': 'bench-password'}))
+
+
+def measure(run, repeat):
+    # Like timeit: short scenarios run several times per sample so each
+    # sample lasts at least MIN_SAMPLE_MS, with the collector paused
+    t0 = time.perf_counter()
+    run()
+    number = max(1, math.ceil(MIN_SAMPLE_MS / max((time.perf_counter() - t0) * 1000, 1e-3)))
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(number):
+                run()
+            samples.append((time.perf_counter() - t0) * 1000 / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {'median_ms': round(statistics.median(samples), 4), 'min_ms': round(min(samples), 4),
+            'max_ms': round(max(samples), 4), 'runs': repeat, 'calls_per_run': number}
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def run_suite(names, repeat):
+    commit, dirty = git_revision()
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='bench_suite_')
+    # Outside a Streamlit server cache_data warns on every call
+    import streamlit.runtime.caching.cache_data_api  # noqa: F401
+    logging.getLogger('streamlit.runtime.caching.cache_data_api').setLevel(logging.ERROR)
+    try:
+        with offline():
+            ctx = Context(workdir)
+            for name in names:
+                results[name] = measure(SCENARIOS[name](ctx), repeat)
+                print(f"  {name:26s} {results[name]['median_ms']:10.3f} ms", file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'commit': commit,
+        'dirty': dirty,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        'fixtures': ctx.fixtures['source'],
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """Print each scenario against the baseline; returns the regressed names."""
+    regressions = []
+    print(f"{'scenario':26s} {'median ms':>10s} {'baseline':>10s} {'change':>8s}")
+    for name, result in report['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f"{name:26s} {result['median_ms']:10.3f} {'-':>10s} {'new':>8s}")
+            continue
+        change = (result['median_ms'] - before['median_ms']) / before['median_ms']
+        # The fastest run has to slow down too, so one noisy stretch is not a regression
+        regressed = (change > threshold and result['min_ms'] > before['min_ms'] * (1 + threshold)
+                     and result['median_ms'] - before['median_ms'] > MIN_REGRESSION_MS)
+        if regressed:
+            regressions.append(name)
+        print(f"{name:26s} {result['median_ms']:10.3f} {before['median_ms']:10.3f} {change:+8.0%}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--only', nargs='+', default=[], help="scenario name prefixes, e.g. prices forum.search")
+    parser.add_argument('--output', help="results JSON (default benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', default=BASELINE, help="results JSON to compare with")
+    parser.add_argument('--threshold', type=float, default=0.5, help="slowdown that counts as a regression")
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--list', action='store_true')
+    args = parser.parse_args()
+    if args.list:
+        print('\n'.join(SCENARIOS))
+        return 0
+
+    names = [n for n in SCENARIOS if not args.only or any(n.startswith(p) for p in args.only)]
+    if not names:
+        parser.error(f"no scenario matches {args.only}")
+    report = run_suite(names, args.repeat)
+
+    output = args.output or os.path.join(RESULTS, f"{report['commit'] or 'results'}{'-dirty' if report['dirty'] else ''}.json")
+    write_json(output, report)
+    print(f"results written to {os.path.relpath(output)}")
+
+    regressions = []
+    if os.path.exists(args.compare):
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"compared with {os.path.relpath(args.compare)} (commit {baseline.get('commit')}, "
+              f"{baseline.get('machine')})")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+    if args.save_baseline:
+        write_json(BASELINE, report)
+        print(f"baseline saved to {os.path.relpath(BASELINE, ROOT)}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# benchmarks/bench_telemetry.py
+# Run with: python -m benchmarks.bench_telemetry
+# Cost of the instrumentation itself: a bare span around nothing, a span from
+# THREADS threads at once, a traced SQL query against an untraced engine, and
+# rendering /metrics once many label sets exist.
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+
+from forum_storage import trace_queries
+from telemetry import Registry
+
+CALLS = 100_000
+THREADS = 8
+
+
+def per_call_us(fn, calls):
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - t0) / calls * 1e6
+
+
+def main():
+    registry = Registry()
+
+    def empty_span():
+        with registry.span('noop', kind='bench'):
+            pass
+
+    baseline = per_call_us(lambda: None, CALLS)
+    print(f"empty span            {per_call_us(empty_span, CALLS) - baseline:6.2f} us/call")
+
+    threads = [threading.Thread(target=per_call_us, args=(empty_span, CALLS // THREADS)) for _ in range(THREADS)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(f"span x {THREADS} threads       {(time.perf_counter() - t0) / CALLS * 1e6:6.2f} us/call")
+
+    plain, traced = create_engine('sqlite://'), trace_queries(create_engine('sqlite://'))
+    for engine in (plain, traced):
+        with engine.connect() as conn:
+            conn.execute(text("CREATE TABLE posts (id INTEGER PRIMARY KEY, title TEXT)"))
+    timings = {}
+    for label, engine in (('untraced', plain), ('traced', traced)):
+        with engine.connect() as conn:
+            timings[label] = per_call_us(lambda: conn.execute(text("SELECT id FROM posts WHERE id = 1")).all(),
+                                         CALLS // 10)
+    print(f"SQL query untraced    {timings['untraced']:6.2f} us/call, traced {timings['traced']:6.2f} us/call "
+          f"(+{timings['traced'] - timings['untraced']:.2f})")
+
+    for i in range(200):
+        registry.observe('http_server', 0.01, endpoint=f'route_{i}', method='GET', status=200)
+    t0 = time.perf_counter()
+    body = registry.prometheus()
+    print(f"/metrics for 200 series {(time.perf_counter() - t0) * 1000:5.2f} ms, {len(body) / 1024:.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
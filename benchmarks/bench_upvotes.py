@@ -0,0 +1,86 @@
+# benchmarks/bench_upvotes.py
+# Run with: python -m benchmarks.bench_upvotes
+# Many threads upvote one post at once on a scratch SQLite DB. Compares the old
+# ORM read-modify-write, an atomic increment + vote row committed per vote,
+# and the app's VoteBatcher, which commits whatever votes are queued at once;
+# tests/test_upvotes.py checks that no vote is lost and repeats get a 409.
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import func
+
+THREADS = 16
+VOTES_PER_THREAD = 100
+
+
+def old_upvote(Session, Post, post_id):
+    # The original handler body
+    session_db = Session()
+    try:
+        post = session_db.query(Post).get(post_id)
+        post.upvotes += 1
+        session_db.commit()
+    finally:
+        session_db.close()
+
+
+def atomic_upvote(Session, Post, Vote, post_id, user_id):
+    # One transaction per vote: SQL increment plus the vote row
+    session_db = Session()
+    try:
+        session_db.query(Post).filter(Post.id == post_id).update(
+            {Post.upvotes: func.coalesce(Post.upvotes, 0) + 1}, synchronize_session=False)
+        session_db.add(Vote(user_id=user_id, post_id=post_id))
+        session_db.commit()
+    finally:
+        session_db.close()
+
+
+def hammer(vote):
+    errors = []
+
+    def worker(thread_index):
+        for i in range(VOTES_PER_THREAD):
+            try:
+                vote(thread_index * VOTES_PER_THREAD + i + 1)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(THREADS)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0, errors
+
+
+def main():
+    os.environ['FORUM_DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'forum.db')}"
+    import forum_backend as fb
+
+    session_db = fb.Session()
+    session_db.add_all([fb.Post(id=post_id, title=name, content='', upvotes=0, tags='')
+                        for post_id, name in enumerate(['old', 'atomic', 'batched'], start=1)])
+    session_db.commit()
+    session_db.close()
+    fb.Session.remove()
+    expected = THREADS * VOTES_PER_THREAD
+
+    for post_id, label, vote in [
+            (1, 'read-modify-write', lambda user_id: old_upvote(fb.Session, fb.Post, 1)),
+            (2, 'increment per vote', lambda user_id: atomic_upvote(fb.Session, fb.Post, fb.Vote, 2, user_id)),
+            (3, 'batched commits', lambda user_id: fb.vote_batcher.submit(3, user_id))]:
+        elapsed, errors = hammer(vote)
+        session_db = fb.Session()
+        counted = session_db.query(fb.Post).get(post_id).upvotes
+        session_db.close()
+        print(f"{label + ':':<20} {counted}/{expected} votes kept, {len(errors)} errors, "
+              f"{expected / elapsed:,.0f} votes/s")
+    stats = fb.vote_batcher.stats()
+    print(f"batched: {stats['votes']} votes in {stats['batches']} transactions")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/fakes.py
+# Offline stand-ins for the network providers used by the app
+import time
+
+import numpy as np
+import pandas as pd
+
+from fundamentals import FundamentalsFetcher
+from intraday import BAR_DTYPE, INTERVALS, IntradayFetcher
+from price_cache import OHLCV_COLUMNS, PriceFetcher
+
+
+class FakePriceFetcher(PriceFetcher):
+    """Deterministic random-walk bars on business days, with optional latency."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def fetch(self, ticker, start, end):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        index = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), name='Date')
+        # Seed on ticker and day so overlapping fetches agree on every bar
+        days = index.values.astype('datetime64[D]').astype('int64')
+        seed = sum(ord(c) for c in ticker)
+        close = 100 + 10 * np.sin((days + seed) / 50.0) + (days % 7)
+        values = np.column_stack([close - 1, close + 2, close - 2, close, close, 1e6 + days % 1000])
+        return pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS)
+
+
+class FakeFundamentals(FundamentalsFetcher):
+    """Small statement frames with a fixed per-statement latency."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def fetch(self, ticker, statement):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        columns = pd.date_range('2020-03-31', periods=4, freq='QE' if 'quarterly' in statement else 'YE')
+        rows = ['Total Assets', 'Total Liabilities', 'Cash', 'Free Cash Flow']
+        return pd.DataFrame(np.arange(16, dtype='float64').reshape(4, 4) * 1e9, index=rows, columns=columns)
+
+
+class FakeIntradayFetcher(IntradayFetcher):
+    """Regular-session bars (9:30-16:00 New York) on business days, deterministic per ticker."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def fetch(self, ticker, start, end, interval):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        seconds = INTERVALS[interval]
+        days = pd.bdate_range(pd.Timestamp(start, unit='s').normalize(), pd.Timestamp(end, unit='s'))
+        opens = (days.tz_localize('America/New_York') + pd.Timedelta(hours=9, minutes=30)).asi8 // 10 ** 9
+        times = (opens[:, None] + np.arange(0, 390 * 60, seconds)[None, :]).ravel()
+        times = times[(times >= start) & (times < end)]
+        seed = sum(ord(c) for c in ticker)
+        close = 100 + 10 * np.sin((times / 86400 + seed) / 50.0) + np.sin(times / 3600.0)
+        bars = np.empty(len(times), dtype=BAR_DTYPE)
+        bars['time'] = times
+        bars['open'], bars['close'] = close - 0.05, close
+        bars['high'], bars['low'] = close + 0.1, close - 0.1
+        bars['volume'] = 1000 + times % 500
+        return bars
@@ -0,0 +1,213 @@
+# benchmarks/replay.py
+# Recorded provider responses for offline benchmarks. benchmarks/fixtures holds,
+# per ticker, the daily bars yf.download returned (prices/<T>.csv), the raw
+# Polygon news response (polygon/<T>.json) and the StockNews.read_rss() frame
+# (rss/<T>.csv); manifest.json says where they came from. The replay classes
+# below serve them through the same interfaces the app uses.
+#
+#   python -m benchmarks.replay record [--polygon-key KEY]   capture live responses
+#   python -m benchmarks.replay synthesize                   regenerate them offline
+import argparse
+import contextlib
+import datetime
+import ipaddress
+import json
+import os
+import socket
+
+import numpy as np
+import pandas as pd
+import requests
+
+from price_cache import OHLCV_COLUMNS, PriceFetcher
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+TICKERS = ['TSLA', 'AAPL', 'AMZN', 'MSFT', 'GOOGL']
+START, END = '2019-01-01', '2024-01-01'
+RSS_COLUMNS = ['published', 'title', 'summary', 'link', 'sentiment_summary', 'sentiment_title']
+
+
+def fixture_path(kind, ticker, root=FIXTURES):
+    extension = 'json' if kind == 'polygon' else 'csv'
+    return os.path.join(root, kind, f'{ticker.upper()}.{extension}')
+
+
+def manifest(root=FIXTURES):
+    with open(os.path.join(root, 'manifest.json')) as f:
+        return json.load(f)
+
+
+class ReplayPriceFetcher(PriceFetcher):
+    """Daily bars from prices/<T>.csv; days outside the recording come back empty."""
+
+    def __init__(self, root=FIXTURES):
+        self.root = root
+        self.calls = 0
+        self._frames = {}
+
+    def frame(self, ticker):
+        if ticker not in self._frames:
+            path = fixture_path('prices', ticker, self.root)
+            if not os.path.exists(path):
+                raise KeyError(f"No recorded prices for {ticker}")
+            self._frames[ticker] = pd.read_csv(path, index_col='Date', parse_dates=['Date'])
+        return self._frames[ticker]
+
+    def fetch(self, ticker, start, end):
+        self.calls += 1
+        df = self.frame(ticker)
+        return df[(df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))]
+
+
+class ReplayResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = body.encode()
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for recorded response", response=self)
+
+
+class ReplaySession:
+    """Stands in for the session fetch_polygon_news() is given: serves polygon/<T>.json."""
+
+    def __init__(self, root=FIXTURES):
+        self.root = root
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        path = fixture_path('polygon', params['ticker'], self.root)
+        if not os.path.exists(path):
+            return ReplayResponse(404, '{"status": "NOT_FOUND"}')
+        with open(path) as f:
+            return ReplayResponse(200, f.read())
+
+
+def replay_rss(root=FIXTURES):
+    # A reader for fetch_rss_news(): the recorded read_rss() frame
+    def read(ticker):
+        return pd.read_csv(fixture_path('rss', ticker, root))
+    return read
+
+
+def _is_loopback(address):
+    host = address[0] if isinstance(address, tuple) else address
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == 'localhost' or isinstance(host, bytes) or host.startswith('/')
+
+
+@contextlib.contextmanager
+def offline():
+    # Any connection to a non-loopback address fails, so a code path that
+    # escapes the fixtures shows up as an error instead of a network call
+    connect = socket.socket.connect
+
+    def guarded(sock, address):
+        if sock.family in (socket.AF_INET, socket.AF_INET6) and not _is_loopback(address):
+            raise ConnectionRefusedError(f"Network access to {address} during an offline benchmark")
+        return connect(sock, address)
+
+    socket.socket.connect = guarded
+    try:
+        yield
+    finally:
+        socket.socket.connect = connect
+
+
+def _write(path, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write(path)
+
+
+def _write_manifest(root, source, tickers, start, end):
+    with open(os.path.join(root, 'manifest.json'), 'w') as f:
+        json.dump({'source': source, 'created': datetime.date.today().isoformat(),
+                   'tickers': tickers, 'start': start, 'end': end}, f, indent=2)
+        f.write('\n')
+
+
+def record(tickers=TICKERS, start=START, end=END, polygon_key=None, root=FIXTURES):
+    """Capture live yfinance, Polygon and RSS responses as fixtures."""
+    import yfinance as yf
+    from news_cache import POLYGON_NEWS_URL, read_rss
+
+    for ticker in tickers:
+        df = yf.download(ticker, start=start, end=end, progress=False, auto_adjust=False)
+        if isinstance(df.columns, pd.MultiIndex):
+            df = df.xs(ticker, axis=1, level='Ticker')
+        _write(fixture_path('prices', ticker, root), lambda p: df[OHLCV_COLUMNS].to_csv(p))
+        rss = read_rss(ticker)
+        _write(fixture_path('rss', ticker, root), lambda p: rss[[c for c in RSS_COLUMNS if c in rss]].to_csv(p, index=False))
+        if polygon_key:
+            response = requests.get(POLYGON_NEWS_URL, params={'ticker': ticker, 'limit': 20, 'apiKey': polygon_key},
+                                    timeout=10)
+            response.raise_for_status()
+            body = response.json()
+            body.pop('next_url', None)  # carries the API key
+            _write(fixture_path('polygon', ticker, root), lambda p: open(p, 'w').write(json.dumps(body, indent=1)))
+    _write_manifest(root, 'recorded', list(tickers), start, end)
+
+
+def synthesize(tickers=TICKERS, start=START, end=END, root=FIXTURES):
+    """Fixtures in the recorded formats from seeded random data, for trees without network access."""
+    days = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), name='Date')
+    words = ['shares', 'rally', 'earnings', 'guidance', 'slump', 'record', 'analysts', 'upgrade', 'deliveries',
+             'margin', 'cloud', 'chips', 'outlook', 'revenue', 'buyback', 'lawsuit', 'launch', 'demand']
+    for i, ticker in enumerate(tickers):
+        rng = np.random.default_rng(i)
+        close = 50 * (1 + i) * np.exp(np.cumsum(rng.normal(0.0004, 0.01 + 0.005 * i, len(days))))
+        spread = close * rng.uniform(0.002, 0.02, len(days))
+        df = pd.DataFrame({'Open': close + rng.uniform(-1, 1, len(days)) * spread / 2,
+                           'High': close + spread, 'Low': close - spread, 'Close': close,
+                           'Adj Close': close * 0.98, 'Volume': rng.integers(1e6, 5e7, len(days))}, index=days)
+        _write(fixture_path('prices', ticker, root), lambda p: df.round(4).to_csv(p))
+
+        def sentence(n):
+            return ' '.join(rng.choice(words, n)).capitalize()
+        published = [pd.Timestamp(end) - pd.Timedelta(hours=6 * k) for k in range(20)]
+        rss = pd.DataFrame({
+            'published': [t.strftime('%a, %d %b %Y %H:%M:%S +0000') for t in published[:10]],
+            'title': [f"{ticker} {sentence(6)}" for _ in range(10)],
+            'summary': [sentence(30) + '.' for _ in range(10)],
+            'link': [f"https://finance.example.com/{ticker.lower()}/{k}" for k in range(10)],
+            'sentiment_summary': rng.uniform(-1, 1, 10).round(4),
+            'sentiment_title': rng.uniform(-1, 1, 10).round(4),
+        })
+        _write(fixture_path('rss', ticker, root), lambda p: rss.to_csv(p, index=False))
+        body = {'status': 'OK', 'count': 20, 'results': [{
+            'id': f'{ticker}{k:04d}',
+            'published_utc': t.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'title': f"{ticker} {sentence(8)}",
+            'description': sentence(40) + '.',
+            'article_url': f"https://news.example.com/{ticker.lower()}/{k}",
+            'image_url': f"https://news.example.com/{ticker.lower()}/{k}.jpg",
+            'tickers': [ticker],
+        } for k, t in enumerate(published)]}
+        _write(fixture_path('polygon', ticker, root), lambda p: open(p, 'w').write(json.dumps(body, indent=1)))
+    _write_manifest(root, 'synthetic', list(tickers), start, end)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('mode', choices=['record', 'synthesize'])
+    parser.add_argument('--tickers', nargs='+', default=TICKERS)
+    parser.add_argument('--start', default=START)
+    parser.add_argument('--end', default=END)
+    parser.add_argument('--polygon-key', default=os.environ.get('POLYGON_API_KEY'))
+    args = parser.parse_args()
+    if args.mode == 'record':
+        record(args.tickers, args.start, args.end, args.polygon_key)
+    else:
+        synthesize(args.tickers, args.start, args.end)
+    print(f"fixtures written to {os.path.relpath(FIXTURES)}")
+
+
+if __name__ == '__main__':
+    main()
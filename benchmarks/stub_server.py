@@ -0,0 +1,53 @@
+# benchmarks/stub_server.py
+# Local HTTP stand-in for the Polygon news endpoint
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def polygon_results(ticker, limit):
+    return [{
+        'published_utc': f'2024-01-{i % 28 + 1:02d}T12:00:00Z',
+        'title': f'{ticker} headline {i}',
+        'description': f'Summary of story {i} about {ticker}. ' * 5,
+        'article_url': f'https://example.com/{ticker}/{i}',
+        'image_url': f'https://example.com/{ticker}/{i}.png',
+    } for i in range(limit)]
+
+
+class StubServer:
+    """ThreadingHTTPServer on a free localhost port answering /v2/reference/news."""
+
+    def __init__(self, latency=0.0):
+        server = self
+        self.latency = latency
+        self.requests = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                query = parse_qs(urlparse(self.path).query)
+                body = json.dumps({'results': polygon_results(query['ticker'][0], int(query['limit'][0]))}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,222 @@
+# dataset_export.py
+# Headless export of the dataset in data/data.csv: one row per ticker and news
+# day, joining that day's sentiment aggregates with the bars of the first
+# trading day on or after it (check_day). News days follow news_cache.news_days,
+# the same rule as event_study: articles published after the close count
+# toward the next day. Tickers are processed on a process
+# pool and written chunk by chunk, so memory stays flat for any universe size.
+# Output goes to the untracked data/export/ unless --csv says otherwise.
+#
+#   python dataset_export.py AAPL MSFT --start 2023-01-01 --end 2024-01-01
+#   python dataset_export.py --tickers-file universe.txt --news-dir news/ \
+#       --offline --parquet data/data.parquet
+import argparse
+import collections
+import concurrent.futures
+import datetime
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from price_cache import DEFAULT_CACHE_DIR, PriceCache, to_day, unique_tickers
+
+DATASET_COLUMNS = ['id', 'stock', 'news_dt', 'check_day', 'open', 'close', 'high', 'low', 'volume', 'change',
+                   'sentiment_summary_avg', 'sentiment_summary_med', 'sentiment_title_avg', 'sentiment_title_med']
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+# The dataset shipped with the repo, and where exports go by default
+DATASET_CSV = os.path.join(DATA_DIR, 'data.csv')
+DEFAULT_CSV = os.path.join(DATA_DIR, 'export', 'data.csv')
+
+
+def rss_articles(ticker):
+    from news_cache import fetch_rss_news
+    return fetch_rss_news(ticker, limit=100)['articles']
+
+
+class ArchivedNews:
+    """Articles stored as <news_dir>/<TICKER>.jsonl, one news_cache article per line."""
+
+    def __init__(self, news_dir):
+        self.news_dir = news_dir
+
+    def __call__(self, ticker):
+        path = os.path.join(self.news_dir, f'{ticker}.jsonl')
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+def daily_sentiment(articles):
+    # Average and median sentiment per news day, indexed by datetime64[D]
+    from news_cache import news_days
+    frame = pd.DataFrame(articles, columns=['published', 'sentiment_summary', 'sentiment_title'])
+    frame['news_dt'] = news_days(frame['published'])
+    frame = frame.dropna(subset=['news_dt'])
+    scores = frame[['sentiment_summary', 'sentiment_title']].astype('float64')
+    daily = scores.groupby(frame['news_dt']).agg(['mean', 'median'])
+    daily.columns = [f"{field}_{'avg' if stat == 'mean' else 'med'}" for field, stat in daily.columns]
+    daily.index = daily.index.values.astype('datetime64[D]')
+    return daily
+
+
+def ticker_rows(ticker, bars, articles):
+    """Dataset rows (without ids) for one ticker's bars and articles."""
+    sentiment = daily_sentiment(articles)
+    dates = bars.index.values.astype('datetime64[D]')
+    news_days = sentiment.index.values
+    # First trading day on or after each news day; news after the last bar has no check day yet
+    pos = np.searchsorted(dates, news_days)
+    keep = pos < len(dates)
+    if len(dates):
+        keep &= news_days >= dates[0]
+    pos, news_days, sentiment = pos[keep], news_days[keep], sentiment[keep]
+
+    close = bars['Close'].to_numpy()
+    previous_close = np.concatenate([[np.nan], close[:-1]])
+    rows = pd.DataFrame({
+        'stock': ticker,
+        'news_dt': news_days,
+        'check_day': dates[pos],
+        'open': bars['Open'].to_numpy()[pos],
+        'close': close[pos],
+        'high': bars['High'].to_numpy()[pos],
+        'low': bars['Low'].to_numpy()[pos],
+        'volume': pd.array(np.round(bars['Volume'].to_numpy()[pos]), dtype='Int64'),
+        # Close-to-close move of the check day
+        'change': close[pos] / previous_close[pos] - 1,
+    })
+    for column in DATASET_COLUMNS[10:]:
+        rows[column] = sentiment[column].to_numpy() if column in sentiment else np.nan
+    return rows
+
+
+def export_ticker(ticker, start, end, cache_dir=DEFAULT_CACHE_DIR, news=rss_articles, offline=False):
+    # Runs in a worker process, with its own handle on the shared on-disk cache
+    cache = PriceCache(cache_dir=cache_dir)
+    start, end = to_day(start), to_day(end)
+    if offline:
+        # Only what is already cached, never a download
+        covered = cache.coverage(ticker)
+        if covered is None:
+            raise LookupError(f"{ticker} is not in the price cache")
+        start, end = max(start, covered[0]), min(end, covered[1])
+    bars = cache.get(ticker, start, end)
+    if bars.empty:
+        return ticker_rows(ticker, bars, [])
+    return ticker_rows(ticker, bars, news(ticker))
+
+
+class DatasetWriter:
+    """Appends row chunks to a ';'-separated CSV and/or a Parquet file, numbering them."""
+
+    def __init__(self, csv_path=None, parquet_path=None):
+        self.csv_path = csv_path
+        self.parquet_path = parquet_path
+        self.rows = 0
+        self._parquet = None
+        if csv_path:
+            os.makedirs(os.path.dirname(os.path.abspath(csv_path)), exist_ok=True)
+            with open(csv_path, 'w') as f:
+                f.write(';'.join(DATASET_COLUMNS) + '\n')
+        if parquet_path:
+            # Optional dependency, only needed for Parquet output
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            self._schema = pa.schema(
+                [('id', pa.int64()), ('stock', pa.string()), ('news_dt', pa.date32()), ('check_day', pa.date32())]
+                + [(name, pa.int64() if name == 'volume' else pa.float64()) for name in DATASET_COLUMNS[4:]]
+            )
+            self._arrow = pa
+            self._parquet = pq.ParquetWriter(parquet_path, self._schema)
+
+    def write(self, rows):
+        if rows.empty:
+            return
+        rows.insert(0, 'id', np.arange(self.rows, self.rows + len(rows)))
+        self.rows += len(rows)
+        if self.csv_path:
+            rows.to_csv(self.csv_path, sep=';', index=False, header=False, mode='a')
+        if self._parquet:
+            self._parquet.write_table(self._arrow.Table.from_pandas(rows, schema=self._schema, preserve_index=False))
+
+    def close(self):
+        if self._parquet:
+            self._parquet.close()
+
+
+def export(tickers, start, end, writer, workers=None, cache_dir=DEFAULT_CACHE_DIR, news=rss_articles, offline=False):
+    """Export every ticker through `writer`; returns the errors per ticker.
+
+    At most two tasks per worker are in flight and results are written in
+    ticker order as they complete, so only a few chunks are ever in memory.
+    """
+    workers = workers or os.cpu_count() or 1
+    errors = {}
+    # forkserver rather than fork, as in screener.screen, so the export is
+    # safe to start from a threaded process too
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                mp_context=multiprocessing.get_context('forkserver')) as pool:
+        pending = collections.deque()
+
+        def write_oldest():
+            ticker, future = pending.popleft()
+            try:
+                writer.write(future.result())
+            except Exception as e:
+                errors[ticker] = e
+
+        for ticker in unique_tickers(tickers):
+            pending.append((ticker, pool.submit(export_ticker, ticker, start, end, cache_dir, news, offline)))
+            if len(pending) >= 2 * workers:
+                write_oldest()
+        while pending:
+            write_oldest()
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the news/price dataset for a ticker universe.")
+    parser.add_argument('tickers', nargs='*')
+    parser.add_argument('--tickers-file', help="file with one ticker per line")
+    parser.add_argument('--start', default=str(datetime.date.today() - datetime.timedelta(days=365)))
+    parser.add_argument('--end', default=str(datetime.date.today()))
+    parser.add_argument('--csv', default=DEFAULT_CSV, help="CSV output path, '' to skip")
+    parser.add_argument('--parquet', help="also write a Parquet file (needs pyarrow)")
+    parser.add_argument('--news-dir', help="read articles from <news-dir>/<TICKER>.jsonl instead of the RSS feed")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--offline', action='store_true', help="only use prices already in the cache")
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += f.read().split()
+    if not tickers:
+        parser.error("no tickers given")
+
+    writer = DatasetWriter(args.csv or None, args.parquet)
+    news = ArchivedNews(args.news_dir) if args.news_dir else rss_articles
+    t0 = time.perf_counter()
+    try:
+        errors = export(tickers, args.start, args.end, writer, args.workers, args.cache_dir, news, args.offline)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - t0
+
+    for ticker, error in errors.items():
+        print(f"{ticker}: {error}", file=sys.stderr)
+    print(f"{writer.rows} rows from {len(unique_tickers(tickers)) - len(errors)} tickers in {elapsed:.1f} s "
+          f"({writer.rows / elapsed:,.0f} rows/sec)")
+    return 1 if errors and not writer.rows else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
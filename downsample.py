@@ -0,0 +1,75 @@
+# downsample.py
+# Reduce long price series to a fixed point budget before building a figure.
+# Both methods return sorted row positions into the original series, so the
+# caller can slice dates, prices, hover data and overlays with the same index.
+import numpy as np
+
+# Roughly one point per horizontal pixel of a wide Streamlit chart
+DEFAULT_MAX_POINTS = 2000
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype('int64').astype('float64')
+    return x.astype('float64')
+
+
+def lttb_indices(x, y, max_points):
+    # Largest-Triangle-Three-Buckets: keep the point in each bucket that forms
+    # the largest triangle with the previously kept point and the next
+    # bucket's average
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+    edges = np.floor(np.arange(max_points - 1) * (n - 2) / (max_points - 2)).astype(int) + 1
+    edges[-1] = n - 1
+    # Average of every bucket, with the last point as the final "bucket"
+    bucket_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / np.diff(edges), x[-1])
+    bucket_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / np.diff(edges), y[-1])
+
+    kept = np.empty(max_points, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        avg_x, avg_y = bucket_x[i + 1], bucket_y[i + 1]
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def minmax_indices(x, y, max_points):
+    # Keep the lowest and highest point of each bucket, plus both ends
+    n = len(y)
+    if max_points >= n or max_points < 4:
+        return np.arange(n)
+    buckets = (max_points - 2) // 2
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = _as_float(y)
+    padded = padded.reshape(buckets, size)
+    # Trailing buckets can be pure padding when n is small; skip those
+    filled = ~np.isnan(padded).all(axis=1)
+    offsets = np.arange(buckets)[filled] * size
+    lows = offsets + np.nanargmin(padded[filled], axis=1)
+    highs = offsets + np.nanargmax(padded[filled], axis=1)
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+def downsample_indices(x, y, max_points=DEFAULT_MAX_POINTS, method='lttb'):
+    """Row positions to plot so the series fits in max_points.
+
+    NaN values are skipped, and the global minimum and maximum are always
+    kept so the visual extremes survive either method.
+    """
+    y_values = _as_float(y)
+    valid = np.flatnonzero(~np.isnan(y_values))
+    if len(valid) <= max_points:
+        return valid
+    pick = lttb_indices if method == 'lttb' else minmax_indices
+    kept = valid[pick(np.asarray(x)[valid], y_values[valid], max_points)]
+    extremes = valid[[np.argmin(y_values[valid]), np.argmax(y_values[valid])]]
+    return np.unique(np.concatenate([kept, extremes]))
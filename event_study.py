@@ -0,0 +1,214 @@
+# event_study.py
+# Does news sentiment predict the next moves? Events (one per article, or one
+# per news day like the data/data.csv rows) are matched to the trading days
+# of every ticker at once: all close series are laid end to end under a
+# composite (ticker, day) key, so a single searchsorted places every event.
+#
+#   python event_study.py [data/data.csv] [--horizons 1 5 20]
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from news_cache import news_days
+from price_cache import DEFAULT_CACHE_DIR, PriceCache, unique_tickers
+
+DEFAULT_HORIZONS = (1, 5, 20)
+
+# Signal columns looked for in the events, daily aggregates then per-article scores
+SIGNALS = ['sentiment_summary_avg', 'sentiment_summary_med', 'sentiment_title_avg', 'sentiment_title_med',
+           'sentiment_summary', 'sentiment_title']
+
+# Day numbers (offset to stay positive) are packed next to the ticker code in one int64 key
+_DAY_SPAN = 1 << 32
+_DAY_OFFSET = 1 << 31
+
+
+class PricePanel:
+    """Close prices of many tickers, sorted by (ticker, day) in flat arrays."""
+
+    def __init__(self, closes):
+        # closes: ticker -> Series of closes on a sorted DatetimeIndex
+        closes = {t: s.dropna() for t, s in closes.items()}
+        self.tickers = pd.Index(list(closes))
+        lengths = [len(s) for s in closes.values()]
+        self.ticker = np.repeat(np.arange(len(lengths)), lengths)
+        self.days = np.concatenate([s.index.values.astype('datetime64[D]') for s in closes.values()] or
+                                   [np.empty(0, dtype='datetime64[D]')])
+        self.close = np.concatenate([s.to_numpy(dtype='float64') for s in closes.values()] or [np.empty(0)])
+        self.keys = self.ticker * _DAY_SPAN + self.days.astype('int64') + _DAY_OFFSET
+        # [start, stop) of the bar's own ticker, for every bar
+        bounds = np.cumsum([0] + lengths)
+        self.start = np.repeat(bounds[:-1], lengths)
+        self.stop = np.repeat(bounds[1:], lengths)
+
+    @classmethod
+    def from_prices(cls, prices, field='Adj Close'):
+        # From a load_many result
+        return cls({t: prices[field][t] for t in prices[field].columns})
+
+    @classmethod
+    def from_cache(cls, cache, tickers, start=None, end=None, field='Adj Close'):
+        # Whatever the cache already covers when no range is given
+        closes = {}
+        for ticker in unique_tickers(tickers):
+            covered = cache.coverage(ticker)
+            if covered is None:
+                continue
+            closes[ticker] = cache.get(ticker, start or covered[0], end or covered[1])[field]
+        return cls(closes)
+
+    def locate(self, stocks, days):
+        """Position of the first trading day on or after each (stock, day), -1 if none."""
+        # Factorize first so only the distinct symbols are normalized and looked up
+        stocks = pd.Categorical(stocks)
+        codes = self.tickers.get_indexer(stocks.categories.str.upper())[stocks.codes]
+        codes[stocks.codes < 0] = -1
+        days = np.asarray(days, dtype='datetime64[D]')
+        keys = codes * _DAY_SPAN + days.astype('int64') + _DAY_OFFSET
+        # Searching in key order walks the panel once instead of jumping around it
+        order = np.argsort(keys)
+        pos = np.empty(len(keys), dtype='int64')
+        pos[order] = np.searchsorted(self.keys, keys[order])
+        inside = pos < len(self.keys)
+        found = (codes >= 0) & ~np.isnat(days) & inside
+        found[inside] &= self.ticker[pos[inside]] == codes[inside]
+        return np.where(found, pos, -1)
+
+    def forward_returns(self, pos, horizons=DEFAULT_HORIZONS, from_event_close=True):
+        """Return over the h trading days after the event, NaN where the series
+        doesn't reach that far.
+
+        By default the window starts at the event day's close, the first close
+        after an article published during the session, so h=1 is the next
+        day's move and nothing priced in before publication is counted. With
+        from_event_close=False it starts at the close before the event day,
+        and h=1 is the event day's own move.
+        """
+        returns = np.full((len(pos), len(horizons)), np.nan)
+        if not len(self.close):
+            return returns
+        found = pos >= 0
+        pos = np.where(found, pos, 0)
+        start, stop = self.start[pos], self.stop[pos]
+        if from_event_close:
+            base, ok_base = pos, found
+        else:
+            base, ok_base = np.maximum(pos - 1, 0), found & (pos > start)
+        for j, h in enumerate(horizons):
+            end = base + h
+            ok = ok_base & (end < stop)
+            returns[ok, j] = self.close[end[ok]] / self.close[base[ok]] - 1
+        return returns
+
+
+def event_days(events):
+    # Per-article events carry a timestamp; daily rows already carry their day
+    if 'published' in events:
+        return news_days(events['published'])
+    return pd.to_datetime(events['news_dt']).values.astype('datetime64[D]')
+
+
+def _ranks(values):
+    # Average ranks (ties share the mean of their positions), like scipy's rankdata
+    order = np.argsort(values)
+    ordered = values[order]
+    first = np.empty(len(values), dtype=bool)
+    first[:1] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=first[1:])
+    starts = np.flatnonzero(first)
+    counts = np.diff(np.append(starts, len(values)))
+    ranks = np.empty(len(values))
+    ranks[order] = np.repeat(starts + (counts + 1) / 2, counts)
+    return ranks
+
+
+def _signal_stats(signal, returns):
+    ok = ~np.isnan(signal) & ~np.isnan(returns)
+    x, y = signal[ok], returns[ok]
+    stats = {'events': int(ok.sum()), 'correlation': np.nan, 'rank_correlation': np.nan, 'hit_rate': np.nan,
+             'mean_return_positive': np.nan, 'mean_return_negative': np.nan}
+    if len(x) < 2:
+        return stats
+    if x.std() > 0 and y.std() > 0:
+        stats['correlation'] = float(np.corrcoef(x, y)[0, 1])
+        stats['rank_correlation'] = float(np.corrcoef(_ranks(x), _ranks(y))[0, 1])
+    # Share of non-neutral signals whose sign the move agreed with
+    directional = (x != 0) & (y != 0)
+    if directional.any():
+        stats['hit_rate'] = float((np.sign(x[directional]) == np.sign(y[directional])).mean())
+    if (x > 0).any():
+        stats['mean_return_positive'] = float(y[x > 0].mean())
+    if (x < 0).any():
+        stats['mean_return_negative'] = float(y[x < 0].mean())
+    return stats
+
+
+def event_study(events, panel, horizons=DEFAULT_HORIZONS, signals=None, from_event_close=True):
+    """Pooled statistics of every signal against every forward horizon.
+
+    Returns a frame indexed by (signal, horizon) with the number of events,
+    Pearson and rank correlation, hit rate and the mean forward return after
+    positive and negative signals. Returns start at the event day's close
+    unless from_event_close is False (see PricePanel.forward_returns).
+    """
+    signals = signals or [s for s in SIGNALS if s in events]
+    returns = panel.forward_returns(panel.locate(events['stock'], event_days(events)), horizons, from_event_close)
+    rows = {}
+    for name in signals:
+        signal = events[name].to_numpy(dtype='float64')
+        for j, h in enumerate(horizons):
+            rows[(name, h)] = _signal_stats(signal, returns[:, j])
+    table = pd.DataFrame.from_dict(rows, orient='index')
+    table.index = pd.MultiIndex.from_tuples(table.index, names=['signal', 'horizon'])
+    return table
+
+
+def ticker_stats(events, panel, signal, horizon=1, from_event_close=True):
+    """Per-ticker correlation and hit rate of one signal, from bincount sums."""
+    pos = panel.locate(events['stock'], event_days(events))
+    y = panel.forward_returns(pos, [horizon], from_event_close)[:, 0]
+    x = events[signal].to_numpy(dtype='float64')
+    ok = ~np.isnan(x) & ~np.isnan(y)
+    code, x, y = panel.ticker[pos[ok]], x[ok], y[ok]
+    size = len(panel.tickers)
+
+    def total(weights=None):
+        return np.bincount(code, weights, minlength=size)
+
+    n = total()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = total(x * y) - total(x) * total(y) / n
+        var_x = total(x * x) - total(x) ** 2 / n
+        var_y = total(y * y) - total(y) ** 2 / n
+        correlation = cov / np.sqrt(var_x * var_y)
+        directional = (x != 0) & (y != 0)
+        hits = np.bincount(code[directional], (np.sign(x) == np.sign(y))[directional], minlength=size)
+        hit_rate = hits / np.bincount(code[directional], minlength=size)
+    return pd.DataFrame({'events': n.astype('int64'), 'correlation': correlation, 'hit_rate': hit_rate},
+                        index=panel.tickers).query('events > 0')
+
+
+def load_events(path):
+    return pd.read_csv(path, sep=';', parse_dates=['news_dt', 'check_day'])
+
+
+def main(argv=None):
+    from dataset_export import DATASET_CSV
+
+    parser = argparse.ArgumentParser(description="Sentiment vs. forward returns over the cached prices.")
+    parser.add_argument('events', nargs='?', default=DATASET_CSV)
+    parser.add_argument('--horizons', type=int, nargs='+', default=list(DEFAULT_HORIZONS))
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--include-event-day', action='store_true',
+                        help="measure from the close before the event day, counting its own move")
+    args = parser.parse_args(argv)
+
+    events = load_events(args.events)
+    panel = PricePanel.from_cache(PriceCache(cache_dir=args.cache_dir), events['stock'].unique())
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(event_study(events, panel, args.horizons, from_event_close=not args.include_event_day))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,11 +2,16 @@
 import streamlit as st
 import requests
 
+from http_client import HttpClient
+
 backend_url = "http://127.0.0.1:5000"
 
+# Pooled keep-alive client shared by every session; module state survives reruns
+client = HttpClient(base_url=backend_url, timeout=(2, 5))
+
 def register(username, password):
     try:
-        response = requests.post(f"{backend_url}/register", json={'username': username, 'password': password})
+        response = client.post("/register", json={'username': username, 'password': password})
         response.raise_for_status()
         st.success("User registered successfully")
         st.session_state['registration_success'] = True  # Set flag to indicate successful registration
@@ -16,7 +21,7 @@ def register(username, password):
 
 def login(username, password):
     try:
-        response = requests.post(f"{backend_url}/login", json={'username': username, 'password': password})
+        response = client.post("/login", json={'username': username, 'password': password})
         response.raise_for_status()
         st.session_state['session_cookie'] = response.cookies.get('session')
         st.session_state['username'] = username  # Store the username in session state
@@ -31,7 +36,7 @@ def login(username, password):
 
 def logout():
     try:
-        response = requests.post(f"{backend_url}/logout", cookies={'session': st.session_state.get('session_cookie', '')})
+        response = client.post("/logout", cookies={'session': st.session_state.get('session_cookie', '')})
         response.raise_for_status()
         st.session_state.pop('session_cookie', None)
         st.session_state.pop('username', None)  # Clear the username from session state
@@ -40,14 +45,44 @@ def logout():
         st.error(f"Logout error: {str(e)}")
         return False
 
-def fetch_posts():
+def fetch_posts(sort='new', cursor=None, tag=None, limit=20):
+    # One page of the post list; returns (posts, cursor of the next page or None)
+    params = {'sort': sort, 'limit': limit}
+    if cursor:
+        params['cursor'] = cursor
+    if tag:
+        params['tag'] = tag
     try:
-        response = requests.get(f"{backend_url}/posts", cookies={'session': st.session_state.get('session_cookie', '')})
+        response = client.get("/posts", params=params, cookies={'session': st.session_state.get('session_cookie', '')})
         response.raise_for_status()
-        return response.json()
+        return response.json(), response.headers.get('X-Next-Cursor')
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching posts: {str(e)}")
-        return []
+        return [], None
+
+def search_posts(query, cursor=None, limit=20):
+    # One page of full-text matches, best first; excerpts mark matches in **bold**.
+    # Also returns how many newest matches were ranked when the backend capped it.
+    params = {'q': query, 'limit': limit}
+    if cursor:
+        params['cursor'] = cursor
+    try:
+        response = client.get("/posts/search", params=params, cookies={'session': st.session_state.get('session_cookie', '')})
+        response.raise_for_status()
+        window = response.headers.get('X-Search-Window')
+        return response.json(), response.headers.get('X-Next-Cursor'), int(window) if window else None
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error searching posts: {str(e)}")
+        return [], None, None
+
+def fetch_post(post_id):
+    try:
+        response = client.get(f"/posts/{post_id}", cookies={'session': st.session_state.get('session_cookie', '')})
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error fetching post: {str(e)}")
+        return None
 
 def create_post(title, content, tags):
     post_data = {
@@ -56,7 +91,7 @@ def create_post(title, content, tags):
         'tags': tags
     }
     try:
-        response = requests.post(f"{backend_url}/posts", json=post_data, cookies={'session': st.session_state.get('session_cookie', '')})
+        response = client.post("/posts", json=post_data, cookies={'session': st.session_state.get('session_cookie', '')})
         response.raise_for_status()
         return True, "Post created successfully"
     except requests.exceptions.RequestException as e:
@@ -64,7 +99,10 @@ def create_post(title, content, tags):
 
 def upvote_post(post_id):
     try:
-        response = requests.post(f"{backend_url}/posts/{post_id}/upvote", cookies={'session': st.session_state.get('session_cookie', '')})
+        response = client.post(f"/posts/{post_id}/upvote", cookies={'session': st.session_state.get('session_cookie', '')})
+        if response.status_code == 409:
+            st.info("You have already upvoted this post")
+            return False
         response.raise_for_status()
         return True
     except requests.exceptions.RequestException as e:
@@ -73,7 +111,7 @@ def upvote_post(post_id):
 
 def test_auth():
     try:
-        response = requests.get(f"{backend_url}/test_auth", cookies={'session': st.session_state.get('session_cookie', '')})
+        response = client.get("/test_auth", cookies={'session': st.session_state.get('session_cookie', '')})
         response.raise_for_status()
         return True
     except requests.exceptions.RequestException:
@@ -146,15 +184,55 @@ def forum():
                         st.experimental_rerun()
 
         st.subheader("Posts")
-        posts = fetch_posts()
+        search = st.text_input("Search posts").strip()
+        if search:
+            # Results come ranked by relevance, so sort and tag don't apply
+            sort, tag = None, ''
+        else:
+            sort_label = st.selectbox("Sort by", ["Newest", "Most upvoted"])
+            sort = 'top' if sort_label == "Most upvoted" else 'new'
+            tag = st.text_input("Filter by tag").strip()
+
+        # Cursors of the pages visited so far; a new search, sort or tag starts over
+        if st.session_state.get('post_query') != (search, sort, tag):
+            st.session_state['post_query'] = (search, sort, tag)
+            st.session_state['post_cursors'] = [None]
+        cursors = st.session_state['post_cursors']
+
+        if search:
+            posts, next_cursor, window = search_posts(search, cursors[-1])
+            if not posts and len(cursors) == 1:
+                st.info("No posts match your search.")
+            if window:
+                st.caption(f"Many posts match; only the newest {window:,} were ranked. "
+                           "Add words to narrow the search.")
+        else:
+            posts, next_cursor = fetch_posts(sort, cursors[-1], tag)
         for post in posts:
             st.markdown(f"### {post['title']}")
             st.markdown(f"**Tags:** {post['tags']}")
-            st.markdown(post['content'])
+            if st.session_state.get('open_post') == post['id']:
+                full_post = fetch_post(post['id'])
+                st.markdown(full_post['content'] if full_post else post['excerpt'])
+            else:
+                st.markdown(post['excerpt'])
+                # Listings carry at most the first 200 characters of content,
+                # search results only the part around the matches
+                if (search or len(post['excerpt'] or '') >= 200) and st.button("Read more", key=f"read_{post['id']}"):
+                    st.session_state['open_post'] = post['id']
+                    st.experimental_rerun()
             st.markdown(f"**Upvotes:** {post['upvotes']}")
             if st.button("Upvote", key=post['id']):
                 if upvote_post(post['id']):
                     st.experimental_rerun()
 
+        previous_col, next_col = st.columns(2)
+        if len(cursors) > 1 and previous_col.button("Previous page"):
+            cursors.pop()
+            st.experimental_rerun()
+        if next_cursor and next_col.button("Next page"):
+            cursors.append(next_cursor)
+            st.experimental_rerun()
+
 if __name__ == "__main__":
     forum()
@@ -0,0 +1,178 @@
+# forum_auth.py
+# Authentication plumbing for the forum backend: password hashing on a
+# bounded thread pool, per-client rate limits and latency metrics. Settings
+# come from the environment (or a .env file), like forum_storage:
+#
+#   FORUM_PASSWORD_METHOD      Werkzeug method for new hashes (default pbkdf2:sha256:260000)
+#   FORUM_HASH_WORKERS         passwords hashed at once (default 2)
+#   FORUM_HASH_QUEUE           hashes allowed to wait before requests get a 503 (default 32)
+#   FORUM_USER_CACHE_TTL       seconds a loaded user is reused (default 60)
+#   FORUM_USER_CACHE_SIZE      users kept in memory per process (default 10000)
+#   FORUM_AUTH_RATE_LIMIT      /login and /register calls per username and address per window (default 20)
+#   FORUM_ADDRESS_RATE_LIMIT   /login and /register calls per address per window, whatever
+#                              the username (default 300: Streamlit viewers share one address)
+#   FORUM_REGISTER_RATE_LIMIT  /register calls per window from everyone together (default 60)
+#   FORUM_AUTH_RATE_WINDOW     window length in seconds (default 60)
+#   FORUM_RATE_LIMIT_KEYS      buckets each limiter remembers, least recently used dropped
+#                              first (default 100000)
+#   FORUM_METRICS_TOKEN        bearer token for /metrics and /auth/metrics from other
+#                              hosts (default none: loopback only)
+#   FORUM_METRICS_DIR          directory where worker processes share their metrics, so
+#                              /metrics reports all of them (default none: this process;
+#                              forum_server sets one up for gunicorn)
+#
+# Stored hashes carry their own method, so changing the cost never breaks
+# existing passwords; they are rehashed with the new method on next login.
+import collections
+import concurrent.futures
+import os
+import threading
+import time
+
+import numpy as np
+from dotenv import load_dotenv
+from werkzeug.security import check_password_hash, generate_password_hash
+
+AUTH_DEFAULTS = {
+    'password_method': 'pbkdf2:sha256:260000',
+    'hash_workers': 2,
+    'hash_queue': 32,
+    'user_cache_ttl': 60,
+    'user_cache_size': 10000,
+    'rate_limit': 20,
+    'address_rate_limit': 300,
+    'register_rate_limit': 60,
+    'rate_window': 60,
+    'rate_limit_keys': 100000,
+    'metrics_token': '',
+    'metrics_dir': '',
+}
+
+AUTH_ENV_NAMES = {
+    'password_method': 'FORUM_PASSWORD_METHOD',
+    'hash_workers': 'FORUM_HASH_WORKERS',
+    'hash_queue': 'FORUM_HASH_QUEUE',
+    'user_cache_ttl': 'FORUM_USER_CACHE_TTL',
+    'user_cache_size': 'FORUM_USER_CACHE_SIZE',
+    'rate_limit': 'FORUM_AUTH_RATE_LIMIT',
+    'address_rate_limit': 'FORUM_ADDRESS_RATE_LIMIT',
+    'register_rate_limit': 'FORUM_REGISTER_RATE_LIMIT',
+    'rate_window': 'FORUM_AUTH_RATE_WINDOW',
+    'rate_limit_keys': 'FORUM_RATE_LIMIT_KEYS',
+    'metrics_token': 'FORUM_METRICS_TOKEN',
+    'metrics_dir': 'FORUM_METRICS_DIR',
+}
+
+
+def auth_config(**overrides):
+    # Defaults, then environment variables, then explicit keyword overrides
+    load_dotenv()
+    config = dict(AUTH_DEFAULTS)
+    for key, env_name in AUTH_ENV_NAMES.items():
+        if env_name in os.environ:
+            config[key] = type(AUTH_DEFAULTS[key])(os.environ[env_name])
+    config.update(overrides)
+    return config
+
+
+class HasherBusy(RuntimeError):
+    """Raised instead of queueing a hash when the pool's backlog is full."""
+
+
+class PasswordHasher:
+    """Hashes and checks passwords on a fixed number of threads.
+
+    PBKDF2 releases the GIL, so a login storm would otherwise spend every
+    core on hashing; here at most `workers` hashes run at once, up to
+    `max_pending` more wait, and anything beyond that fails fast with
+    HasherBusy while the rest of the app keeps serving.
+    """
+
+    def __init__(self, method=AUTH_DEFAULTS['password_method'], workers=2, max_pending=32):
+        self.method = method
+        self.max_in_flight = workers + max_pending
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _run(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                raise HasherBusy("Too many logins in progress")
+            self._in_flight += 1
+        try:
+            return self._pool.submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def check(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        # The method is everything before the salt: "pbkdf2:sha256:260000$salt$hash"
+        return password_hash.split('$', 1)[0] != self.method
+
+
+class RateLimiter:
+    """Fixed-window counter per key; hit() returns 0 or the seconds to wait.
+
+    At most `max_keys` windows are kept; the least recently hit key is
+    dropped first, so a spray of fresh keys costs O(1) per call.
+    """
+
+    def __init__(self, limit, window, clock=time.monotonic, max_keys=100000):
+        self.limit = limit
+        self.window = window
+        self.clock = clock
+        self.max_keys = max_keys
+        self._windows = collections.OrderedDict()  # key -> (window start, calls)
+        self._lock = threading.Lock()
+
+    def hit(self, key):
+        now = self.clock()
+        with self._lock:
+            start, calls = self._windows.get(key, (now, 0))
+            if now - start >= self.window:
+                start, calls = now, 0
+            if calls >= self.limit:
+                # A key that keeps getting refused stays recent, so it isn't evicted and reset
+                self._windows.move_to_end(key)
+                return start + self.window - now
+            self._windows[key] = (start, calls + 1)
+            self._windows.move_to_end(key)
+            if len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+            return 0
+
+
+class AuthMetrics:
+    """Call counts per status code and latency percentiles per endpoint.
+
+    Latencies are kept for the most recent `samples` calls of each endpoint.
+    """
+
+    def __init__(self, samples=10000):
+        self.samples = samples
+        self._latencies = collections.defaultdict(lambda: collections.deque(maxlen=self.samples))
+        self._statuses = collections.defaultdict(collections.Counter)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, status, seconds):
+        with self._lock:
+            self._latencies[endpoint].append(seconds)
+            self._statuses[endpoint][status] += 1
+
+    def snapshot(self):
+        with self._lock:
+            latencies = {name: np.array(values) for name, values in self._latencies.items()}
+            statuses = {name: dict(counts) for name, counts in self._statuses.items()}
+        return {name: {
+            'count': sum(statuses[name].values()),
+            'status': {str(code): count for code, count in sorted(statuses[name].items())},
+            'p50_ms': float(np.percentile(values, 50) * 1000),
+            'p99_ms': float(np.percentile(values, 99) * 1000),
+        } for name, values in latencies.items()}
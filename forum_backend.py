@@ -3,11 +3,25 @@
 from flask import Flask, request, jsonify, make_response, session
 from flask_cors import CORS
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
-from sqlalchemy import create_engine, Column, Integer, String, Text
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index, func, or_, text, tuple_
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, scoped_session
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.serving import WSGIRequestHandler
+import functools
+import hmac
+import ipaddress
 import logging
+import math
+import os
+import re
+import socket
+import time
+
+from forum_auth import AuthMetrics, HasherBusy, PasswordHasher, RateLimiter, auth_config
+from forum_storage import create_forum_engine
+from forum_votes import VoteBatcher
+from ttl_cache import TTLCache
+import telemetry
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -15,13 +29,28 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.secret_key = 'your_secure_secret_key_here'  # Change this to a secure random key
-CORS(app, supports_credentials=True, origins="http://localhost:8501")
+CORS(app, supports_credentials=True, origins="http://localhost:8501", expose_headers=["X-Next-Cursor", "X-Search-Window"])
 
 login_manager = LoginManager()
 login_manager.init_app(app)
 
-# SQLite database connection
-engine = create_engine('sqlite:///forum.db', connect_args={'check_same_thread': False})
+# Database connection: SQLite file by default, configured in forum_storage
+engine = create_forum_engine()
+
+# Password hashing, rate limits and the user cache, configured in forum_auth.
+# All of them are per process, so under gunicorn each worker has its own;
+# forum_server runs one worker by default for that reason.
+auth_settings = auth_config()
+password_hasher = PasswordHasher(auth_settings['password_method'], auth_settings['hash_workers'], auth_settings['hash_queue'])
+rate_limiter = RateLimiter(auth_settings['rate_limit'], auth_settings['rate_window'],
+                           max_keys=auth_settings['rate_limit_keys'])
+address_limiter = RateLimiter(auth_settings['address_rate_limit'], auth_settings['rate_window'],
+                              max_keys=auth_settings['rate_limit_keys'])
+register_limiter = RateLimiter(auth_settings['register_rate_limit'], auth_settings['rate_window'])
+auth_metrics = AuthMetrics()
+# Users by id for load_user; concurrent loads of the same id share one query
+user_cache = TTLCache(ttl=auth_settings['user_cache_ttl'], max_entries=auth_settings['user_cache_size'])
+telemetry.register_collector('user_cache', user_cache.stats, counters=('hits', 'misses', 'coalesced'))
 Base = declarative_base()
 
 # User model
@@ -32,10 +61,10 @@ class User(Base, UserMixin):
     password_hash = Column(String(100))
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.check(self.password_hash, password)
 
 # Post model
 class Post(Base):
@@ -46,22 +75,244 @@ class Post(Base):
     upvotes = Column(Integer, default=0)
     tags = Column(String(100))
 
+    # Keyset pagination by newest uses the primary key; by upvotes uses this
+    __table_args__ = (Index('ix_posts_upvotes_id', 'upvotes', 'id'),)
+
+# Normalized tags, so filtering by tag is an index lookup instead of a
+# LIKE over Post.tags (which is kept as the display string)
+class Tag(Base):
+    __tablename__ = 'tags'
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), unique=True, nullable=False)
+
+class PostTag(Base):
+    __tablename__ = 'post_tags'
+    tag_id = Column(Integer, ForeignKey('tags.id'), primary_key=True)
+    post_id = Column(Integer, ForeignKey('posts.id'), primary_key=True)
+
+# One row per (user, post) so nobody can upvote the same post twice
+class Vote(Base):
+    __tablename__ = 'votes'
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    post_id = Column(Integer, ForeignKey('posts.id'), primary_key=True)
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+EXCERPT_LENGTH = 200
+
+def parse_tags(tags):
+    # "Earnings , AAPL,," -> ['earnings', 'aapl']
+    return list(dict.fromkeys(t.strip().lower() for t in (tags or '').split(',') if t.strip()))
+
+def tag_post(session_db, post_id, tags):
+    names = parse_tags(tags)
+    if not names:
+        return
+    # Two posts can introduce the same new tag at once; ON CONFLICT makes the
+    # second insert a no-op instead of an IntegrityError on tags.name
+    session_db.execute(text("INSERT INTO tags (name) VALUES (:name) ON CONFLICT (name) DO NOTHING"),
+                       [{'name': name} for name in names])
+    tag_ids = dict(session_db.query(Tag.name, Tag.id).filter(Tag.name.in_(names)))
+    session_db.add_all(PostTag(tag_id=tag_ids[name], post_id=post_id) for name in names)
+
+# Full-text index behind /posts/search (SQLite FTS5). It reads the text from
+# the posts table itself (external content) and these triggers keep it in
+# sync with every insert, edit and delete, whoever writes the row. Upvotes
+# don't touch the indexed columns, so they don't touch the index either.
+FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE posts_fts USING fts5(title, content, tags, content='posts', content_rowid='id', prefix='2 3 4')",
+    "CREATE TRIGGER posts_fts_insert AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, title, content, tags) VALUES (new.id, new.title, new.content, new.tags); END",
+    "CREATE TRIGGER posts_fts_delete AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content, tags) VALUES ('delete', old.id, old.title, old.content, old.tags); END",
+    "CREATE TRIGGER posts_fts_update AFTER UPDATE OF title, content, tags ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content, tags) VALUES ('delete', old.id, old.title, old.content, old.tags); "
+    "INSERT INTO posts_fts(rowid, title, content, tags) VALUES (new.id, new.title, new.content, new.tags); END",
+]
+
+def init_search(engine):
+    if engine.dialect.name != 'sqlite':
+        return
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'posts_fts'")).first():
+            return
+        for statement in FTS_SCHEMA:
+            conn.execute(text(statement))
+        # Index the posts written before the search table existed
+        conn.execute(text("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')"))
+
+def init_db(engine=engine):
+    # create_all skips tables that already exist, so indexes added to an
+    # existing posts table are created separately
+    Base.metadata.create_all(engine)
+    for index in Post.__table__.indexes:
+        index.create(engine, checkfirst=True)
+    session_db = sessionmaker(bind=engine)()
+    try:
+        # One-time backfill of the tag table for posts created before it existed
+        if session_db.query(PostTag).first() is None:
+            for post_id, tags in session_db.query(Post.id, Post.tags).filter(Post.tags != ''):
+                tag_post(session_db, post_id, tags)
+            session_db.commit()
+    finally:
+        session_db.close()
+    init_search(engine)
+
 # Create all tables
-Base.metadata.create_all(engine)
+init_db()
 
 # Session factory
 session_factory = sessionmaker(bind=engine)
 Session = scoped_session(session_factory)
 
-# Load user
+def encode_cursor(sort, row):
+    return f"{row.upvotes}:{row.id}" if sort == 'top' else str(row.id)
+
+def list_posts(session_db, sort='new', cursor=None, limit=PAGE_SIZE, tag=None):
+    """One page of posts for the list view, newest first or by upvotes.
+
+    Keyset pagination: the cursor is the sort key of the last row of the
+    previous page, so every page is an index range scan no matter how deep.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    query = session_db.query(
+        Post.id, Post.title, Post.upvotes, Post.tags,
+        func.substr(Post.content, 1, EXCERPT_LENGTH).label('excerpt')
+    )
+    # With a tag filter, newest-first walks the (tag_id, post_id) primary key
+    # of post_tags; sorting a tag's posts by upvotes still needs a sort step
+    order_id = Post.id
+    if tag:
+        tag_id = session_db.query(Tag.id).filter(Tag.name == tag.strip().lower()).scalar()
+        if tag_id is None:
+            return [], None
+        query = query.join(PostTag, PostTag.post_id == Post.id).filter(PostTag.tag_id == tag_id)
+        order_id = PostTag.post_id
+    if sort == 'top':
+        if cursor:
+            upvotes, post_id = (int(part) for part in cursor.split(':'))
+            query = query.filter(tuple_(Post.upvotes, Post.id) < tuple_(upvotes, post_id))
+        query = query.order_by(Post.upvotes.desc(), Post.id.desc())
+    else:
+        if cursor:
+            query = query.filter(order_id < int(cursor))
+        query = query.order_by(order_id.desc())
+    rows = query.limit(limit + 1).all()
+    next_cursor = encode_cursor(sort, rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+def query_user(user_id):
+    session = Session()
+    try:
+        return session.query(User).get(user_id)
+    finally:
+        session.close()
+
+# Title matches count most, then tags, then the body
+SEARCH_WEIGHTS = (10.0, 1.0, 5.0)
+SNIPPET_TOKENS = 24
+# Optional cap on the matches ranked per query, newest first (0: rank them all).
+# Bounds the cost of words found in most posts on very large forums; responses
+# say when it left older matches out.
+SEARCH_WINDOW = int(os.environ.get('FORUM_SEARCH_WINDOW', 0))
+
+def search_words(query):
+    return re.findall(r'\w+', query or '')
+
+def fts_query(words):
+    # Every word must start a word of the post, so "earn" finds "earnings";
+    # quoting keeps FTS5 operators in the input literal
+    return ' '.join(f'"{w}" *' for w in words)
+
+def search_posts(session_db, query, offset=0, limit=PAGE_SIZE):
+    """One page of posts matching every word of `query`, best match first.
+
+    Returns (rows, next_cursor, truncated). The cursor is an offset, since
+    relevance has no stable key to continue from; truncated is True when
+    SEARCH_WINDOW left older matches unranked. The excerpt is the part of
+    the content around the matches, with matches in **bold**.
+    """
+    words = search_words(query)
+    if not words:
+        return [], None, False
+    if session_db.bind.dialect.name != 'sqlite':
+        return search_posts_like(session_db, words, offset, limit) + (False,)
+    match = fts_query(words)
+    cutoff = None
+    if SEARCH_WINDOW:
+        # Rowid of the oldest match inside the window, found by walking the
+        # match list backwards, which needs no scoring; None if all fit
+        cutoff = session_db.execute(text(
+            "SELECT rowid FROM posts_fts WHERE posts_fts MATCH :match ORDER BY rowid DESC LIMIT 1 OFFSET :window"
+        ), {'match': match, 'window': SEARCH_WINDOW}).scalar()
+    rows = session_db.execute(text(
+        "SELECT posts.id, posts.title, posts.upvotes, posts.tags, "
+        f"snippet(posts_fts, 1, '**', '**', '...', {SNIPPET_TOKENS}) AS excerpt "
+        "FROM posts_fts JOIN posts ON posts.id = posts_fts.rowid "
+        "WHERE posts_fts MATCH :match AND posts_fts.rowid > :cutoff "
+        "ORDER BY bm25(posts_fts, :w_title, :w_content, :w_tags) LIMIT :limit OFFSET :offset"
+    ), {'match': match, 'cutoff': cutoff or 0, 'w_title': SEARCH_WEIGHTS[0], 'w_content': SEARCH_WEIGHTS[1],
+        'w_tags': SEARCH_WEIGHTS[2], 'limit': limit + 1, 'offset': offset}).fetchall()
+    return rows[:limit], (str(offset + limit) if len(rows) > limit else None), cutoff is not None
+
+def search_posts_like(session_db, words, offset=0, limit=PAGE_SIZE):
+    # Databases without FTS5: a LIKE scan for every word, newest first
+    query = session_db.query(
+        Post.id, Post.title, Post.upvotes, Post.tags,
+        func.substr(Post.content, 1, EXCERPT_LENGTH).label('excerpt')
+    )
+    for word in words:
+        # Words are \w+, so '_' is the only LIKE wildcard they can contain
+        pattern = '%' + word.replace('_', '\\_') + '%'
+        query = query.filter(or_(Post.title.ilike(pattern, escape='\\'), Post.content.ilike(pattern, escape='\\'),
+                                 Post.tags.ilike(pattern, escape='\\')))
+    rows = query.order_by(Post.id.desc()).offset(offset).limit(limit + 1).all()
+    return rows[:limit], (str(offset + limit) if len(rows) > limit else None)
+
+# Load user: served from the cache for FORUM_USER_CACHE_TTL seconds, and
+# dropped from it whenever the stored row changes or the user logs out
 @login_manager.user_loader
 def load_user(user_id):
-    session = Session()
-    user = session.query(User).get(int(user_id))
-    session.close()
-    return user
+    user_id = int(user_id)
+    return user_cache.get(user_id, lambda: query_user(user_id))
+
+def auth_endpoint(name):
+    # Rate limits, hashing backpressure and latency metrics for /login and
+    # /register. Every Streamlit viewer reaches us from the same address, so
+    # the tight limit is per username and address: one bad login only locks
+    # that account. A looser per-address limit stops one client spraying
+    # many usernames, and /register also has a limit shared by everyone.
+    def decorate(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            username = str((request.get_json(silent=True) or {}).get('username', ''))
+            buckets = [(address_limiter, (name, request.remote_addr)),
+                       (rate_limiter, (name, request.remote_addr, username))]
+            if name == 'register':
+                buckets.append((register_limiter, name))
+            wait = 0
+            for limiter, key in buckets:
+                wait = limiter.hit(key)
+                if wait:
+                    break
+            if wait:
+                logger.warning(f"Rate limited {name} for {username!r} from {request.remote_addr}")
+                resp = make_response(jsonify({'message': 'Too many attempts, try again later'}), 429)
+                resp.headers['Retry-After'] = str(math.ceil(wait))
+            else:
+                try:
+                    resp = make_response(view(*args, **kwargs))
+                except HasherBusy:
+                    resp = make_response(jsonify({'message': 'Server busy, try again later'}), 503)
+                    resp.headers['Retry-After'] = '1'
+            auth_metrics.record(name, resp.status_code, time.perf_counter() - start)
+            return resp
+        return wrapper
+    return decorate
 
 @app.route('/register', methods=['POST'])
+@auth_endpoint('register')
 def register():
     data = request.get_json()
     username = data['username']
@@ -76,6 +327,8 @@ def register():
         session.commit()
         logger.info(f"User registered successfully: {username}")
         return jsonify({'message': 'User registered successfully'}), 201
+    except HasherBusy:
+        raise
     except Exception as e:
         session.rollback()
         logger.error(f"Failed to register user: {str(e)}")
@@ -84,6 +337,7 @@ def register():
         session.close()
 
 @app.route('/login', methods=['POST'])
+@auth_endpoint('login')
 def login():
     data = request.get_json()
     username = data['username']
@@ -92,6 +346,11 @@ def login():
     try:
         user = session_db.query(User).filter_by(username=username).first()
         if user and user.check_password(password):
+            if password_hasher.needs_rehash(user.password_hash):
+                # Stored with an older cost setting; upgrade it while we have the password
+                user.set_password(password)
+                session_db.commit()
+                user_cache.invalidate(user.id)
             login_user(user)
             logger.info(f"User logged in successfully: {username}")
             resp = make_response(jsonify({'message': 'Login successful'}))
@@ -99,6 +358,8 @@ def login():
             return resp, 200
         logger.warning(f"Invalid login attempt for user: {username}")
         return jsonify({'message': 'Invalid credentials'}), 401
+    except HasherBusy:
+        raise
     except Exception as e:
         logger.error(f"Failed to login: {str(e)}")
         return jsonify({'message': 'Failed to login', 'error': str(e)}), 500
@@ -108,6 +369,7 @@ def login():
 @app.route('/logout', methods=['POST'])
 @login_required
 def logout():
+    user_cache.invalidate(current_user.id)
     logout_user()
     logger.info("User logged out successfully")
     resp = make_response(jsonify({'message': 'Logout successful'}))
@@ -117,20 +379,88 @@ def logout():
 @app.route('/posts', methods=['GET'])
 @login_required
 def get_posts():
+    sort = request.args.get('sort', 'new')
+    if sort not in ('new', 'top'):
+        return jsonify({'message': 'sort must be "new" or "top"'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({'message': 'limit must be an integer'}), 400
     session_db = Session()
     try:
-        posts = session_db.query(Post).all()
-        logger.info(f"Fetched {len(posts)} posts")
-        return jsonify([{
+        rows, next_cursor = list_posts(session_db, sort, request.args.get('cursor'), limit, request.args.get('tag'))
+        logger.info(f"Fetched {len(rows)} posts")
+        resp = make_response(jsonify([{
+            'id': row.id,
+            'title': row.title,
+            'excerpt': row.excerpt,
+            'upvotes': row.upvotes,
+            'tags': row.tags
+        } for row in rows]))
+        # The body stays a plain list; the cursor for the next page rides in a header
+        if next_cursor:
+            resp.headers['X-Next-Cursor'] = next_cursor
+        return resp, 200
+    except ValueError:
+        return jsonify({'message': 'Invalid cursor'}), 400
+    except Exception as e:
+        logger.error(f"Failed to fetch posts: {str(e)}")
+        return jsonify({'message': 'Failed to fetch posts', 'error': str(e)}), 500
+    finally:
+        session_db.close()
+
+@app.route('/posts/search', methods=['GET'])
+@login_required
+def search():
+    query = request.args.get('q', '')
+    if not search_words(query):
+        return jsonify({'message': 'q must contain at least one word'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        offset = max(int(request.args.get('cursor') or 0), 0)
+    except ValueError:
+        return jsonify({'message': 'limit and cursor must be integers'}), 400
+    session_db = Session()
+    try:
+        rows, next_cursor, truncated = search_posts(session_db, query, offset, limit)
+        logger.info(f"Search for {query!r} returned {len(rows)} posts")
+        resp = make_response(jsonify([{
+            'id': row.id,
+            'title': row.title,
+            'excerpt': row.excerpt,
+            'upvotes': row.upvotes,
+            'tags': row.tags
+        } for row in rows]))
+        if next_cursor:
+            resp.headers['X-Next-Cursor'] = next_cursor
+        if truncated:
+            # Only the newest SEARCH_WINDOW matches were ranked
+            resp.headers['X-Search-Window'] = str(SEARCH_WINDOW)
+        return resp, 200
+    except Exception as e:
+        logger.error(f"Failed to search posts: {str(e)}")
+        return jsonify({'message': 'Failed to search posts', 'error': str(e)}), 500
+    finally:
+        session_db.close()
+
+@app.route('/posts/<int:post_id>', methods=['GET'])
+@login_required
+def get_post(post_id):
+    session_db = Session()
+    try:
+        post = session_db.query(Post).get(post_id)
+        if post is None:
+            return jsonify({'message': 'Post not found'}), 404
+        return jsonify({
             'id': post.id,
             'title': post.title,
             'content': post.content,
             'upvotes': post.upvotes,
             'tags': post.tags
-        } for post in posts]), 200
+        }), 200
     except Exception as e:
-        logger.error(f"Failed to fetch posts: {str(e)}")
-        return jsonify({'message': 'Failed to fetch posts', 'error': str(e)}), 500
+        logger.error(f"Failed to fetch post: {str(e)}")
+        return jsonify({'message': 'Failed to fetch post', 'error': str(e)}), 500
     finally:
         session_db.close()
 
@@ -147,6 +477,8 @@ def create_post():
             tags=data['tags']
         )
         session_db.add(new_post)
+        session_db.flush()
+        tag_post(session_db, new_post.id, new_post.tags)
         session_db.commit()
         logger.info(f"Post created successfully: {new_post.title}")
         return jsonify({'message': 'Post created successfully'}), 201
@@ -157,30 +489,95 @@ def create_post():
     finally:
         session_db.close()
 
+# Upvotes go through one writer thread per process that commits whatever
+# votes are queued in a single transaction; see forum_votes
+vote_batcher = VoteBatcher(engine)
+telemetry.register_collector('votes', vote_batcher.stats, counters=('batches', 'votes'))
+
 @app.route('/posts/<int:post_id>/upvote', methods=['POST'])
 @login_required
 def upvote_post(post_id):
-    session_db = Session()
     try:
-        post = session_db.query(Post).get(post_id)
-        if post:
-            post.upvotes += 1
-            session_db.commit()
-            logger.info(f"Post upvoted successfully: {post.title}")
+        result = vote_batcher.submit(post_id, current_user.id)
+        if result == 'ok':
+            logger.info(f"Post upvoted successfully: {post_id}")
             return jsonify({'message': 'Post upvoted successfully'}), 200
+        if result == 'duplicate':
+            logger.info(f"Repeat upvote ignored for post {post_id} by user {current_user.id}")
+            return jsonify({'message': 'You have already upvoted this post'}), 409
         logger.warning(f"Attempt to upvote non-existent post: {post_id}")
         return jsonify({'message': 'Post not found'}), 404
     except Exception as e:
-        session_db.rollback()
         logger.error(f"Failed to upvote post: {str(e)}")
         return jsonify({'message': 'Failed to upvote post', 'error': str(e)}), 500
-    finally:
-        session_db.close()
+
+# With several worker processes each one writes its metrics to a shared
+# directory, and /metrics sums them so counters don't depend on which
+# worker answers the scrape
+shared_metrics = (telemetry.SharedSnapshots(auth_settings['metrics_dir'], telemetry.registry)
+                  if auth_settings['metrics_dir'] else None)
+
+# Every request becomes an http_server span, labelled by route, method and status
+@app.before_request
+def start_request_timer():
+    request.environ['telemetry.start'] = time.perf_counter()
+    if shared_metrics:
+        shared_metrics.start()
+
+@app.after_request
+def observe_request(response):
+    start = request.environ.get('telemetry.start')
+    if start is not None:
+        telemetry.observe('http_server', time.perf_counter() - start, error=response.status_code >= 500,
+                          size=response.calculate_content_length(), endpoint=request.endpoint or 'unmatched',
+                          method=request.method, status=response.status_code)
+    return response
+
+def metrics_endpoint(view):
+    # Metrics name routes and tables, so they are served to loopback scrapers
+    # and to anyone presenting FORUM_METRICS_TOKEN as a bearer token
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            loopback = ipaddress.ip_address(request.remote_addr or '').is_loopback
+        except ValueError:
+            loopback = False
+        token = auth_settings['metrics_token']
+        if not loopback and not (token and hmac.compare_digest(
+                request.headers.get('Authorization', ''), f'Bearer {token}')):
+            return jsonify({'message': 'Forbidden'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/metrics', methods=['GET'])
+@metrics_endpoint
+def get_metrics():
+    # Prometheus scrape target: spans, SQL queries and cache counters of every
+    # worker sharing FORUM_METRICS_DIR, or of this process without one
+    body = shared_metrics.prometheus() if shared_metrics else telemetry.registry.prometheus()
+    return app.response_class(body, mimetype='text/plain; version=0.0.4')
+
+@app.route('/auth/metrics', methods=['GET'])
+@metrics_endpoint
+def get_auth_metrics():
+    # This process's auth latencies and user cache counters
+    return jsonify({'endpoints': auth_metrics.snapshot(), 'user_cache': user_cache.stats(),
+                    'password_method': password_hasher.method}), 200
 
 @app.route('/test_auth', methods=['GET'])
 @login_required
 def test_auth():
     return jsonify({'message': 'Authentication working'}), 200
 
+# HTTP/1.1 lets the forum client's pooled connections stay open between calls;
+# TCP_NODELAY stops delayed ACKs from adding ~40 ms to every reused connection
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+# Development server; forum_server.py runs the app under gunicorn with several workers
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    app.run(debug=True, port=5000, request_handler=KeepAliveRequestHandler)
\ No newline at end of file
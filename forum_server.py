@@ -0,0 +1,106 @@
+# forum_server.py
+# Production launcher for the forum backend. `python forum_backend.py` still
+# starts Flask's single-process development server; this runs the same app
+# under gunicorn, serving requests on a pool of threads, so a handler blocked
+# on the database only holds one thread. The routes and their JSON are
+# unchanged.
+#
+#   python forum_server.py                     gunicorn, FORUM_WORKERS x FORUM_THREADS
+#   python forum_server.py --server dev        Werkzeug development server
+#
+# Settings come from the command line or the environment (or a .env file):
+#
+#   FORUM_BIND      host:port to listen on (default 127.0.0.1:5000)
+#   FORUM_WORKERS   worker processes (default 1)
+#   FORUM_THREADS   request threads per worker (default 16)
+#   FORUM_TIMEOUT   seconds before a stuck worker is restarted (default 30)
+#
+# One worker is the default because the auth rate limits and the user cache
+# live in each process (see forum_auth). With FORUM_WORKERS=N every limit is
+# effectively N times higher, and a logout or password upgrade only drops
+# the cached user in the worker that handled it; the others keep serving it
+# for up to FORUM_USER_CACHE_TTL seconds. Raise it only on several cores,
+# with limits divided by N and a short user cache TTL.
+#
+# Workers share their metrics through FORUM_METRICS_DIR (see forum_auth);
+# when it isn't set, gunicorn gets a fresh temporary directory per start.
+import argparse
+import os
+import tempfile
+
+from dotenv import load_dotenv
+
+DEFAULT_BIND = '127.0.0.1:5000'
+DEFAULT_THREADS = 16
+DEFAULT_TIMEOUT = 30
+
+
+def default_workers():
+    # Rate limits and the user cache are per process; see the note above
+    return 1
+
+
+def gunicorn_options(bind=DEFAULT_BIND, workers=None, threads=DEFAULT_THREADS, timeout=DEFAULT_TIMEOUT):
+    return {
+        'bind': bind,
+        'workers': workers or default_workers(),
+        'threads': threads,
+        'worker_class': 'gthread',
+        'timeout': timeout,
+        # Keep the forum client's pooled connections open between calls
+        'keepalive': 5,
+        # Import the app (and run init_db) once in the master, not per worker
+        'preload_app': True,
+        'post_fork': post_fork,
+        'accesslog': None,
+    }
+
+
+def post_fork(server, worker):
+    # Connections opened by the master before forking must not be shared:
+    # every worker starts with an empty pool of its own
+    from forum_backend import engine
+    engine.dispose()
+
+
+def run_gunicorn(options):
+    # Optional dependency, only needed for this deployment mode
+    from gunicorn.app.base import BaseApplication
+
+    class ForumApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from forum_backend import app
+            return app
+
+    ForumApplication().run()
+
+
+def run_dev(bind=DEFAULT_BIND):
+    from forum_backend import KeepAliveRequestHandler, app
+    host, port = bind.rsplit(':', 1)
+    app.run(host=host, port=int(port), threaded=True, request_handler=KeepAliveRequestHandler)
+
+
+def main(argv=None):
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Serve the forum backend.")
+    parser.add_argument('--server', choices=['gunicorn', 'dev'], default='gunicorn')
+    parser.add_argument('--bind', default=os.environ.get('FORUM_BIND', DEFAULT_BIND))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('FORUM_WORKERS', 0)) or None)
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('FORUM_THREADS', DEFAULT_THREADS)))
+    parser.add_argument('--timeout', type=int, default=int(os.environ.get('FORUM_TIMEOUT', DEFAULT_TIMEOUT)))
+    args = parser.parse_args(argv)
+    if args.server == 'dev':
+        run_dev(args.bind)
+    else:
+        # Set before the app is imported, so every worker inherits it
+        os.environ.setdefault('FORUM_METRICS_DIR', tempfile.mkdtemp(prefix='forum-metrics-'))
+        run_gunicorn(gunicorn_options(args.bind, args.workers, args.threads, args.timeout))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# forum_storage.py
+# Engine construction for the forum backend. Everything is configurable from
+# the environment (or a .env file), so the same code runs on the local SQLite
+# file or on a Postgres container:
+#
+#   FORUM_DATABASE_URL         sqlite:///forum.db (default) or postgresql://...
+#   FORUM_DB_POOL_SIZE         connections kept open per process (default 10)
+#   FORUM_DB_MAX_OVERFLOW      extra connections under bursts (default 10)
+#   FORUM_DB_BUSY_TIMEOUT_MS   how long SQLite waits on a lock (default 5000)
+#   FORUM_SQLITE_JOURNAL_MODE  WAL (default), DELETE, ...
+#   FORUM_SQLITE_SYNCHRONOUS   NORMAL (default), FULL, OFF
+#   FORUM_SQLITE_CACHE_SIZE    page cache; negative values are KiB (default -64000)
+import functools
+import os
+import re
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool, StaticPool
+
+import telemetry
+
+DEFAULTS = {
+    'url': 'sqlite:///forum.db',
+    'pool_size': 10,
+    'max_overflow': 10,
+    'busy_timeout_ms': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+}
+
+ENV_NAMES = {
+    'url': 'FORUM_DATABASE_URL',
+    'pool_size': 'FORUM_DB_POOL_SIZE',
+    'max_overflow': 'FORUM_DB_MAX_OVERFLOW',
+    'busy_timeout_ms': 'FORUM_DB_BUSY_TIMEOUT_MS',
+    'journal_mode': 'FORUM_SQLITE_JOURNAL_MODE',
+    'synchronous': 'FORUM_SQLITE_SYNCHRONOUS',
+    'cache_size': 'FORUM_SQLITE_CACHE_SIZE',
+}
+
+
+def storage_config(**overrides):
+    # Defaults, then environment variables, then explicit keyword overrides
+    load_dotenv()
+    config = dict(DEFAULTS)
+    for key, env_name in ENV_NAMES.items():
+        if env_name in os.environ:
+            config[key] = type(DEFAULTS[key])(os.environ[env_name])
+    config.update(overrides)
+    return config
+
+
+# First table a statement reads or writes, for the sql_query span's labels
+TABLE_PATTERN = re.compile(r'\b(?:FROM|INTO|UPDATE(?!\s+OF\b)|TABLE|ON)\s+(?:IF\s+NOT\s+EXISTS\s+)?"?(\w+)', re.IGNORECASE)
+
+
+# Statements repeat, so the regex runs once per distinct one
+@functools.lru_cache(maxsize=1024)
+def statement_labels(statement):
+    match = TABLE_PATTERN.search(statement)
+    return {'kind': statement.lstrip().split(None, 1)[0].upper() if statement.strip() else '',
+            'table': match.group(1) if match else ''}
+
+
+def trace_queries(engine):
+    # Every statement becomes a sql_query span, labelled by kind and table
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def end_query(conn, cursor, statement, parameters, context, executemany):
+        telemetry.observe('sql_query', time.perf_counter() - conn.info['query_start'].pop(),
+                          **statement_labels(statement))
+
+    @event.listens_for(engine, 'handle_error')
+    def failed_query(exception_context):
+        starts = exception_context.connection.info.get('query_start') if exception_context.connection else None
+        if starts:
+            telemetry.observe('sql_query', time.perf_counter() - starts.pop(), error=True,
+                              **statement_labels(exception_context.statement or ''))
+
+    return engine
+
+
+def create_forum_engine(config=None):
+    config = config or storage_config()
+    url = config['url']
+    if not url.startswith('sqlite'):
+        # Server databases: a real pool, with stale connections detected on checkout
+        return trace_queries(create_engine(url, pool_size=config['pool_size'], max_overflow=config['max_overflow'],
+                                           pool_pre_ping=True, pool_recycle=1800))
+
+    in_memory = url in ('sqlite://', 'sqlite:///:memory:')
+    engine = create_engine(
+        url,
+        connect_args={'check_same_thread': False, 'timeout': config['busy_timeout_ms'] / 1000},
+        # An in-memory database only exists on its one connection
+        poolclass=StaticPool if in_memory else QueuePool,
+        **({} if in_memory else {'pool_size': config['pool_size'], 'max_overflow': config['max_overflow']})
+    )
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not in_memory and config['journal_mode']:
+            # WAL lets readers keep reading while a writer commits
+            cursor.execute(f"PRAGMA journal_mode={config['journal_mode']}")
+        if config['synchronous']:
+            cursor.execute(f"PRAGMA synchronous={config['synchronous']}")
+        cursor.execute(f"PRAGMA busy_timeout={int(config['busy_timeout_ms'])}")
+        cursor.execute(f"PRAGMA cache_size={int(config['cache_size'])}")
+        cursor.close()
+
+    return trace_queries(engine)
@@ -0,0 +1,151 @@
+# fundamentals.py
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+from telemetry import payload_size, span
+
+# Statements shown in the Financial Data tab, by yf.Ticker attribute name
+STATEMENTS = ['balance_sheet', 'quarterly_balance_sheet', 'cashflow']
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'fundamentals')
+
+# Statements change at most once a quarter; a week keeps them reasonably fresh
+DEFAULT_TTL = 7 * 24 * 3600
+
+# A set with an empty statement is kept (ETFs have none) but checked again
+# sooner, since an empty answer is also what a throttled request looks like
+EMPTY_TTL = 6 * 3600
+
+# Wait this long after a failed background refresh before trying again
+RETRY_AFTER = 15 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class FundamentalsFetcher:
+    """Source of financial statements for a ticker."""
+
+    def fetch(self, ticker, statement):
+        raise NotImplementedError
+
+
+class YFinanceFundamentals(FundamentalsFetcher):
+    def fetch(self, ticker, statement):
+        import yfinance as yf
+        with span('yfinance_statement', statement=statement) as s:
+            frame = getattr(yf.Ticker(ticker), statement)
+            s.size = payload_size(frame)
+        return frame
+
+
+class FundamentalsStore:
+    """Local statement store that answers from disk and refreshes behind the UI.
+
+    get() returns whatever is stored right away. Stale entries are refreshed
+    on a background thread (one refresh per ticker at a time, none within
+    `retry_after` of a failed one); only a ticker that was never stored is
+    fetched inline, with all statements in parallel. Sets with an empty
+    statement go stale after `empty_ttl` instead of `ttl`.
+    """
+
+    def __init__(self, fetcher=None, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, empty_ttl=EMPTY_TTL,
+                 retry_after=RETRY_AFTER, clock=time.time):
+        self.fetcher = fetcher or YFinanceFundamentals()
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+        self.retry_after = retry_after
+        self.clock = clock
+        self._refreshing = {}
+        self._failed_at = {}
+        self._lock = threading.Lock()
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _folder(self, ticker):
+        return os.path.join(self.cache_dir, ticker.upper())
+
+    def fetch_all(self, ticker):
+        # The statements are independent requests, so fetch them side by side
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(STATEMENTS)) as pool:
+            frames = pool.map(lambda name: self.fetcher.fetch(ticker, name), STATEMENTS)
+            return dict(zip(STATEMENTS, frames))
+
+    def _load(self, ticker):
+        # (statements, meta) or (None, None) when nothing is stored
+        folder = self._folder(ticker)
+        meta_path = os.path.join(folder, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None, None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        statements = {name: pd.read_pickle(os.path.join(folder, f'{name}.pkl')) for name in STATEMENTS}
+        return statements, meta
+
+    def _save(self, ticker, statements, empty):
+        folder = self._folder(ticker)
+        os.makedirs(folder, exist_ok=True)
+        for name, frame in statements.items():
+            path = os.path.join(folder, f'{name}.pkl')
+            pd.DataFrame(frame).to_pickle(path + '.tmp')
+            os.replace(path + '.tmp', path)
+        # meta.json goes last: it marks a complete set of statements
+        with open(os.path.join(folder, 'meta.json.tmp'), 'w') as f:
+            json.dump({'fetched_at': self.clock(), 'empty': empty}, f)
+        os.replace(os.path.join(folder, 'meta.json.tmp'), os.path.join(folder, 'meta.json'))
+
+    def refresh(self, ticker):
+        statements = {name: pd.DataFrame(frame) for name, frame in self.fetch_all(ticker).items()}
+        empty = [name for name, frame in statements.items() if frame.empty]
+        if empty:
+            logger.warning(f"{ticker}: {', '.join(empty)} came back empty; checking again in {self.empty_ttl} s")
+            # Don't let a throttled request replace statements stored earlier
+            stored, _ = self._load(ticker)
+            if stored:
+                statements.update({name: stored[name] for name in empty if not stored[name].empty})
+        self._save(ticker, statements, empty)
+        return statements
+
+    def _refresh_in_background(self, ticker):
+        with self._lock:
+            if ticker in self._refreshing:
+                return self._refreshing[ticker]
+            future = self._pool.submit(self.refresh, ticker)
+            self._refreshing[ticker] = future
+        future.add_done_callback(lambda done: self._forget(ticker, done))
+        return future
+
+    def _forget(self, ticker, future):
+        with self._lock:
+            self._refreshing.pop(ticker, None)
+            if future.exception() is not None:
+                self._failed_at[ticker] = self.clock()
+            else:
+                self._failed_at.pop(ticker, None)
+        if future.exception() is not None:
+            # Nobody waits on a background refresh, so this is the only trace of it
+            logger.warning(f"Background refresh of {ticker} statements failed: {future.exception()!r}")
+
+    def _backing_off(self, ticker):
+        with self._lock:
+            failed_at = self._failed_at.get(ticker)
+        return failed_at is not None and self.clock() - failed_at < self.retry_after
+
+    def get(self, ticker):
+        """Return (statements, fetched_at, refreshing)."""
+        ticker = ticker.strip().upper()
+        statements, meta = self._load(ticker)
+        if statements is None:
+            statements = self.refresh(ticker)
+            return statements, self.clock(), False
+        ttl = self.empty_ttl if meta.get('empty') else self.ttl
+        if self.clock() - meta['fetched_at'] >= ttl and not self._backing_off(ticker):
+            self._refresh_in_background(ticker)
+            return statements, meta['fetched_at'], True
+        return statements, meta['fetched_at'], False
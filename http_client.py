@@ -0,0 +1,194 @@
+# http_client.py
+# Shared HTTP client for every outbound call: keep-alive connection pooling,
+# per-call timeouts, retries with jittered backoff, a circuit breaker per host
+# and latency histograms per endpoint.
+import random
+import re
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+import telemetry
+from telemetry import LatencyHistogram
+
+# Responses worth retrying for idempotent requests
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without touching the network while a host's breaker is open."""
+
+
+class _NoStoreCookiePolicy(DefaultCookiePolicy):
+    # The pooled session is shared by every Streamlit user, so it must never
+    # remember cookies from responses; callers pass cookies per request.
+    def set_ok(self, cookie, request):
+        return False
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures and lets a single trial
+    request through once `cooldown` seconds have passed."""
+
+    def __init__(self, threshold=5, cooldown=30.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.clock() - self.opened_at >= self.cooldown and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record(self, success):
+        with self._lock:
+            self._trial = False
+            if success:
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.failures += 1
+                if self.failures >= self.threshold:
+                    self.opened_at = self.clock()
+
+    def release(self):
+        # Frees the trial slot when a request ends without an outcome to record
+        with self._lock:
+            self._trial = False
+
+
+def endpoint_name(method, url):
+    # "GET host/posts/{id}/upvote" style key, so ids don't explode the metrics
+    path = re.sub(r'/\d+(?=/|$)', '/{id}', urlparse(url).path or '/')
+    return f"{method.upper()} {urlparse(url).netloc}{path}"
+
+
+class HttpClient:
+    def __init__(self, base_url='', timeout=(3.05, 10), retries=2, backoff=0.2, max_backoff=2.0,
+                 breaker_threshold=5, breaker_cooldown=30.0, pool_size=10):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.session = requests.Session()
+        self.session.cookies.set_policy(_NoStoreCookiePolicy())
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._breakers = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, host):
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+            return self._breakers[host]
+
+    def _observe(self, endpoint, seconds, error, size=None):
+        with self._lock:
+            histogram = self._histograms.setdefault(endpoint, LatencyHistogram())
+            histogram.observe(seconds, error)
+        # Every client's calls also land in the process-wide telemetry
+        telemetry.observe('http_request', seconds, error, size, endpoint=endpoint)
+
+    def metrics(self):
+        with self._lock:
+            return {endpoint: h.summary() for endpoint, h in self._histograms.items()}
+
+    def _sleep_before_retry(self, attempt):
+        # Full jitter: anywhere between zero and the capped exponential delay
+        time.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)))
+
+    def request(self, method, url, timeout=None, **kwargs):
+        if self.base_url and not url.startswith(('http://', 'https://')):
+            url = f"{self.base_url}/{url.lstrip('/')}"
+        breaker = self._breaker(urlparse(url).netloc)
+        endpoint = endpoint_name(method, url)
+        idempotent = method.upper() in ('GET', 'HEAD', 'OPTIONS')
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {urlparse(url).netloc}")
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self._observe(endpoint, time.perf_counter() - start, True)
+                breaker.record(False)
+                # A connection that was never made can be retried for any method;
+                # read errors only for idempotent ones
+                transient = isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                if attempt < self.retries and transient and (idempotent or _never_sent(e)):
+                    self._sleep_before_retry(attempt)
+                    attempt += 1
+                    continue
+                raise
+            except BaseException:
+                # Not the host's fault, but a half-open breaker mustn't wait on it forever
+                breaker.release()
+                raise
+            failed = response.status_code >= 500
+            self._observe(endpoint, time.perf_counter() - start, failed, len(response.content))
+            breaker.record(not failed)
+            if idempotent and response.status_code in RETRY_STATUSES and attempt < self.retries:
+                self._sleep_before_retry(attempt)
+                attempt += 1
+                continue
+            return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+def _never_sent(error):
+    # Connection refused, DNS failures and connect timeouts all happen before
+    # the request is written. requests wraps urllib3's MaxRetryError, whose
+    # reason is the connect error, so follow args, reason and the cause chain.
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError):
+        return False
+    pending, seen = [error], set()
+    while pending:
+        e = pending.pop()
+        if not isinstance(e, BaseException) or id(e) in seen:
+            continue
+        seen.add(id(e))
+        if isinstance(e, (NewConnectionError, ConnectTimeoutError, ConnectionRefusedError)):
+            return True
+        pending.extend([getattr(e, 'reason', None), e.__cause__, e.__context__, *e.args])
+    return False
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide client for calls that don't need their own base URL."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
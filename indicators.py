@@ -0,0 +1,350 @@
+# indicators.py
+# Technical indicators in two modes that give the same numbers:
+#   - batch functions (sma, ema, ...) over a whole 1-D NumPy price array
+#   - streaming classes (SMA, EMA, ...) that keep O(1) state and take one
+#     bar at a time through update(), for series that only grow at the end
+# Values before an indicator has enough bars are NaN in both modes.
+import numpy as np
+import pandas as pd
+
+from metrics import TRADING_DAYS
+
+
+def _ewm(values, alpha):
+    # y[0] = x[0], y[i] = (1 - alpha) * y[i-1] + alpha * x[i]
+    return pd.Series(values, dtype='float64').ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def _rolling_mean_std(values, window):
+    # Rolling mean and population standard deviation, NaN until the window fills
+    values = np.asarray(values, dtype='float64')
+    mean = np.full(len(values), np.nan)
+    std = np.full(len(values), np.nan)
+    if len(values) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        mean[window - 1:] = windows.mean(axis=1)
+        std[window - 1:] = windows.std(axis=1)
+    return mean, std
+
+
+def sma(prices, window=20):
+    return _rolling_mean_std(prices, window)[0]
+
+
+def ema(prices, span=20):
+    return _ewm(prices, 2.0 / (span + 1))
+
+
+def rolling_volatility(prices, window=20, periods=TRADING_DAYS):
+    # Annualized standard deviation of the last `window` simple returns
+    prices = np.asarray(prices, dtype='float64')
+    out = np.full(len(prices), np.nan)
+    if len(prices) > 1:
+        out[1:] = _rolling_mean_std(prices[1:] / prices[:-1] - 1, window)[1] * np.sqrt(periods)
+    return out
+
+
+def bollinger_bands(prices, window=20, num_std=2.0):
+    # Returns (middle, upper, lower)
+    middle, std = _rolling_mean_std(prices, window)
+    return middle, middle + num_std * std, middle - num_std * std
+
+
+def _wilder_averages(prices, period):
+    # Average gain and loss from bar `period` on: seeded with the plain mean of
+    # the first `period` moves, then smoothed with alpha = 1 / period
+    delta = np.diff(np.asarray(prices, dtype='float64'))
+    gains = np.maximum(delta, 0.0)
+    losses = np.maximum(-delta, 0.0)
+    avg_gain = _ewm(np.concatenate([[gains[:period].mean()], gains[period:]]), 1.0 / period)
+    avg_loss = _ewm(np.concatenate([[losses[:period].mean()], losses[period:]]), 1.0 / period)
+    return avg_gain, avg_loss
+
+
+def _rsi_value(avg_gain, avg_loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + np.divide(avg_gain, avg_loss))
+
+
+def rsi(prices, period=14):
+    # Wilder's relative strength index
+    out = np.full(len(prices), np.nan)
+    if len(prices) > period:
+        out[period:] = _rsi_value(*_wilder_averages(prices, period))
+    return out
+
+
+def macd(prices, fast=12, slow=26, signal=9):
+    # Returns (macd line, signal line, histogram)
+    line = ema(prices, fast) - ema(prices, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+class _RollingWindow:
+    """Fixed-size ring buffer with a running mean and sum of squared deviations.
+
+    Updates use the sliding-window form of Welford's algorithm, and both
+    values are rebuilt from the buffer every time it wraps (and whenever the
+    window is nearly flat). That costs O(window) once per `window` updates
+    and keeps floating-point drift from accumulating over long streams.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = np.zeros(window)
+        self.count = 0
+        self.pos = 0
+        self.avg = 0.0
+        self.m2 = 0.0
+
+    def _resync(self):
+        values = self.buffer[:self.count]
+        self.avg = float(values.mean()) if self.count else 0.0
+        self.m2 = float(((values - self.avg) ** 2).sum())
+
+    def seed(self, values):
+        # Load the most recent values of a history, oldest first
+        values = np.asarray(values, dtype='float64')[-self.window:]
+        self.buffer[:] = 0.0
+        self.buffer[:len(values)] = values
+        self.count = len(values)
+        self.pos = self.count % self.window
+        self._resync()
+
+    def push(self, value):
+        old = self.buffer[self.pos]
+        self.buffer[self.pos] = value
+        self.pos = (self.pos + 1) % self.window
+        if self.count < self.window:
+            self.count += 1
+            delta = value - self.avg
+            self.avg += delta / self.count
+            self.m2 += delta * (value - self.avg)
+        elif self.pos == 0:
+            self._resync()
+        else:
+            prev_avg = self.avg
+            self.avg += (value - old) / self.window
+            self.m2 += (value - old) * (value - self.avg + old - prev_avg)
+            if self.m2 <= 1e-9 * self.window * max(self.avg * self.avg, value * value, old * old):
+                # Near-flat window: rounding noise would dominate the
+                # deviation, so recompute it exactly
+                self._resync()
+
+    def full(self):
+        return self.count == self.window
+
+    def mean(self):
+        return self.avg if self.full() else np.nan
+
+    def std(self):
+        return np.sqrt(max(self.m2 / self.window, 0.0)) if self.full() else np.nan
+
+
+class StreamingIndicator:
+    """Base class for the O(1)-per-bar indicators.
+
+    seed() loads the state a stream would have after seeing a whole history,
+    using vectorized work instead of a Python loop over every bar.
+    """
+
+    outputs = 1
+
+    def seed(self, prices):
+        raise NotImplementedError
+
+    def update(self, price):
+        raise NotImplementedError
+
+    def extend(self, prices):
+        # Feed several bars and return the same arrays the batch function would
+        rows = [self.update(p) for p in prices]
+        if self.outputs == 1:
+            return np.array(rows, dtype='float64')
+        return tuple(np.array(column, dtype='float64') for column in zip(*rows)) \
+            if rows else tuple(np.array([]) for _ in range(self.outputs))
+
+
+class SMA(StreamingIndicator):
+    def __init__(self, window=20):
+        self.window = _RollingWindow(window)
+
+    def seed(self, prices):
+        self.window.seed(prices)
+
+    def update(self, price):
+        self.window.push(price)
+        return self.window.mean()
+
+
+class EMA(StreamingIndicator):
+    def __init__(self, span=20):
+        self.alpha = 2.0 / (span + 1)
+        self.value = None
+
+    def seed(self, prices):
+        self.value = float(_ewm(prices, self.alpha)[-1]) if len(prices) else None
+
+    def update(self, price):
+        if self.value is None:
+            self.value = float(price)
+        else:
+            self.value = (1 - self.alpha) * self.value + self.alpha * price
+        return self.value
+
+
+class RollingVolatility(StreamingIndicator):
+    def __init__(self, window=20, periods=TRADING_DAYS):
+        self.window = _RollingWindow(window)
+        self.scale = np.sqrt(periods)
+        self.last = None
+
+    def seed(self, prices):
+        prices = np.asarray(prices, dtype='float64')
+        tail = prices[-(self.window.window + 1):]
+        self.window.seed(tail[1:] / tail[:-1] - 1)
+        self.last = float(prices[-1]) if len(prices) else None
+
+    def update(self, price):
+        if self.last is not None:
+            self.window.push(price / self.last - 1)
+        self.last = price
+        return self.window.std() * self.scale
+
+
+class BollingerBands(StreamingIndicator):
+    outputs = 3
+
+    def __init__(self, window=20, num_std=2.0):
+        self.window = _RollingWindow(window)
+        self.num_std = num_std
+
+    def seed(self, prices):
+        self.window.seed(prices)
+
+    def update(self, price):
+        self.window.push(price)
+        middle, std = self.window.mean(), self.window.std()
+        return middle, middle + self.num_std * std, middle - self.num_std * std
+
+
+class RSI(StreamingIndicator):
+    def __init__(self, period=14):
+        self.period = period
+        self.last = None
+        self.moves = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def seed(self, prices):
+        prices = np.asarray(prices, dtype='float64')
+        self.last = float(prices[-1]) if len(prices) else None
+        self.moves = max(len(prices) - 1, 0)
+        if self.moves >= self.period:
+            avg_gain, avg_loss = _wilder_averages(prices, self.period)
+            self.avg_gain, self.avg_loss = float(avg_gain[-1]), float(avg_loss[-1])
+        else:
+            # Still inside the seed window: keep running sums
+            delta = np.diff(prices)
+            self.avg_gain = float(np.maximum(delta, 0.0).sum())
+            self.avg_loss = float(np.maximum(-delta, 0.0).sum())
+
+    def update(self, price):
+        if self.last is None:
+            self.last = price
+            return np.nan
+        delta = price - self.last
+        self.last = price
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        self.moves += 1
+        if self.moves < self.period:
+            self.avg_gain += gain
+            self.avg_loss += loss
+            return np.nan
+        if self.moves == self.period:
+            self.avg_gain = (self.avg_gain + gain) / self.period
+            self.avg_loss = (self.avg_loss + loss) / self.period
+        else:
+            alpha = 1.0 / self.period
+            self.avg_gain = (1 - alpha) * self.avg_gain + alpha * gain
+            self.avg_loss = (1 - alpha) * self.avg_loss + alpha * loss
+        return float(_rsi_value(self.avg_gain, self.avg_loss))
+
+
+class MACD(StreamingIndicator):
+    outputs = 3
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.spans = (fast, slow, signal)
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def seed(self, prices):
+        fast, slow, _ = self.spans
+        self.fast.seed(prices)
+        self.slow.seed(prices)
+        self.signal.seed(ema(prices, fast) - ema(prices, slow))
+
+    def update(self, price):
+        line = self.fast.update(price) - self.slow.update(price)
+        signal_line = self.signal.update(line)
+        return line, signal_line, line - signal_line
+
+
+# Overlay name -> (batch function, streaming factory, output names).
+# Multi-output indicators produce one series per output name.
+INDICATORS = {
+    'SMA 20': (lambda p: sma(p, 20), lambda: SMA(20), ['SMA 20']),
+    'SMA 50': (lambda p: sma(p, 50), lambda: SMA(50), ['SMA 50']),
+    'EMA 20': (lambda p: ema(p, 20), lambda: EMA(20), ['EMA 20']),
+    'Bollinger Bands': (bollinger_bands, BollingerBands, ['BB Middle', 'BB Upper', 'BB Lower']),
+    'Volatility 20': (rolling_volatility, RollingVolatility, ['Volatility 20']),
+    'RSI 14': (rsi, RSI, ['RSI 14']),
+    'MACD': (macd, MACD, ['MACD', 'MACD Signal', 'MACD Histogram']),
+}
+
+# Outputs drawn on the price axis; everything else goes on a secondary axis
+PRICE_SCALE = {'SMA 20', 'SMA 50', 'EMA 20', 'BB Middle', 'BB Upper', 'BB Lower'}
+
+
+def _as_outputs(names, values):
+    if len(names) == 1:
+        return {names[0]: values}
+    return dict(zip(names, values))
+
+
+class IndicatorPipeline:
+    """A set of indicators computed together over one price series.
+
+    batch() computes everything from scratch with the vectorized functions
+    and resets the streaming state to the end of the series; append() then
+    advances only the new bars in O(1) per bar per indicator.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.streams = {}
+        self.length = 0
+
+    def batch(self, prices):
+        prices = np.asarray(prices, dtype='float64')
+        outputs = {}
+        for name in self.names:
+            batch_fn, factory, output_names = INDICATORS[name]
+            outputs.update(_as_outputs(output_names, batch_fn(prices)))
+            # Load the streaming state so later appends continue seamlessly
+            stream = factory()
+            stream.seed(prices)
+            self.streams[name] = stream
+        self.length = len(prices)
+        return outputs
+
+    def append(self, prices):
+        outputs = {}
+        for name in self.names:
+            output_names = INDICATORS[name][2]
+            outputs.update(_as_outputs(output_names, self.streams[name].extend(prices)))
+        self.length += len(prices)
+        return outputs
@@ -0,0 +1,245 @@
+# intraday.py
+# Minute-level bars kept as compact typed records instead of DataFrames:
+# int64 epoch seconds, float32 prices and int64 volume, 32 bytes a bar. Each
+# ticker and interval is stored as one memory-mapped .npy per month, so a
+# year of 1-minute regular-session bars is about 3 MB on disk and only the
+# requested range is ever copied into memory.
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from telemetry import payload_size, span
+
+BAR_DTYPE = np.dtype([('time', '<i8'), ('open', '<f4'), ('high', '<f4'), ('low', '<f4'),
+                      ('close', '<f4'), ('volume', '<i8')])
+
+# Native intervals, in seconds; coarser resolutions are resampled from these
+INTERVALS = {'1m': 60, '5m': 300}
+
+# Longest range yfinance serves per intraday request
+MAX_REQUEST_DAYS = {'1m': 7, '5m': 59}
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'intraday')
+
+
+def to_epoch(value):
+    # Dates, datetimes, strings and timestamps to UTC epoch seconds; naive values are UTC
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize('UTC')
+    return int(stamp.timestamp())
+
+
+def has_session(start, end, tz='America/New_York'):
+    # Whether [start, end) overlaps a weekday regular session (09:30-16:00
+    # exchange time); outside one an empty fetch is expected, not a failure
+    if end <= start:
+        return False
+    first = pd.Timestamp(start, unit='s', tz='UTC').tz_convert(tz).normalize().tz_localize(None)
+    last = pd.Timestamp(end, unit='s', tz='UTC').tz_convert(tz).normalize().tz_localize(None)
+    days = pd.bdate_range(first, last)
+    opens = (days + pd.Timedelta(hours=9, minutes=30)).tz_localize(tz).asi8 // 10 ** 9
+    closes = (days + pd.Timedelta(hours=16)).tz_localize(tz).asi8 // 10 ** 9
+    return bool(np.any((opens < end) & (closes > start)))
+
+
+def bars_from_frame(df):
+    """Records out of a yfinance-style OHLCV frame on a DatetimeIndex."""
+    if df is None or df.empty:
+        return np.empty(0, dtype=BAR_DTYPE)
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is None:
+        index = index.tz_localize('UTC')
+    bars = np.empty(len(df), dtype=BAR_DTYPE)
+    bars['time'] = index.asi8 // 10 ** 9
+    for field in ('open', 'high', 'low', 'close'):
+        bars[field] = df[field.capitalize()].to_numpy(dtype='float64')
+    bars['volume'] = np.nan_to_num(df['Volume'].to_numpy(dtype='float64'))
+    bars = bars[~np.isnan(bars['close'])]
+    return bars[np.argsort(bars['time'], kind='stable')]
+
+
+def resample(bars, seconds):
+    """Aggregate sorted bars into `seconds`-wide buckets aligned to the epoch."""
+    if not len(bars):
+        return bars
+    bucket = bars['time'] // seconds * seconds
+    starts = np.flatnonzero(np.concatenate([[True], bucket[1:] != bucket[:-1]]))
+    ends = np.append(starts[1:], len(bars)) - 1
+    out = np.empty(len(starts), dtype=BAR_DTYPE)
+    out['time'] = bucket[starts]
+    out['open'] = bars['open'][starts]
+    out['close'] = bars['close'][ends]
+    out['high'] = np.maximum.reduceat(bars['high'], starts)
+    out['low'] = np.minimum.reduceat(bars['low'], starts)
+    out['volume'] = np.add.reduceat(bars['volume'], starts)
+    return out
+
+
+def to_frame(bars, tz='America/New_York'):
+    # For plotting: a small frame indexed by exchange-local time
+    index = pd.to_datetime(bars['time'], unit='s', utc=True).tz_convert(tz).rename('Date')
+    return pd.DataFrame({field.capitalize(): bars[field] for field in BAR_DTYPE.names[1:]}, index=index)
+
+
+class IntradayFetcher:
+    """Source of intraday bars for a single ticker; `end` is exclusive, both in epoch seconds."""
+
+    def fetch(self, ticker, start, end, interval):
+        raise NotImplementedError
+
+
+class YFinanceIntradayFetcher(IntradayFetcher):
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+
+    def fetch(self, ticker, start, end, interval):
+        import yfinance as yf
+        chunks = []
+        step = MAX_REQUEST_DAYS[interval] * 86400
+        # yfinance caps the span of one intraday request
+        for chunk_start in range(start, end, step):
+            with span('yfinance_download', interval=interval) as s:
+                df = yf.download(ticker, start=datetime.datetime.fromtimestamp(chunk_start, datetime.timezone.utc),
+                                 end=datetime.datetime.fromtimestamp(min(chunk_start + step, end), datetime.timezone.utc),
+                                 interval=interval, progress=False, timeout=self.timeout)
+                s.size = payload_size(df)
+            chunks.append(bars_from_frame(df))
+        bars = np.concatenate(chunks) if chunks else np.empty(0, dtype=BAR_DTYPE)
+        return bars[(bars['time'] >= start) & (bars['time'] < end)]
+
+
+class IntradayStore:
+    """On-disk intraday bars per ticker, interval and month, topped up on demand.
+
+    Like PriceCache, a meta.json records the covered [start, end) range so
+    only missing stretches are fetched. Bars that may still be forming (the
+    current interval) are never marked as covered.
+    """
+
+    def __init__(self, fetcher=None, cache_dir=DEFAULT_CACHE_DIR, clock=time.time):
+        self.fetcher = fetcher or YFinanceIntradayFetcher()
+        self.cache_dir = cache_dir
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def _lock_for(self, key):
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _folder(self, ticker, interval):
+        return os.path.join(self.cache_dir, ticker.upper(), interval)
+
+    def coverage(self, ticker, interval):
+        meta_path = os.path.join(self._folder(ticker, interval), 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return meta['start'], meta['end']
+
+    @staticmethod
+    def _months(start, end):
+        # 'YYYY-MM' of every month touching [start, end)
+        if end <= start:
+            return []
+        first = pd.Timestamp(start, unit='s').to_period('M')
+        last = pd.Timestamp(end - 1, unit='s').to_period('M')
+        return [str(p) for p in pd.period_range(first, last, freq='M')]
+
+    def _read(self, ticker, interval, start, end):
+        # Slice every month through its memory map, then copy the slices once
+        # into a single output array
+        folder = self._folder(ticker, interval)
+        slices = []
+        for month in self._months(start, end):
+            path = os.path.join(folder, f'{month}.npy')
+            if os.path.exists(path):
+                stored = np.load(path, mmap_mode='r')
+                lo, hi = np.searchsorted(stored['time'], [start, end])
+                slices.append(stored[lo:hi])
+        out = np.empty(sum(len(part) for part in slices), dtype=BAR_DTYPE)
+        offset = 0
+        for part in slices:
+            out[offset:offset + len(part)] = part
+            offset += len(part)
+        return out
+
+    def _write(self, ticker, interval, bars):
+        folder = self._folder(ticker, interval)
+        os.makedirs(folder, exist_ok=True)
+        months = pd.to_datetime(bars['time'], unit='s').strftime('%Y-%m').to_numpy()
+        for month in np.unique(months):
+            path = os.path.join(folder, f'{month}.npy')
+            new = bars[months == month]
+            if os.path.exists(path):
+                # Fresh bars first, so they win over stored ones with the same time
+                merged = np.concatenate([new, np.load(path)])
+                new = merged[np.unique(merged['time'], return_index=True)[1]]
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, new)
+            os.replace(path + '.tmp', path)
+
+    def _save_coverage(self, ticker, interval, start, end):
+        folder = self._folder(ticker, interval)
+        os.makedirs(folder, exist_ok=True)
+        meta_path = os.path.join(folder, 'meta.json')
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump({'start': int(start), 'end': int(end)}, f)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    def get(self, ticker, start, end, interval='1m'):
+        """Bars for [start, end) as a BAR_DTYPE record array, sorted by time."""
+        ticker = ticker.upper()
+        start, end = to_epoch(start), to_epoch(end)
+        seconds = INTERVALS[interval]
+        with self._lock_for((ticker, interval)):
+            covered = self.coverage(ticker, interval)
+            if covered is None:
+                missing = [(start, end)] if start < end else []
+            else:
+                missing = []
+                if start < covered[0]:
+                    missing.append((start, covered[0]))
+                if end > covered[1]:
+                    missing.append((covered[1], end))
+            if missing:
+                self.misses += 1
+                new_start, new_end = covered if covered else (None, None)
+                for gap_start, gap_end in missing:
+                    bars = self.fetcher.fetch(ticker, gap_start, gap_end, interval)
+                    if len(bars):
+                        self._write(ticker, interval, bars)
+                    elif has_session(gap_start, gap_end):
+                        # A failed or throttled download comes back empty too, so
+                        # leave the gap missing and fetch it again next time
+                        logger.warning(f"No {interval} bars for {ticker} in [{gap_start}, {gap_end}); "
+                                       f"leaving the range uncovered")
+                        continue
+                    new_start = gap_start if new_start is None else min(new_start, gap_start)
+                    new_end = gap_end if new_end is None else max(new_end, gap_end)
+                if new_start is not None:
+                    # The interval in progress is still forming, so it stays uncovered
+                    forming = int(self.clock()) // seconds * seconds
+                    self._save_coverage(ticker, interval, new_start, max(min(new_end, forming), new_start))
+            else:
+                self.hits += 1
+            return self._read(ticker, interval, start, end)
@@ -0,0 +1,166 @@
+# live_feed.py
+# Live quotes without reruns or re-downloads. One background producer per
+# process polls a quote feed for the watched tickers and appends to a
+# fixed-size ring buffer per ticker; every chart subscribed to a ticker keeps
+# the sequence number it last drew and copies only the points appended since.
+import collections
+import threading
+import time
+
+import numpy as np
+
+# Columns of a ring buffer row: quote time and when the producer stored it,
+# both epoch seconds, so subscribers can measure update latency
+FIELDS = ('time', 'price', 'received')
+
+
+class RingBuffer:
+    """Fixed-capacity float64 rows, one producer and any number of readers.
+
+    Rows are numbered from 0 as they are appended. since(seq) returns the
+    sequence number to ask from next time and a copy of the rows appended
+    after `seq`; a reader more than `capacity` rows behind gets the newest
+    `capacity` rows.
+    """
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.count = 0
+        self._rows = np.full((capacity, len(FIELDS)), np.nan)
+        self._lock = threading.Lock()
+
+    def append(self, row):
+        with self._lock:
+            self._rows[self.count % self.capacity] = row
+            self.count += 1
+
+    def since(self, seq):
+        with self._lock:
+            count = self.count
+            first = max(seq, count - self.capacity, 0)
+            # Fancy indexing copies, so the rows stay valid after the lock is released
+            return count, self._rows[np.arange(first, count) % self.capacity]
+
+    def last(self, n):
+        return self.since(self.count - n)[1]
+
+
+class QuoteFeed:
+    """Source of latest quotes: poll(tickers) -> [(ticker, epoch seconds, price), ...]."""
+
+    def poll(self, tickers):
+        raise NotImplementedError
+
+
+class SimulatedQuoteFeed(QuoteFeed):
+    """Local random-walk quotes, one per ticker per poll, for demos and benchmarks.
+
+    start_prices can be filled in before a ticker's first poll, e.g. with its
+    last daily close; other tickers start at 100.
+    """
+
+    def __init__(self, volatility=0.0005, seed=None):
+        self.volatility = volatility
+        self.start_prices = {}
+        self._prices = {}
+        self._rng = np.random.default_rng(seed)
+
+    def poll(self, tickers):
+        now = time.time()
+        moves = np.exp(self._rng.normal(0.0, self.volatility, len(tickers)))
+        quotes = []
+        for ticker, move in zip(tickers, moves):
+            price = self._prices.get(ticker, self.start_prices.get(ticker, 100.0)) * move
+            self._prices[ticker] = price
+            quotes.append((ticker, now, price))
+        return quotes
+
+
+class YFinanceQuoteFeed(QuoteFeed):
+    def __init__(self):
+        # Failed lookups per ticker; one bad symbol must not starve the others
+        self.errors = collections.Counter()
+
+    def poll(self, tickers):
+        import yfinance as yf
+        quotes = []
+        for ticker in tickers:
+            try:
+                price = yf.Ticker(ticker).fast_info['last_price']
+            except Exception:
+                self.errors[ticker] += 1
+                continue
+            if price is not None and np.isfinite(price):
+                quotes.append((ticker, time.time(), float(price)))
+        return quotes
+
+
+class LiveStream:
+    """Background producer filling one RingBuffer per watched ticker.
+
+    The thread starts on the first watch() and polls every `interval`
+    seconds. Tickers nobody has asked for in `idle_after` seconds are no
+    longer polled, though their buffers are kept for a later subscriber.
+    """
+
+    def __init__(self, feed=None, interval=1.0, capacity=10000, idle_after=300, clock=time.time):
+        self.feed = feed or SimulatedQuoteFeed()
+        self.interval = interval
+        self.capacity = capacity
+        self.idle_after = idle_after
+        self.clock = clock
+        self.polls = 0
+        self.errors = 0
+        self.last_poll_ms = None
+        self._buffers = {}
+        self._watched = {}  # ticker -> when it was last asked for
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def stats(self):
+        return {'polls': self.polls, 'errors': self.errors, 'last_poll_ms': self.last_poll_ms,
+                'watched': len(self._watched)}
+
+    def watch(self, tickers):
+        now = self.clock()
+        with self._lock:
+            for ticker in tickers:
+                self._watched[ticker] = now
+                if ticker not in self._buffers:
+                    self._buffers[ticker] = RingBuffer(self.capacity)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='live-stream', daemon=True)
+                self._thread.start()
+
+    def buffer(self, ticker):
+        with self._lock:
+            return self._buffers[ticker]
+
+    def stop(self):
+        self._stop.set()
+
+    def poll_once(self):
+        now = self.clock()
+        with self._lock:
+            for ticker in [t for t, seen in self._watched.items() if now - seen > self.idle_after]:
+                del self._watched[ticker]
+            tickers = list(self._watched)
+        if not tickers:
+            return
+        t0 = time.perf_counter()
+        try:
+            quotes = self.feed.poll(tickers)
+        except Exception:
+            self.errors += 1
+            return
+        for ticker, quote_time, price in quotes:
+            self._buffers[ticker].append((quote_time, price, self.clock()))
+        self.polls += 1
+        self.last_poll_ms = (time.perf_counter() - t0) * 1000
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            self.poll_once()
+            self._stop.wait(max(0.0, self.interval - (time.perf_counter() - started)))
@@ -0,0 +1,173 @@
+# metrics.py
+# Risk/return metrics for many tickers at once. Every function takes a 2-D
+# NumPy array shaped (dates, tickers); missing bars are NaN and are skipped
+# per ticker, so the aligned frames from price_cache.load_many can be passed
+# straight in via prices['Adj Close'].to_numpy().
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+def as_matrix(prices):
+    # Accept a single series as a one-column matrix
+    prices = np.asarray(prices, dtype='float64')
+    return prices.reshape(-1, 1) if prices.ndim == 1 else prices
+
+
+def simple_returns(prices):
+    prices = as_matrix(prices)
+    return prices[1:] / prices[:-1] - 1
+
+
+def log_returns(prices):
+    prices = as_matrix(prices)
+    return np.diff(np.log(prices), axis=0)
+
+
+def _moments(returns):
+    # Count, mean and population variance per ticker, skipping NaN, from a
+    # single zero-filled copy of the returns
+    valid = ~np.isnan(returns)
+    if valid.all():
+        filled, count = returns, np.full(returns.shape[1], returns.shape[0])
+    else:
+        filled, count = np.where(valid, returns, 0.0), valid.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = filled.sum(axis=0) / count
+        var = np.einsum('ij,ij->j', filled, filled) / count - mean * mean
+    return valid, filled, count, mean, np.maximum(var, 0.0)
+
+
+def annualized_return(returns, periods=TRADING_DAYS):
+    return _moments(returns)[3] * periods
+
+
+def annualized_volatility(returns, periods=TRADING_DAYS):
+    # Population standard deviation, as the app has always reported it
+    return np.sqrt(_moments(returns)[4] * periods)
+
+
+def _downside_deviation(filled, count, periods):
+    downside = np.minimum(filled, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.sqrt(np.einsum('ij,ij->j', downside, downside) / count * periods)
+
+
+def sharpe_ratio(returns, risk_free=0.0, periods=TRADING_DAYS):
+    _, _, _, mean, var = _moments(returns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (mean * periods - risk_free) / np.sqrt(var * periods)
+
+
+def sortino_ratio(returns, risk_free=0.0, periods=TRADING_DAYS):
+    _, filled, count, mean, _ = _moments(returns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (mean * periods - risk_free) / _downside_deviation(filled, count, periods)
+
+
+def max_drawdown(prices):
+    # Largest peak-to-trough fall, as a negative fraction. Walking the rows
+    # with in-place ufuncs keeps only one row of state per ticker and is
+    # several times faster than np.fmax.accumulate down axis 0.
+    prices = as_matrix(prices)
+    peak = prices[0].copy()
+    worst = np.zeros(prices.shape[1])
+    ratio = np.empty(prices.shape[1])
+    with np.errstate(invalid='ignore'):
+        for row in prices:
+            np.fmax(peak, row, out=peak)
+            np.divide(row, peak, out=ratio)
+            np.fmin(worst, ratio - 1, out=worst)
+    return worst
+
+
+def _beta(valid, filled, market):
+    # Matrix-vector products over the days where both the ticker and the
+    # market have a return
+    market_valid = ~np.isnan(market)
+    m = np.where(market_valid, market, 0.0)
+    if market_valid.all() and valid.all():
+        # No gaps anywhere: every ticker shares the market's days
+        count = float(len(m))
+        r_sum = filled.sum(axis=0)
+        m_sum, m2_sum = m.sum(), m @ m
+    else:
+        valid_f = valid.astype('float64')
+        count = valid_f.T @ market_valid.astype('float64')
+        r_sum = market_valid.astype('float64') @ filled
+        m_sum, m2_sum = valid_f.T @ m, valid_f.T @ (m * m)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_mean = r_sum / count
+        m_mean = m_sum / count
+        cov = (filled.T @ m) / count - r_mean * m_mean
+        var = m2_sum / count - m_mean * m_mean
+        return cov / var
+
+
+def beta(returns, market_returns):
+    # Covariance with the market over the variance of the market
+    returns = as_matrix(returns)
+    valid, filled, _, _, _ = _moments(returns)
+    return _beta(valid, filled, np.asarray(market_returns, dtype='float64').ravel())
+
+
+def _correlation(valid, filled, mean):
+    # Pearson correlation of every pair over the days both tickers have a
+    # return. Centering on each ticker's own mean first doesn't change the
+    # result but keeps the sums small, so the products can run in float32.
+    centered = np.where(valid, filled - mean, 0.0).astype('float32')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if valid.all():
+            # Every pair shares every day: one product
+            gram = (centered.T @ centered).astype('float64')
+            std = np.sqrt(np.diag(gram))
+            corr = gram / np.outer(std, std)
+        else:
+            # Sums restricted to each pair's common days: sums[i, j] adds
+            # ticker i over the days ticker j also has, likewise for squares
+            weights = valid.astype('float32')
+            counts = (weights.T @ weights).astype('float64')
+            sums = (centered.T @ weights).astype('float64')
+            squares = ((centered * centered).T @ weights).astype('float64')
+            cov = (centered.T @ centered).astype('float64') - sums * sums.T / counts
+            var = squares - sums * sums / counts
+            corr = cov / np.sqrt(var * var.T)
+    np.fill_diagonal(corr, np.where(np.isnan(np.diag(corr)), np.nan, 1.0))
+    return corr
+
+
+def correlation_matrix(returns):
+    # Pairwise correlation of daily returns, from one matrix product
+    returns = as_matrix(returns)
+    valid, filled, _, mean, _ = _moments(returns)
+    return _correlation(valid, filled, mean)
+
+
+def compute_metrics(prices, market_index=None, risk_free=0.0, periods=TRADING_DAYS, correlation=True):
+    """Compute every metric for a (dates, tickers) price matrix in one pass.
+
+    market_index picks the column used as the market for beta. Returns a dict
+    of per-ticker 1-D arrays plus the 'correlation' matrix when requested.
+    """
+    prices = as_matrix(prices)
+    returns = simple_returns(prices)
+    valid, filled, count, mean, var = _moments(returns)
+    annual_return = mean * periods
+    volatility = np.sqrt(var * periods)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        risk_adjusted = annual_return / volatility
+        sharpe = (annual_return - risk_free) / volatility
+        sortino = (annual_return - risk_free) / _downside_deviation(filled, count, periods)
+    result = {
+        'Annual Return': annual_return,
+        'Standard Deviation': volatility,
+        'Risk Adj. Return': risk_adjusted,
+        'Sharpe Ratio': sharpe,
+        'Sortino Ratio': sortino,
+        'Max Drawdown': max_drawdown(prices),
+    }
+    if market_index is not None:
+        result['Beta'] = _beta(valid, filled, returns[:, market_index])
+    if correlation:
+        result['correlation'] = _correlation(valid, filled, mean)
+    return result
@@ -0,0 +1,97 @@
+# news_cache.py
+import numpy as np
+import pandas as pd
+import requests
+
+from telemetry import payload_size, span
+from ttl_cache import TTLCache
+
+POLYGON_NEWS_URL = "https://api.polygon.io/v2/reference/news"
+
+# News days are taken in the exchange's time zone; articles published after
+# the close count toward the next day
+MARKET_TZ = 'America/New_York'
+MARKET_CLOSE_HOUR = 16
+
+# Fields kept for every article, whichever source it came from
+ARTICLE_FIELDS = ['published', 'title', 'summary', 'url', 'image_url',
+                  'sentiment_title', 'sentiment_summary']
+
+
+def news_days(published):
+    """First market day an article can move: its New York date, or the next
+    day when it was published after the close. Unparseable times are NaT."""
+    stamps = pd.DatetimeIndex(pd.to_datetime(published, utc=True, errors='coerce', format='mixed')).tz_convert(MARKET_TZ)
+    days = stamps.tz_localize(None).normalize().values.astype('datetime64[D]')
+    return days + (stamps.hour >= MARKET_CLOSE_HOUR).astype('int64')
+
+
+def normalize_rss(df_news, limit=10):
+    # Rows from StockNews.read_rss() -> article dicts
+    articles = []
+    for row in df_news.head(limit).to_dict('records'):
+        articles.append({
+            'published': str(row.get('published', '')),
+            'title': row.get('title', ''),
+            'summary': row.get('summary', ''),
+            'url': row.get('link'),
+            'image_url': None,
+            'sentiment_title': float(row.get('sentiment_title', 0.0)),
+            'sentiment_summary': float(row.get('sentiment_summary', 0.0)),
+        })
+    return articles
+
+
+def normalize_polygon(results, limit=20):
+    # Items from the Polygon news endpoint -> article dicts (no sentiment scores)
+    return [{
+        'published': item.get('published_utc', ''),
+        'title': item.get('title', ''),
+        'summary': item.get('description', ''),
+        'url': item.get('article_url'),
+        'image_url': item.get('image_url'),
+        'sentiment_title': None,
+        'sentiment_summary': None,
+    } for item in results[:limit]]
+
+
+def sentiment_aggregates(articles):
+    # Same aggregates data/data.csv declares, over the articles that have scores
+    aggregates = {}
+    for field in ('sentiment_summary', 'sentiment_title'):
+        scores = np.array([a[field] for a in articles if a[field] is not None], dtype='float64')
+        aggregates[f'{field}_avg'] = float(scores.mean()) if len(scores) else None
+        aggregates[f'{field}_med'] = float(np.median(scores)) if len(scores) else None
+    return aggregates
+
+
+def news_entry(ticker, articles):
+    return {'ticker': ticker, 'articles': articles, **sentiment_aggregates(articles)}
+
+
+def read_rss(ticker):
+    from stocknews import StockNews
+    return StockNews(ticker, save_news=False).read_rss()
+
+
+def fetch_rss_news(ticker, limit=10, reader=read_rss):
+    # reader(ticker) -> the frame StockNews.read_rss() returns; benchmarks replay recorded ones
+    with span('stocknews_read_rss') as s:
+        df_news = reader(ticker)
+        s.size = payload_size(df_news)
+    return news_entry(ticker, normalize_rss(df_news, limit))
+
+
+def fetch_polygon_news(ticker, api_key, limit=20, base_url=POLYGON_NEWS_URL, session=requests):
+    params = {
+        "ticker": ticker,
+        "limit": limit,
+        "apiKey": api_key
+    }
+    response = session.get(base_url, params=params, timeout=10)
+    response.raise_for_status()
+    return news_entry(ticker, normalize_polygon(response.json().get("results", []), limit))
+
+
+# News entries per (source, ticker) live in the general TTL cache
+NewsCache = TTLCache
@@ -0,0 +1,129 @@
+# portfolio.py
+# Mean-variance portfolios over the comparison tickers. A PortfolioModel
+# estimates annualized mean returns and the covariance matrix once; every
+# later question (frontier, optimal weights, random portfolios, user weights)
+# is answered from those in batched NumPy, many portfolios per call.
+import numpy as np
+
+from metrics import TRADING_DAYS, as_matrix, simple_returns
+
+
+def project_to_simplex(weights):
+    """Euclidean projection of every row onto {w >= 0, sum(w) = 1}."""
+    weights = np.atleast_2d(weights)
+    ordered = -np.sort(-weights, axis=1)
+    cumulative = np.cumsum(ordered, axis=1) - 1
+    ranks = np.arange(1, weights.shape[1] + 1)
+    last = (ordered - cumulative / ranks > 0).sum(axis=1) - 1
+    theta = cumulative[np.arange(len(weights)), last] / (last + 1)
+    return np.maximum(weights - theta[:, None], 0.0)
+
+
+def _gradient_step(cov):
+    # Step size for projected gradient: 1 / Lipschitz constant of the
+    # variance gradient, 2 * the largest eigenvalue of the covariance
+    if not np.isfinite(cov).all():
+        raise ValueError("Covariance matrix has missing or infinite entries")
+    largest = np.linalg.eigvalsh(cov)[-1] if cov.size else 0.0
+    if largest <= 1e-12:
+        raise ValueError("Prices don't move over this window, so there is no risk to optimize")
+    return 1 / (2 * largest)
+
+
+class PortfolioModel:
+    """Annualized expected returns and covariance of a set of tickers.
+
+    Returns are taken over the days where every ticker traded, with the same
+    population moments metrics.py reports. Weights are arrays shaped
+    (portfolios, tickers) or a single (tickers,) vector.
+    """
+
+    def __init__(self, prices, tickers=None, risk_free=0.0, periods=TRADING_DAYS):
+        returns = simple_returns(prices)
+        returns = returns[~np.isnan(returns).any(axis=1)]
+        if len(returns) < 2:
+            raise ValueError("Not enough overlapping prices to estimate a covariance matrix")
+        self.tickers = list(tickers) if tickers is not None else list(range(returns.shape[1]))
+        self.risk_free = risk_free
+        self.mean = returns.mean(axis=0) * periods
+        self.cov = np.cov(returns, rowvar=False, bias=True).reshape(returns.shape[1], -1) * periods
+        self.observations = len(returns)
+        self._step = _gradient_step(self.cov)
+
+    @classmethod
+    def from_moments(cls, mean, cov, tickers=None, risk_free=0.0):
+        model = cls.__new__(cls)
+        model.tickers = list(tickers) if tickers is not None else list(range(len(mean)))
+        model.risk_free = risk_free
+        model.mean = np.asarray(mean, dtype='float64')
+        model.cov = np.asarray(cov, dtype='float64')
+        model.observations = None
+        model._step = _gradient_step(model.cov)
+        return model
+
+    def performance(self, weights):
+        """(returns, volatilities, sharpe ratios) of a batch of portfolios."""
+        weights = as_matrix(weights).T if np.ndim(weights) == 1 else np.asarray(weights, dtype='float64')
+        returns = weights @ self.mean
+        volatility = np.sqrt(np.maximum(np.einsum('ij,ij->i', weights @ self.cov, weights), 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return returns, volatility, (returns - self.risk_free) / volatility
+
+    def random_portfolios(self, count, seed=None):
+        """Long-only weights drawn uniformly from the simplex, with their performance."""
+        weights = np.random.default_rng(seed).dirichlet(np.ones(len(self.mean)), size=count)
+        return (weights,) + self.performance(weights)
+
+    def _solve(self, aversion, iterations=5000, tol=1e-10):
+        # Long-only weights minimizing w'Cw - a * w'mu for every risk tolerance a
+        # at once: accelerated projected gradient over a (len(a), tickers) batch
+        aversion = np.asarray(aversion, dtype='float64')[:, None]
+        weights = np.full((len(aversion), len(self.mean)), 1 / len(self.mean))
+        momentum, t = weights, 1.0
+        for _ in range(iterations):
+            gradient = 2 * momentum @ self.cov - aversion * self.mean
+            updated = project_to_simplex(momentum - self._step * gradient)
+            t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+            momentum = updated + (t - 1) / t_next * (updated - weights)
+            done = np.abs(updated - weights).max() < tol
+            weights, t = updated, t_next
+            if done:
+                break
+        return weights
+
+    def min_variance(self, long_only=True):
+        if long_only:
+            return self._solve([0.0])[0]
+        inverse_ones = np.linalg.solve(self.cov, np.ones(len(self.mean)))
+        return inverse_ones / inverse_ones.sum()
+
+    def max_sharpe(self, long_only=True, points=200):
+        if long_only:
+            # Best point of a dense long-only frontier
+            weights = self.frontier(points)[0]
+            return weights[np.nanargmax(self.performance(weights)[2])]
+        excess = np.linalg.solve(self.cov, self.mean - self.risk_free)
+        return excess / excess.sum()
+
+    def frontier(self, points=50, long_only=True):
+        """Efficient portfolios from min-variance upwards, as (weights, returns, volatilities)."""
+        if long_only:
+            # Risk tolerances spanning min-variance to the best single asset
+            spread = max(np.ptp(self.mean), 1e-12)
+            scale = 1 / (self._step * spread)
+            weights = self._solve(np.concatenate([[0.0], scale * np.geomspace(1e-4, 1e2, points - 1)]))
+        else:
+            # Two-fund theorem: every efficient portfolio mixes these two
+            low, high = self.min_variance(False), self.max_sharpe(False)
+            low_return, high_return = low @ self.mean, high @ self.mean
+            targets = np.linspace(low_return, max(high_return, self.mean.max()), points)
+            mix = (targets - low_return) / (high_return - low_return) if high_return != low_return else np.zeros(points)
+            weights = low + mix[:, None] * (high - low)
+        returns, volatility, _ = self.performance(weights)
+        order = np.argsort(volatility)
+        # Keep the upper branch only: each point must beat the return of every
+        # less risky one. Points that collapsed onto the same portfolio go too.
+        efficient = returns[order] >= np.maximum.accumulate(returns[order]) - 1e-12
+        efficient[1:] &= np.abs(np.diff(volatility[order])) + np.abs(np.diff(returns[order])) > 1e-9
+        keep = order[efficient]
+        return weights[keep], returns[keep], volatility[keep]
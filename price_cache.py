@@ -0,0 +1,237 @@
+# price_cache.py
+import concurrent.futures
+import datetime
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from telemetry import payload_size, span
+
+# Columns stored for every ticker, in the order yf.download returns them
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'price_cache')
+
+
+def to_day(value):
+    # Normalize dates, datetimes, strings and timestamps to numpy day precision
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+def normalize_frame(df):
+    # Flatten the (field, ticker) columns newer yfinance versions return and
+    # make sure every OHLCV column exists, indexed by a tz-naive 'Date'
+    if df is None or df.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name='Date'), dtype='float64')
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df = df.reindex(columns=OHLCV_COLUMNS)
+    df.index = index.normalize().rename('Date')
+    return df
+
+
+class PriceFetcher:
+    """Source of daily OHLCV bars for a single ticker; `end` is exclusive."""
+
+    def fetch(self, ticker, start, end):
+        raise NotImplementedError
+
+
+class YFinanceFetcher(PriceFetcher):
+    def __init__(self, timeout=10):
+        # Per-request network timeout in seconds, passed through to yfinance
+        self.timeout = timeout
+
+    def fetch(self, ticker, start, end):
+        import yfinance as yf
+        with span('yfinance_download', interval='1d') as s:
+            df = yf.download(ticker, start=start, end=end, progress=False, timeout=self.timeout)
+            s.size = payload_size(df)
+        return df
+
+
+class PriceCache:
+    """On-disk OHLCV store that only downloads the days it doesn't have yet.
+
+    Each ticker is kept as two .npy files (day numbers and a float64 value
+    matrix) plus a meta.json with the covered [start, end) range. Reads are
+    memory-mapped and sliced with searchsorted, so range queries inside the
+    covered window never touch the network.
+    """
+
+    def __init__(self, fetcher=None, cache_dir=DEFAULT_CACHE_DIR):
+        self.fetcher = fetcher or YFinanceFetcher()
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.bytes_fetched = 0
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._stats_lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'bytes_fetched': self.bytes_fetched}
+
+    def _count(self, hits=0, misses=0, bytes_fetched=0):
+        # Counters are shared by the loader threads
+        with self._stats_lock:
+            self.hits += hits
+            self.misses += misses
+            self.bytes_fetched += bytes_fetched
+
+    def _lock_for(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _paths(self, ticker):
+        folder = os.path.join(self.cache_dir, ticker.upper())
+        return (folder,
+                os.path.join(folder, 'dates.npy'),
+                os.path.join(folder, 'values.npy'),
+                os.path.join(folder, 'meta.json'))
+
+    def coverage(self, ticker):
+        # Covered [start, end) range for a ticker, or None if nothing is stored
+        meta_path = self._paths(ticker)[3]
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return np.datetime64(meta['start'], 'D'), np.datetime64(meta['end'], 'D')
+
+    def _load(self, ticker):
+        _, dates_path, values_path, _ = self._paths(ticker)
+        if not os.path.exists(dates_path):
+            return np.empty(0, dtype='datetime64[D]'), np.empty((0, len(OHLCV_COLUMNS)))
+        return np.load(dates_path, mmap_mode='r'), np.load(values_path, mmap_mode='r')
+
+    def _save(self, ticker, dates, values, start, end):
+        folder, dates_path, values_path, meta_path = self._paths(ticker)
+        os.makedirs(folder, exist_ok=True)
+        # Write to temporary files first so a reader never sees a half-written store
+        for path, array in ((dates_path, dates), (values_path, values)):
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, array)
+            os.replace(path + '.tmp', path)
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump({'start': str(start), 'end': str(end)}, f)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    def _fetch(self, ticker, start, end):
+        df = normalize_frame(self.fetcher.fetch(ticker, start.item(), end.item()))
+        dates = df.index.values.astype('datetime64[D]')
+        values = df.to_numpy(dtype='float64')
+        self._count(bytes_fetched=dates.nbytes + values.nbytes)
+        return dates, values
+
+    def get(self, ticker, start, end):
+        """Return daily bars for [start, end) as a DataFrame like yf.download."""
+        ticker = ticker.upper()
+        start, end = to_day(start), to_day(end)
+        with self._lock_for(ticker):
+            covered = self.coverage(ticker)
+            if covered is None:
+                missing = [(start, end)] if start < end else []
+            else:
+                cov_start, cov_end = covered
+                missing = []
+                if start < cov_start:
+                    missing.append((start, cov_start))
+                if end > cov_end:
+                    missing.append((cov_end, end))
+
+            dates, values = self._load(ticker)
+            if missing:
+                self._count(misses=1)
+                chunks_dates, chunks_values = [], []
+                new_start, new_end = covered if covered else (None, None)
+                for gap_start, gap_end in missing:
+                    gap_dates, gap_values = self._fetch(ticker, gap_start, gap_end)
+                    chunks_dates.append(gap_dates)
+                    chunks_values.append(gap_values)
+                    # yf.download returns an empty frame when it fails or is
+                    # throttled, so an empty gap with trading days in it stays
+                    # missing and is fetched again next time
+                    if not len(gap_dates) and np.busday_count(gap_start, gap_end):
+                        logger.warning(f"No bars for {ticker} in [{gap_start}, {gap_end}); leaving the range uncovered")
+                        continue
+                    new_start = gap_start if new_start is None else min(new_start, gap_start)
+                    new_end = gap_end if new_end is None else max(new_end, gap_end)
+                # Fresh bars first, so they win over stored ones with the same date
+                # (a partial bar saved during the session is replaced by its close)
+                dates = np.concatenate(chunks_dates + [dates])
+                values = np.concatenate(chunks_values + [values])
+                dates, keep = np.unique(dates, return_index=True)
+                values = values[keep]
+                if new_start is not None:
+                    # Today's bar is still moving, so never mark it as covered
+                    today = np.datetime64(datetime.date.today(), 'D')
+                    self._save(ticker, dates, values, new_start, max(min(new_end, today), new_start))
+            else:
+                self._count(hits=1)
+
+            lo, hi = np.searchsorted(dates, [start, end])
+            return pd.DataFrame(
+                np.array(values[lo:hi]),
+                index=pd.DatetimeIndex(dates[lo:hi], name='Date'),
+                columns=OHLCV_COLUMNS,
+            )
+
+
+def unique_tickers(tickers):
+    # Upper-case, drop blanks and keep the first occurrence of every symbol
+    return list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+
+
+def load_many(cache, tickers, start, end, max_workers=8, timeout=30):
+    """Load several tickers on a bounded thread pool.
+
+    Returns (prices, errors): prices is one wide frame aligned on Date with
+    (field, ticker) columns like a multi-ticker yf.download, and errors maps
+    each ticker that failed or missed the deadline to its exception, so the
+    tickers that did load can still be rendered.
+    """
+    tickers = unique_tickers(tickers)
+    frames, errors = {}, {}
+    if tickers:
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(tickers)))
+        futures = {pool.submit(cache.get, t, start, end): t for t in tickers}
+        done, not_done = concurrent.futures.wait(futures, timeout=timeout)
+        for future in done:
+            t = futures[future]
+            try:
+                frames[t] = future.result()
+            except Exception as e:
+                errors[t] = e
+        for future in not_done:
+            future.cancel()
+            errors[futures[future]] = TimeoutError(f"Timed out after {timeout}s")
+        # Don't block the script run on stragglers; they finish in the background
+        pool.shutdown(wait=False)
+
+    if frames:
+        loaded = [t for t in tickers if t in frames]
+        prices = pd.concat({t: frames[t] for t in loaded}, axis=1).swaplevel(axis=1)
+        prices = prices.reindex(columns=pd.MultiIndex.from_product([OHLCV_COLUMNS, loaded]))
+    else:
+        prices = pd.DataFrame(index=pd.DatetimeIndex([], name='Date'),
+                              columns=pd.MultiIndex.from_arrays([[], []]))
+    prices.columns.names = ['Price', 'Ticker']
+    return prices, errors
+
+
+def ticker_frame(prices, ticker):
+    # Single-ticker OHLCV frame out of a load_many result, without the
+    # all-NaN rows that alignment added for other tickers' trading days
+    return prices.xs(ticker.upper(), axis=1, level='Ticker').dropna(how='all')
@@ -0,0 +1,218 @@
+# screener.py
+# Screen a large ticker universe on return, risk and indicator conditions
+# from the local price cache. The universe is split into chunks that worker
+# processes handle independently: each one reads its tickers' adjusted closes
+# from the memory-mapped cache, stacks them into one matrix and computes every
+# metric for the whole chunk in vectorized passes. Only one small row of
+# numbers per ticker travels back to the parent, which filters, sorts and
+# pages the table.
+import argparse
+import ast
+import concurrent.futures
+import datetime
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from metrics import TRADING_DAYS, compute_metrics
+from price_cache import DEFAULT_CACHE_DIR, PriceCache, to_day, unique_tickers
+
+# Every column a filter expression or the sort can refer to; returns and
+# drawdowns are fractions, so "annual_return > 0.1" means above 10%
+SCREEN_COLUMNS = ['close', 'total_return', 'return_1m', 'annual_return', 'volatility', 'sharpe', 'sortino',
+                  'max_drawdown', 'rsi', 'above_sma50', 'above_sma200', 'days']
+
+DEFAULT_SORT = 'sharpe'
+
+# Expression nodes a filter may use: column names, numbers, arithmetic,
+# comparisons and boolean logic; no calls, attributes or subscripts
+_FILTER_NODES = (ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+                 ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.BitAnd, ast.BitOr,
+                 ast.Compare, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq, ast.Name, ast.Load, ast.Constant)
+
+
+def cached_tickers(cache_dir=DEFAULT_CACHE_DIR):
+    # Every ticker with stored bars, for screening "everything we have"
+    if not os.path.isdir(cache_dir):
+        return []
+    return sorted(name for name in os.listdir(cache_dir) if os.path.exists(os.path.join(cache_dir, name, 'meta.json')))
+
+
+def stack_right(series):
+    """Right-align 1-D arrays of different lengths into a NaN-padded (rows, columns) matrix.
+
+    The per-ticker metrics never compare tickers day by day, so aligning on
+    position (latest bar last) is enough and avoids a join on dates.
+    """
+    out = np.full((max((len(s) for s in series), default=0), len(series)), np.nan)
+    for i, values in enumerate(series):
+        if len(values):
+            out[-len(values):, i] = values
+    return out
+
+
+def last_rsi(prices, period=14):
+    # Wilder's RSI at the last row of every column, matching indicators.rsi:
+    # a plain mean over the first `period` moves, then alpha = 1 / period.
+    # Walks the rows like metrics.max_drawdown, keeping one row of state.
+    prices = np.asarray(prices, dtype='float64')
+    avg_gain = np.zeros(prices.shape[1])
+    avg_loss = np.zeros(prices.shape[1])
+    seen = np.zeros(prices.shape[1])
+    with np.errstate(invalid='ignore'):
+        for previous, row in zip(prices[:-1], prices[1:]):
+            delta = row - previous
+            moved = ~np.isnan(delta)
+            seen += moved
+            divisor = np.minimum(np.maximum(seen, 1), period)
+            avg_gain += np.where(moved, (np.maximum(delta, 0.0) - avg_gain) / divisor, 0.0)
+            avg_loss += np.where(moved, (np.maximum(-delta, 0.0) - avg_loss) / divisor, 0.0)
+        with np.errstate(divide='ignore'):
+            value = 100 - 100 / (1 + avg_gain / avg_loss)
+    return np.where(seen >= period, value, np.nan)
+
+
+def _last_mean(prices, window):
+    # Mean of the last `window` rows, NaN for columns with fewer bars
+    tail = prices[-window:]
+    with np.errstate(invalid='ignore'):
+        return np.where(np.isnan(tail).any(axis=0) | (len(prices) < window), np.nan, tail.mean(axis=0))
+
+
+def screen_matrix(prices, tickers):
+    """Screen columns of a right-aligned close matrix; one row per ticker."""
+    metrics = compute_metrics(prices, correlation=False)
+    rows = len(prices)
+    last = prices[-1] if rows else np.full(len(tickers), np.nan)
+    first_row = rows - (~np.isnan(prices)).sum(axis=0)
+    first = prices[np.minimum(first_row, max(rows - 1, 0)), np.arange(len(tickers))] if rows else last
+    month_ago = prices[-TRADING_DAYS // 12 - 1] if rows > TRADING_DAYS // 12 else np.full(len(tickers), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table = pd.DataFrame({
+            'close': last,
+            'total_return': last / first - 1,
+            'return_1m': last / month_ago - 1,
+            'annual_return': metrics['Annual Return'],
+            'volatility': metrics['Standard Deviation'],
+            'sharpe': metrics['Sharpe Ratio'],
+            'sortino': metrics['Sortino Ratio'],
+            'max_drawdown': metrics['Max Drawdown'],
+            'rsi': last_rsi(prices),
+            'above_sma50': last / _last_mean(prices, 50) - 1,
+            'above_sma200': last / _last_mean(prices, 200) - 1,
+            'days': rows - first_row,
+        }, index=pd.Index(tickers, name='Ticker'))
+    return table
+
+
+def screen_chunk(tickers, start, end, cache_dir=DEFAULT_CACHE_DIR, offline=True):
+    """Load and screen one chunk of tickers; returns (table, errors)."""
+    # Runs in a worker process, with its own handle on the shared on-disk cache
+    cache = PriceCache(cache_dir=cache_dir)
+    start, end = to_day(start), to_day(end)
+    closes, loaded, errors = [], [], {}
+    for ticker in tickers:
+        try:
+            lo, hi = start, end
+            if offline:
+                covered = cache.coverage(ticker)
+                if covered is None:
+                    raise LookupError(f"{ticker} is not in the price cache")
+                lo, hi = max(start, covered[0]), min(end, covered[1])
+            values = cache.get(ticker, lo, hi)['Adj Close'].to_numpy()
+            if len(values) < 2:
+                raise LookupError(f"Not enough bars for {ticker}")
+            closes.append(values)
+            loaded.append(ticker)
+        except Exception as e:
+            errors[ticker] = e
+    return screen_matrix(stack_right(closes), loaded), errors
+
+
+def screen(tickers, start, end, workers=None, chunk_size=250, cache_dir=DEFAULT_CACHE_DIR, offline=True):
+    """Screen a universe on a process pool; returns (table, errors) with every ticker's metrics."""
+    tickers = unique_tickers(tickers)
+    workers = workers or os.cpu_count() or 1
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    tables, errors = [], {}
+    # Workers come from a forkserver, not a fork of the caller: the Streamlit
+    # server is multithreaded, and a forked child can inherit locks held by
+    # its other threads and deadlock on them
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max(1, min(workers, len(chunks))),
+                                                mp_context=multiprocessing.get_context('forkserver')) as pool:
+        for table, chunk_errors in pool.map(screen_chunk, chunks, [start] * len(chunks), [end] * len(chunks),
+                                            [cache_dir] * len(chunks), [offline] * len(chunks)):
+            tables.append(table)
+            errors.update(chunk_errors)
+    if not tables:
+        return pd.DataFrame(columns=SCREEN_COLUMNS, index=pd.Index([], name='Ticker')), errors
+    return pd.concat(tables), errors
+
+
+def check_filter(expression):
+    """Raise ValueError unless `expression` only uses screen columns, numbers and operators."""
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid filter: {e.msg}") from None
+    for node in ast.walk(tree):
+        if not isinstance(node, _FILTER_NODES):
+            raise ValueError(f"Unsupported syntax in filter: {type(node).__name__}")
+        if isinstance(node, ast.Name) and node.id not in SCREEN_COLUMNS:
+            raise ValueError(f"Unknown column '{node.id}'; filters can use {', '.join(SCREEN_COLUMNS)}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError("Filters can only compare against numbers")
+
+
+def rank(table, expression='', sort_by=DEFAULT_SORT, ascending=False):
+    """Rows matching the filter expression, sorted with missing values last."""
+    if expression and expression.strip():
+        check_filter(expression)
+        table = table.query(expression, engine='python')
+    return table.sort_values(sort_by, ascending=ascending, na_position='last', kind='stable')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen cached tickers on return, risk and indicators.")
+    parser.add_argument('tickers', nargs='*', help="tickers to screen (default: every cached ticker)")
+    parser.add_argument('--tickers-file', help="file with one ticker per line")
+    parser.add_argument('--start', default=str(datetime.date.today() - datetime.timedelta(days=365)))
+    parser.add_argument('--end', default=str(datetime.date.today()))
+    parser.add_argument('--filter', default='', help=f"e.g. \"sharpe > 1 and rsi < 70\"; columns: {', '.join(SCREEN_COLUMNS)}")
+    parser.add_argument('--sort', default=DEFAULT_SORT, choices=SCREEN_COLUMNS)
+    parser.add_argument('--ascending', action='store_true')
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--download', action='store_true', help="fetch tickers missing from the cache")
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += f.read().split()
+    tickers = tickers or cached_tickers(args.cache_dir)
+    try:
+        if args.filter.strip():
+            check_filter(args.filter)
+    except ValueError as e:
+        parser.error(str(e))
+
+    t0 = time.perf_counter()
+    table, errors = screen(tickers, args.start, args.end, args.workers, cache_dir=args.cache_dir,
+                           offline=not args.download)
+    elapsed = time.perf_counter() - t0
+    ranked = rank(table, args.filter, args.sort, args.ascending)
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(ranked.head(args.top).round(4))
+    print(f"{len(ranked)} of {len(table)} tickers match; screened in {elapsed:.2f} s "
+          f"({len(tickers) / elapsed:,.0f} tickers/sec), {len(errors)} skipped", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,24 @@
+# sections/__init__.py
+# One module per section of the app. Only the selected section's render()
+# runs on a rerun, so sections the user isn't looking at do no work. Modules
+# are imported the first time their section is opened, which keeps plotly,
+# the forum client and the news libraries out of the app's startup.
+import importlib
+
+SECTIONS = {
+    "Stock Comparison": 'sections.comparison',
+    "Screener": 'sections.screener',
+    "Financial Data": 'sections.financials',
+    "Selected News": 'sections.news',
+    "Videos": 'sections.videos',
+    "Articles": 'sections.articles',
+    "Tips": 'sections.tips',
+    "Forum": 'sections.community',
+}
+
+# Shared with the comparison section's multiselect default
+COMPARISON_DEFAULT = ['TSLA', 'AAPL']
+
+
+def render_section(name, view):
+    importlib.import_module(SECTIONS[name]).render(view)
@@ -0,0 +1,19 @@
+# sections/articles.py
+import streamlit as st
+
+from sections.common import fetch_stock_news
+
+
+def render(view):
+    st.header("Trending Stock Articles")
+
+    # Fetch stock news using the function
+    news_items = fetch_stock_news(view['stock'])
+
+    # Display the news articles
+    for item in news_items:
+        st.subheader(item["title"])
+        if item["image_url"]:
+            st.image(item["image_url"])
+        st.write(item["summary"])
+        st.markdown(f"[Read more]({item['url']})")
@@ -0,0 +1,155 @@
+# sections/common.py
+# Per-process resources shared by every section, plus the timing helpers
+# behind the sidebar's performance and I/O panels. Resources import their
+# modules when first built, so a section only pays for what it uses; each
+# one with hit counters reports them to telemetry as it is built.
+import logging
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+
+from telemetry import registry, span
+
+logger = logging.getLogger(__name__)
+
+
+# One news cache per server process, shared by every rerun and session
+@st.cache_resource
+def get_news_cache():
+    from news_cache import NewsCache
+    cache = NewsCache(ttl=900)
+    registry.register_collector('news_cache', cache.stats, counters=('hits', 'misses', 'coalesced'))
+    return cache
+
+
+# Statements are stored on disk and refreshed in the background when stale
+@st.cache_resource
+def get_fundamentals_store():
+    from fundamentals import FundamentalsStore
+    return FundamentalsStore()
+
+
+# One price cache per server process, shared by every rerun and session
+@st.cache_resource
+def get_price_cache():
+    from price_cache import PriceCache
+    cache = PriceCache()
+    registry.register_collector('price_cache', cache.stats, counters=('hits', 'misses', 'bytes_fetched'))
+    return cache
+
+
+# Minute bars live in memory-mapped monthly files next to the daily cache
+@st.cache_resource
+def get_intraday_store():
+    from intraday import IntradayStore
+    store = IntradayStore()
+    registry.register_collector('intraday_store', store.stats)
+    return store
+
+
+# One quote producer per feed and process; every session watching a ticker
+# reads the same ring buffer
+@st.cache_resource
+def get_live_stream(feed_name):
+    from live_feed import LiveStream, SimulatedQuoteFeed, YFinanceQuoteFeed
+    if feed_name == 'Yahoo Finance':
+        # Every poll is a request per ticker, so poll gently
+        stream = LiveStream(YFinanceQuoteFeed(), interval=5.0)
+    else:
+        stream = LiveStream(SimulatedQuoteFeed(), interval=0.25)
+    registry.register_collector(f'live_stream_{feed_name}', stream.stats, counters=('polls', 'errors'))
+    return stream
+
+
+@st.cache_resource
+def polygon_api_key():
+    # Access the API key using st.secrets
+    # API key is stored in the .streamlit/secrets.toml file WHERE YOU STORE THE KEY IN A VARIABLE CALLED polygon_api_key
+    return st.secrets["polygon_api_key"]
+
+
+def fetch_stock_news(ticker):
+    from http_client import get_client
+    from news_cache import fetch_polygon_news
+
+    polygon_key = polygon_api_key()
+    ticker = ticker.strip().upper()
+    try:
+        with span('fetch_stock_news'):
+            entry = get_news_cache().get(('polygon', ticker), lambda: fetch_polygon_news(ticker, polygon_key, limit=20, session=get_client()))
+        return entry['articles']
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Failed to fetch news for {ticker}: {e}")
+        return []
+
+
+def indicator_series(key, dates, close, names):
+    # Reuse the pipeline from the previous rerun when the series only gained
+    # bars at the end, so new days are appended in O(1) instead of recomputed.
+    # A last bar whose close changed (today's partial bar replaced by the
+    # final one) was already fed to the pipeline, so that recomputes too.
+    from indicators import IndicatorPipeline
+
+    cached = st.session_state.get('indicator_state')
+    if (cached and cached['key'] == key and cached['names'] == names
+            and cached['length'] <= len(close) and cached['length'] > 0
+            and dates[cached['length'] - 1] == cached['last_date']
+            and close[cached['length'] - 1] == cached['last_close']):
+        appended = cached['pipeline'].append(close[cached['length']:])
+        outputs = {k: np.concatenate([cached['outputs'][k], appended[k]]) for k in cached['outputs']}
+        pipeline = cached['pipeline']
+    else:
+        pipeline = IndicatorPipeline(names)
+        outputs = pipeline.batch(close)
+    st.session_state['indicator_state'] = {
+        'key': key, 'names': names, 'pipeline': pipeline, 'outputs': outputs,
+        'length': len(close), 'last_date': dates[-1] if len(dates) else None,
+        'last_close': close[-1] if len(close) else None
+    }
+    return outputs
+
+
+@contextmanager
+def timed(name):
+    # Wall time of a block, kept per section across reruns so switching
+    # sections doesn't hide the numbers of the ones visited before
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = st.session_state.setdefault('section_timings', {})
+        timings[name] = (time.perf_counter() - start) * 1000
+
+
+def render_timings(current):
+    # Sidebar breakdown; names not run in this rerun show their last timing
+    timings = st.session_state.get('section_timings', {})
+    with st.sidebar.expander("Performance"):
+        st.table(pd.DataFrame({
+            'ms': [round(ms, 1) for ms in timings.values()],
+            'this run': ['yes' if name in current else '' for name in timings],
+        }, index=list(timings)))
+
+
+def render_io_metrics():
+    # Debug panel: every span recorded by this server process, and the hit
+    # rates of the caches built so far
+    with st.sidebar.expander("I/O metrics"):
+        rows = registry.rows()
+        if rows:
+            st.dataframe(pd.DataFrame(rows).set_index('span').style.format(
+                {'mean ms': '{:.1f}', 'p50 ms': '{:.0f}', 'p99 ms': '{:.0f}', 'bytes': '{:,.0f}'}, na_rep=''))
+        else:
+            st.caption("No I/O recorded yet")
+        caches = {}
+        for name, stats in registry.collected().items():
+            if 'hits' in stats and 'misses' in stats:
+                lookups = stats['hits'] + stats['misses']
+                caches[name] = {'hits': stats['hits'], 'misses': stats['misses'],
+                                'hit rate': f"{stats['hits'] / lookups:.0%}" if lookups else ''}
+        if caches:
+            st.table(pd.DataFrame.from_dict(caches, orient='index'))
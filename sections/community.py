@@ -0,0 +1,6 @@
+# sections/community.py
+from forum import forum
+
+
+def render(view):
+    forum()
@@ -0,0 +1,126 @@
+# sections/comparison.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from downsample import downsample_indices
+from metrics import compute_metrics
+from portfolio import PortfolioModel
+from price_cache import ticker_frame
+from sections import COMPARISON_DEFAULT
+
+TICKER_CHOICES = ['TSLA', 'AAPL', 'AMZN', 'MSFT', 'GOOGL']
+
+
+# Keyed on the tickers and the date range; the price frame itself is not
+# hashed (leading underscore) since those inputs already determine it
+@st.cache_data(ttl=3600, show_spinner=False)
+def comparison_tables(_prices, compared, reference, start_date, end_date):
+    # All selected tickers in one vectorized pass over the aligned price matrix,
+    # with the main chart's ticker as the reference for beta
+    columns = list(compared) + ([reference] if reference not in compared and reference in _prices['Adj Close'] else [])
+    adj_close = _prices['Adj Close'].reindex(columns=columns)
+    comparison_metrics = compute_metrics(
+        adj_close.to_numpy(),
+        market_index=columns.index(reference) if reference in columns else None
+    )
+    correlation = comparison_metrics.pop('correlation')
+    comparison_df = pd.DataFrame(comparison_metrics, index=columns).loc[list(compared)]
+    if 'Beta' in comparison_df:
+        comparison_df = comparison_df.rename(columns={'Beta': f'Beta vs {reference}'})
+    correlation_df = pd.DataFrame(correlation, index=columns, columns=columns).loc[list(compared), list(compared)]
+    return comparison_df, correlation_df
+
+
+# Mean, covariance and the optimized portfolios are computed once per ticker
+# set and date range; moving the custom weight sliders or changing the number
+# of random portfolios only evaluates weights against the cached model
+@st.cache_data(ttl=3600, show_spinner=False)
+def portfolio_model(_prices, compared, start_date, end_date):
+    model = PortfolioModel(_prices['Adj Close'].reindex(columns=list(compared)).to_numpy(), compared)
+    _, frontier_returns, frontier_volatility = model.frontier()
+    return model, frontier_returns, frontier_volatility, model.min_variance(), model.max_sharpe()
+
+
+def render_portfolio(optimized, simulations, max_points):
+    import plotly.graph_objects as go
+
+    model, frontier_returns, frontier_volatility, min_variance, max_sharpe = optimized
+    weights, returns, volatility, sharpe = model.random_portfolios(simulations, seed=0)
+    optimal_returns, optimal_volatility, optimal_sharpe = model.performance(np.array([min_variance, max_sharpe]))
+
+    # Every simulated portfolio is evaluated, but only a chart's worth is drawn
+    shown = slice(0, min(simulations, max_points))
+    fig = go.Figure()
+    fig.add_scattergl(x=volatility[shown], y=returns[shown], mode='markers', name='Random portfolios',
+                      marker=dict(size=4, color=sharpe[shown], colorscale='Viridis', showscale=True,
+                                  colorbar=dict(title='Sharpe')))
+    fig.add_scatter(x=frontier_volatility, y=frontier_returns, mode='lines', name='Efficient frontier')
+    fig.add_scatter(x=optimal_volatility, y=optimal_returns, mode='markers+text', name='Optimal',
+                    text=['Min variance', 'Max Sharpe'], textposition='top left',
+                    marker=dict(size=12, symbol='star', color='red'))
+    fig.update_layout(title='Portfolios', xaxis_title='Annual volatility', yaxis_title='Annual return')
+    st.plotly_chart(fig)
+
+    st.table(pd.DataFrame({'Min variance': min_variance, 'Max Sharpe': max_sharpe}, index=model.tickers).style.format('{:.1%}'))
+    st.write(f"Best of {simulations:,} random portfolios: Sharpe {np.nanmax(sharpe):.2f}; "
+             f"max-Sharpe portfolio: {optimal_sharpe[1]:.2f}")
+
+    with st.expander("Custom weights"):
+        custom = np.array([st.slider(t, 0.0, 1.0, 1 / len(model.tickers), 0.01, key=f'weight_{t}') for t in model.tickers])
+        if custom.sum() > 0:
+            custom_return, custom_volatility, custom_sharpe = model.performance(custom / custom.sum())
+            st.write(f"Annual return {custom_return[0]:.1%}, volatility {custom_volatility[0]:.1%}, "
+                     f"Sharpe {custom_sharpe[0]:.2f}")
+
+
+def render(view):
+    import plotly.express as px
+
+    prices, price_errors = view['prices'], view['price_errors']
+    st.header("Stock Comparison")
+    # Tickers added from the screener extend the fixed choices for this session
+    choices = list(dict.fromkeys(TICKER_CHOICES + st.session_state.get('watchlist', [])))
+    selected_tickers = st.multiselect(
+        'Select stocks for comparison',
+        choices,
+        default=COMPARISON_DEFAULT,
+        key='comparison_tickers'
+    )
+
+    comparison_data = {}
+    for t in selected_tickers:
+        try:
+            if t in price_errors:
+                raise price_errors[t]
+            comparison_data[t] = ticker_frame(prices, t)
+            if comparison_data[t].empty:
+                st.warning(f"No data found for {t} in the specified date range.")
+        except Exception as e:
+            st.error(f"Failed to download data for {t}: {e}")
+
+    comparison_fig = px.line(title='Stock Comparison')
+    for t, d in comparison_data.items():
+        if not d.empty:
+            rows = downsample_indices(d.index.to_numpy(), d['Adj Close'].to_numpy(), view['max_chart_points'])
+            comparison_fig.add_scatter(x=d.index[rows], y=d['Adj Close'].iloc[rows], name=t)
+    st.plotly_chart(comparison_fig)
+
+    compared = tuple(t for t, d in comparison_data.items() if not d.empty)
+    if compared:
+        comparison_df, correlation_df = comparison_tables(
+            prices, compared, view['ticker'], view['start_date'], view['end_date']
+        )
+        st.table(comparison_df)
+        st.subheader("Correlation of Daily Returns")
+        st.table(correlation_df)
+
+    if len(compared) >= 2:
+        st.subheader("Portfolio Optimizer")
+        simulations = st.number_input('Random portfolios', min_value=1000, max_value=500000, value=20000, step=1000)
+        try:
+            optimized = portfolio_model(prices, compared, view['start_date'], view['end_date'])
+        except ValueError as e:
+            st.warning(str(e))
+        else:
+            render_portfolio(optimized, simulations, view['max_chart_points'])
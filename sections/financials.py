@@ -0,0 +1,52 @@
+# sections/financials.py
+import time
+
+import streamlit as st
+
+from metrics import compute_metrics, simple_returns
+from sections.common import get_fundamentals_store
+
+
+def render(view):
+    stock = view['stock']
+    try:
+        if view['data'] is None:
+            raise view['error'] or ValueError(f"No data found for {stock} in the specified date range.")
+        data = view['data']
+        # Price Index
+        st.header('Price Index')
+        adj_close = data['Adj Close'].to_numpy()
+        st.write(data.iloc[1:].assign(**{'% Change': simple_returns(adj_close)[:, 0]}))
+        stock_metrics = compute_metrics(adj_close, correlation=False)
+        annual_return = stock_metrics['Annual Return'][0] * 100
+        st.write('Annual Return is ', annual_return, '%')
+        stdev = stock_metrics['Standard Deviation'][0]
+        st.write('Standard Deviation is ', stdev * 100, '%')
+        st.write('Risk Adj. Return is', stock_metrics['Risk Adj. Return'][0])
+        st.write('Sortino Ratio is', stock_metrics['Sortino Ratio'][0])
+        st.write('Max Drawdown is ', stock_metrics['Max Drawdown'][0] * 100, '%')
+        st.header(f"{stock} Financials")
+
+        # Stored statements render right away; stale ones refresh in the background
+        load_start = time.perf_counter()
+        statements, fetched_at, refreshing = get_fundamentals_store().get(stock)
+        time_to_render = (time.perf_counter() - load_start) * 1000
+        st.caption(
+            f"Statements ready in {time_to_render:.0f} ms, fetched "
+            f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(fetched_at))}"
+            + (" (refreshing in the background)" if refreshing else "")
+        )
+
+        # Display the balance sheet
+        st.subheader("Balance Sheet")
+        st.write(statements['balance_sheet'])
+
+        # Display the quarterly balance sheet
+        st.subheader("Quarterly Balance Sheet")
+        st.write(statements['quarterly_balance_sheet'])
+
+        # Display the cash flow statement
+        st.subheader("Cash Flow Statement")
+        st.write(statements['cashflow'])
+    except Exception as e:
+        st.error(f"Failed to retrieve financial data: {e}")
@@ -0,0 +1,42 @@
+# sections/intraday_chart.py
+import datetime
+
+import streamlit as st
+
+from downsample import downsample_indices
+from intraday import INTERVALS, resample, to_frame
+from sections.common import get_intraday_store
+
+# Display resolution -> (stored interval, bar width in seconds)
+RESOLUTIONS = {
+    '1 minute': ('1m', 60),
+    '5 minutes': ('5m', 300),
+    '15 minutes': ('5m', 900),
+    '1 hour': ('5m', 3600),
+}
+
+
+def render(view, resolution):
+    import plotly.express as px
+
+    interval, seconds = RESOLUTIONS[resolution]
+    # The end date is included, so the default range shows today's session
+    end = view['end_date'] + datetime.timedelta(days=1)
+    try:
+        bars = get_intraday_store().get(view['ticker'], view['start_date'], end, interval)
+    except Exception as e:
+        st.error(f"Failed to download intraday data: {e}")
+        return
+    if seconds != INTERVALS[interval]:
+        bars = resample(bars, seconds)
+    if not len(bars):
+        st.warning(f"No {resolution} bars for {view['stock']} in the specified date range.")
+        return
+
+    # Only the plotted rows become a DataFrame
+    rows = downsample_indices(bars['time'], bars['close'], view['max_chart_points'])
+    plot_data = to_frame(bars[rows]).reset_index()
+    fig = px.line(plot_data, x='Date', y='Close', title=f"{view['stock']} {resolution} bars",
+                  hover_data=['Open', 'High', 'Low', 'Volume'])
+    st.plotly_chart(fig)
+    st.caption(f"{len(bars):,} bars, {bars.nbytes / 2 ** 20:.1f} MiB in memory")
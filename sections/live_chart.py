@@ -0,0 +1,75 @@
+# sections/live_chart.py
+import time
+
+import pandas as pd
+import streamlit as st
+
+from live_feed import SimulatedQuoteFeed
+from sections.common import get_live_stream
+
+FEEDS = ['Simulated', 'Yahoo Finance']
+
+
+def quote_frame(rows):
+    return pd.DataFrame({'Price': rows[:, 1]}, index=pd.to_datetime(rows[:, 0], unit='s').rename('Time'))
+
+
+class LiveChart:
+    """A chart of the ticker's live quotes that grows without reruns.
+
+    Creating it draws what the ring buffer already holds; follow(), called
+    last in the script, then sends only the points appended since the
+    previous refresh through add_rows(). Streamlit stops the loop by
+    starting a new run as soon as any widget changes.
+    """
+
+    def __init__(self, view, feed_name, refresh):
+        self.stream = get_live_stream(feed_name)
+        self.ticker = view['ticker']
+        self.refresh = refresh
+        self.max_points = view['max_chart_points']
+        if isinstance(self.stream.feed, SimulatedQuoteFeed) and view['data'] is not None:
+            # Start the simulated walk from the last daily close
+            self.stream.feed.start_prices.setdefault(self.ticker, float(view['data']['Close'].iloc[-1]))
+        self.stream.watch([self.ticker])
+        self.buffer = self.stream.buffer(self.ticker)
+
+        st.subheader(f"{view['stock']} live ({feed_name})")
+        self.chart_slot = st.empty()
+        self.status = st.empty()
+        self.updates = 0
+        self._redraw()
+
+    def _redraw(self):
+        # The chart in the browser only grows, so start it over from the
+        # newest points once it holds a chart's worth
+        self.seq, rows = self.buffer.since(self.buffer.count - self.max_points)
+        self.shown = len(rows)
+        self.chart = self.chart_slot.line_chart(quote_frame(rows))
+
+    def follow(self):
+        cpu_start, wall_start = time.thread_time(), time.perf_counter()
+        caption, last_update = "Waiting for the first quote", time.time()
+        while True:
+            time.sleep(self.refresh)
+            # Keep the ticker on the producer's list while someone watches it
+            self.stream.watch([self.ticker])
+            self.seq, rows = self.buffer.since(self.seq)
+            if not len(rows):
+                # Streamlit only notices widget changes and closed tabs when the
+                # script sends something, so write the status even without quotes
+                self.status.caption(f"{caption} · no new quotes for {time.time() - last_update:.0f} s")
+                continue
+            if self.shown + len(rows) > self.max_points:
+                self._redraw()
+            else:
+                self.chart.add_rows(quote_frame(rows))
+                self.shown += len(rows)
+            self.updates += 1
+            last_update = time.time()
+            latency = (last_update - rows[-1, 2]) * 1000
+            cpu = (time.thread_time() - cpu_start) / (time.perf_counter() - wall_start)
+            caption = (f"Last {rows[-1, 1]:.2f} at {pd.Timestamp(rows[-1, 0], unit='s'):%H:%M:%S} UTC · "
+                       f"{self.updates} updates, newest point {latency:.0f} ms old when drawn · "
+                       f"this view uses {cpu:.1%} of a CPU")
+            self.status.caption(caption)
@@ -0,0 +1,32 @@
+# sections/news.py
+from math import ceil
+
+import streamlit as st
+
+from news_cache import fetch_rss_news
+from sections.common import get_news_cache
+
+
+def render(view):
+    stock = view['stock']
+    st.header(f'Trending News of {stock}')
+    # Cached per ticker with the sentiment averages already computed
+    rss_ticker = view['ticker']
+    news_entry = get_news_cache().get(('rss', rss_ticker), lambda: fetch_rss_news(rss_ticker, limit=10))
+
+    for i, article in enumerate(news_entry['articles']):
+        st.subheader(f'News {i + 1}')
+        st.write(article['published'])
+        st.write(article['title'])
+        st.write(article['summary'])
+        st.write(f"Title Sentiment: {article['sentiment_title']}")
+        st.write(f"News Sentiment: {article['sentiment_summary']}")
+
+    # Display average sentiments
+    if news_entry['articles']:
+        average_title_sentiment = ceil(news_entry['sentiment_title_avg'] * 100) / 100
+        average_summary_sentiment = ceil(news_entry['sentiment_summary_avg'] * 100) / 100
+        st.markdown(f'## Average Title Sentiment: {average_title_sentiment}')
+        st.markdown(f'## Average News Sentiment: {average_summary_sentiment}')
+        st.markdown(f"Median Title Sentiment: {news_entry['sentiment_title_med']:.2f} · "
+                    f"Median News Sentiment: {news_entry['sentiment_summary_med']:.2f}")
@@ -0,0 +1,58 @@
+# sections/price_chart.py
+import streamlit as st
+
+from downsample import downsample_indices
+from indicators import INDICATORS, PRICE_SCALE
+from sections.common import indicator_series
+
+
+def render(view):
+    # plotly is the slowest import of the app, so it loads with the first chart
+    import plotly.express as px
+
+    data = view['data']
+    stock = view['stock']
+
+    # Graph style with color picker
+    line_color = st.sidebar.color_picker("Choose a line color for the graph", '#00f')
+
+    # Display stock price graph
+    # Add an 'Index' column to the DataFrame
+    data['Index'] = data.index
+
+    # Only send the points that are visible at chart resolution
+    plot_rows = downsample_indices(data['Date'].to_numpy(), data['Adj Close'].to_numpy(), view['max_chart_points'])
+    plot_data = data.iloc[plot_rows]
+
+    # Display stock price graph using the updated DataFrame
+    fig = px.line(
+        plot_data,
+        x='Date',
+        y='Adj Close',
+        title=f"{stock} Stock Price",
+        labels={'Adj Close': 'Adjusted Close'}  # Renaming the label for clarity
+    )
+
+    # Update the hover template to include the index
+    fig.update_traces(
+        line=dict(color=line_color),  # You can set this earlier with the color picker
+        hoverinfo='text',  # Ensures that hover text is displayed
+        hovertemplate="<b>Date:</b> %{x|%B %d, %Y}<br><b>Index:</b> %{customdata[0]}<br><b>Adjusted Close:</b> %{y:.2f}",  # Custom hover text
+        customdata=plot_data[['Index']]  # Pass the index as custom data
+    )
+
+    # Overlay the selected indicators; oscillators get their own right-hand axis
+    selected_indicators = st.sidebar.multiselect("Indicators", list(INDICATORS))
+    if selected_indicators:
+        outputs = indicator_series(
+            (view['ticker'], view['start_date']), data['Date'].to_numpy(),
+            data['Adj Close'].to_numpy(), selected_indicators
+        )
+        for name, values in outputs.items():
+            fig.add_scatter(x=plot_data['Date'], y=values[plot_rows], name=name, mode='lines',
+                            yaxis='y' if name in PRICE_SCALE else 'y2')
+        if any(name not in PRICE_SCALE for name in outputs):
+            fig.update_layout(yaxis2=dict(overlaying='y', side='right', showgrid=False))
+
+    # Display the updated graph in Streamlit
+    st.plotly_chart(fig)
@@ -0,0 +1,68 @@
+# sections/screener.py
+import time
+
+import streamlit as st
+
+from screener import DEFAULT_SORT, SCREEN_COLUMNS, cached_tickers, rank, screen
+from sections.common import get_price_cache
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+PERCENT_COLUMNS = ['total_return', 'return_1m', 'annual_return', 'volatility', 'max_drawdown',
+                   'above_sma50', 'above_sma200']
+
+
+# The full metric table for a universe and date range is computed once an
+# hour; filtering, sorting and paging only work on the cached table
+@st.cache_data(ttl=3600, show_spinner=False)
+def screen_universe(universe, start_date, end_date, offline):
+    t0 = time.perf_counter()
+    table, errors = screen(universe, start_date, end_date, cache_dir=get_price_cache().cache_dir, offline=offline)
+    return table, {t: str(e) for t, e in errors.items()}, time.perf_counter() - t0
+
+
+def render(view):
+    st.header("Screener")
+    use_cache = st.checkbox("Screen every cached ticker", value=True,
+                            help="Otherwise list the tickers to screen below")
+    if use_cache:
+        universe = cached_tickers(get_price_cache().cache_dir)
+    else:
+        listed = st.text_area("Tickers", value="TSLA AAPL AMZN MSFT GOOGL", help="Separated by spaces, commas or lines")
+        universe = listed.replace(',', ' ').split()
+    offline = st.checkbox("Cached prices only", value=True, help="Skip tickers that would need a download")
+    if not universe:
+        st.info("No tickers to screen yet; prices are cached as tickers are viewed.")
+        return
+
+    table, errors, elapsed = screen_universe(tuple(sorted(universe)), view['start_date'], view['end_date'], offline)
+    st.caption(f"{len(table):,} tickers screened in {elapsed:.2f} s"
+               + (f", {len(errors):,} skipped" if errors else ""))
+
+    expression = st.text_input("Filter", value='', placeholder="e.g. sharpe > 1 and rsi < 70 and max_drawdown > -0.2",
+                               help="Columns: " + ', '.join(SCREEN_COLUMNS) + ". Returns are fractions (0.1 = 10%).")
+    sort_col, order_col, size_col = st.columns(3)
+    sort_by = sort_col.selectbox("Sort by", SCREEN_COLUMNS, index=SCREEN_COLUMNS.index(DEFAULT_SORT))
+    ascending = order_col.selectbox("Order", ["Descending", "Ascending"]) == "Ascending"
+    page_size = size_col.selectbox("Per page", PAGE_SIZES)
+    try:
+        ranked = rank(table, expression, sort_by, ascending)
+    except Exception as e:
+        st.error(str(e))
+        return
+
+    pages = max(1, -(-len(ranked) // page_size))
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1)
+    shown = ranked.iloc[(page - 1) * page_size:page * page_size]
+    st.dataframe(shown.style.format('{:.1%}', subset=PERCENT_COLUMNS, na_rep='')
+                 .format('{:.2f}', subset=['close', 'sharpe', 'sortino', 'rsi'], na_rep=''))
+    st.write(f"{len(ranked):,} of {len(table):,} tickers match")
+
+    # Picks join the comparison section's choices for this session
+    if st.button("Add this page to the comparison choices") and len(shown):
+        watchlist = st.session_state.setdefault('watchlist', [])
+        watchlist.extend(t for t in shown.index if t not in watchlist)
+        st.success(f"Added {len(shown)} tickers to the comparison choices")
+    if errors:
+        with st.expander(f"Skipped tickers ({len(errors):,})"):
+            st.write(errors)
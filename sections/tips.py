@@ -0,0 +1,40 @@
+# sections/tips.py
+import random
+
+import streamlit as st
+
+
+# Class to hold an array of stock tips for users
+class StockTips:
+    def __init__(self):
+        self.tips = [
+            "Always do your own research and due diligence before buying a stock.",
+            "Diversify your portfolio to spread risk.",
+            "Invest in companies you understand and believe in for the long term.",
+            "Avoid making decisions based solely on price movements or market speculation.",
+            "Monitor your investments regularly and stay updated with market news.",
+            "Consider the company's fundamentals, such as earnings, valuation, and growth potential.",
+            "Always be cautious of stocks with extremely high valuations or rapid price increases.",
+            "Set a budget and avoid investing money you can't afford to lose.",
+            "Consider setting stop-loss orders to limit potential losses.",
+            "Stay patient and avoid emotional decision-making."
+        ]
+
+    def sample_tips(self, count=3):
+        # A random pick that leaves the shared list untouched
+        return random.sample(self.tips, count)
+
+
+# Static content, built once per process when the section is first opened
+stock_tips = StockTips()
+
+
+def render(view):
+    # Picked once per session, so the tips don't change on every widget interaction
+    if 'selected_tips' not in st.session_state:
+        st.session_state['selected_tips'] = stock_tips.sample_tips()
+    selected_tips = st.session_state['selected_tips']
+
+    st.write("Consider the following tips before investing in stocks:")
+    for tip in selected_tips:
+        st.write(f"- {tip}")
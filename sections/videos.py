@@ -0,0 +1,48 @@
+# sections/videos.py
+import random
+
+import streamlit as st
+
+
+class VideoArray:
+    def __init__(self, videos):
+        self.videos = videos
+
+    def sample_videos(self, count=3):
+        # A random pick that leaves the shared list untouched
+        return random.sample(self.videos, count)
+
+
+video_urls = [
+    "https://www.youtube.com/watch?v=i5OZQQWj5-I&ab_channel=TradingLab",
+    "https://www.youtube.com/watch?v=rMMnk6Yvxic&ab_channel=BrianJung",
+    "https://www.youtube.com/watch?v=86rPBAnRCHc&ab_channel=BrianJung",
+    "https://www.youtube.com/watch?v=8Ij7A1VCB7I&ab_channel=MarkTilbury",
+    "https://www.youtube.com/watch?v=bEElvs_5byk&ab_channel=MikiRai",
+    "https://www.youtube.com/watch?v=63oF8BOMMB8&ab_channel=FREENVESTING",
+    "https://www.youtube.com/watch?v=Wk-h2CwEH5k&ab_channel=TradingLab",
+    "https://www.youtube.com/watch?v=SfLP1CgLP30&ab_channel=NewMoney",
+    "https://www.youtube.com/watch?v=pDuIvrirPPc&ab_channel=BobSharpe",
+    "https://www.youtube.com/watch?v=lNdOtlpmH5U&ab_channel=AliAbdaal",
+    "https://www.youtube.com/watch?v=-ZscZv-IMyI&ab_channel=AliAbdaal",
+    "https://www.youtube.com/watch?v=CYG5E8-DUQc&ab_channel=ImanGadzhi",
+    "https://www.youtube.com/watch?v=uCjcc1TXk5c&ab_channel=ImanGadzhi",
+    "https://www.youtube.com/watch?v=RaKfKl9G-Q4&ab_channel=DayTradingAddict",
+    "https://www.youtube.com/watch?v=BWrkByUnfEk&ab_channel=FinTek",
+    "https://www.youtube.com/watch?v=wnCQ4ICBIfc&ab_channel=TickerSymbol%3AYOU"
+]
+
+
+# Static content, built once per process when the section is first opened
+video_array = VideoArray(video_urls)
+
+
+def render(view):
+    # Picked once per session, so the videos don't change on every widget interaction
+    if 'selected_videos' not in st.session_state:
+        st.session_state['selected_videos'] = video_array.sample_videos()
+    selected_videos = st.session_state['selected_videos']
+
+    st.header("Educational Videos on Stock Investment")
+    for video_url in selected_videos:
+        st.video(video_url)
@@ -0,0 +1,316 @@
+# telemetry.py
+# Timing spans and counters for every I/O path: downloads, news fetches,
+# HTTP calls and SQL queries. Each span name and label set gets a latency
+# histogram plus totals for errors and payload bytes; caches report their
+# hit counters through collectors read at export time. One registry per
+# process, rendered as rows for the app's debug panel or in the Prometheus
+# text format for the forum backend's /metrics. Servers with several worker
+# processes share their registries through SharedSnapshots, so every scrape
+# sees the totals of all workers rather than whichever one answered.
+#
+#   with span('yfinance_download', interval='1d') as s:
+#       df = yf.download(...)
+#       s.size = payload_size(df)
+import bisect
+import contextlib
+import functools
+import json
+import os
+import re
+import threading
+import time
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+NAMESPACE = 'stockanalyzer'
+
+# Collector stats exported as counters unless register_collector says otherwise
+COUNTER_STATS = ('hits', 'misses')
+
+
+class LatencyHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+    def observe(self, seconds, error=False):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.errors += error
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets + [float('inf')], self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts)),
+        }
+
+
+def payload_size(value):
+    # Bytes held by a download's result, as well as it can be told cheaply
+    if value is None:
+        return 0
+    if hasattr(value, 'memory_usage'):
+        return int(value.memory_usage(index=True).sum())
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    return None
+
+
+class Span:
+    """Handed to the body of a span, which may set the payload size."""
+    __slots__ = ('size',)
+
+    def __init__(self):
+        self.size = None
+
+
+class Registry:
+    def __init__(self):
+        self._histograms = {}  # (name, labels) -> LatencyHistogram
+        self._bytes = {}  # (name, labels) -> payload bytes
+        self._collectors = {}  # name -> (callable returning {stat: number}, names of counter stats)
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, error=False, size=None, **labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+                self._bytes[key] = 0
+            histogram.observe(seconds, error)
+            if size:
+                self._bytes[key] += size
+
+    @contextlib.contextmanager
+    def span(self, name, **labels):
+        span, error = Span(), False
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, error, span.size, **labels)
+
+    def traced(self, name, **labels):
+        # Decorator form of span(); the size is taken from the return value
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name, **labels) as span:
+                    result = fn(*args, **kwargs)
+                    span.size = payload_size(result)
+                    return result
+            return wrapper
+        return decorate
+
+    def register_collector(self, name, collect, counters=COUNTER_STATS):
+        # Replaces any collector registered under the same name. Stats named
+        # in `counters` only ever grow; the rest are gauges.
+        with self._lock:
+            self._collectors[name] = (collect, tuple(counters))
+
+    def _collect(self):
+        with self._lock:
+            collectors = dict(self._collectors)
+        out = {}
+        for name, (collect, counters) in collectors.items():
+            try:
+                stats = {k: v for k, v in collect().items() if isinstance(v, (int, float)) and v is not None}
+            except Exception:
+                stats = {}
+            out[name] = (stats, counters)
+        return out
+
+    def collected(self):
+        return {name: stats for name, (stats, _) in self._collect().items()}
+
+    def rows(self):
+        """One dict per span name and label set, for tables."""
+        with self._lock:
+            items = [(key, h.summary(), self._bytes[key]) for key, h in self._histograms.items()]
+        return [{
+            'span': name,
+            'labels': ', '.join(f'{k}={v}' for k, v in labels),
+            'count': summary['count'],
+            'errors': summary['errors'],
+            'mean ms': summary['mean'] * 1000,
+            'p50 ms': _ms(summary['p50']),
+            'p99 ms': _ms(summary['p99']),
+            'bytes': size,
+        } for (name, labels), summary, size in sorted(items)]
+
+    def snapshot(self):
+        """This process's histograms and collector stats as JSON-ready data."""
+        with self._lock:
+            histograms = [[name, [list(label) for label in labels], list(h.counts), h.count, h.total, h.errors,
+                           self._bytes[(name, labels)]] for (name, labels), h in self._histograms.items()]
+        counters, gauges = {}, {}
+        for name, (stats, counter_names) in self._collect().items():
+            counters[name] = {k: v for k, v in stats.items() if k in counter_names}
+            gauges[name] = {k: v for k, v in stats.items() if k not in counter_names}
+        return {'pid': os.getpid(), 'histograms': histograms, 'counters': counters, 'gauges': gauges}
+
+    def prometheus(self):
+        """Every histogram, byte total and collector stat in the Prometheus text format."""
+        return render_prometheus([self.snapshot()])
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def render_prometheus(snapshots):
+    """Sum of the given snapshots in the Prometheus text format.
+
+    Histograms and counters include processes that have exited, so totals
+    never go backwards when a worker is replaced; gauges only count
+    processes that are still running.
+    """
+    histograms, counters, gauges = {}, {}, {}
+    for snapshot in snapshots:
+        for name, labels, counts, count, total, errors, size in snapshot['histograms']:
+            key = (name, tuple(tuple(label) for label in labels))
+            merged = histograms.setdefault(key, [[0] * len(counts), 0, 0.0, 0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            for i, value in enumerate((count, total, errors, size), start=1):
+                merged[i] += value
+        live = snapshot['pid'] == os.getpid() or _alive(snapshot['pid'])
+        for target, stats in ((counters, snapshot['counters']), (gauges, snapshot['gauges'] if live else {})):
+            for name, values in stats.items():
+                for stat, value in values.items():
+                    target[(name, stat)] = target.get((name, stat), 0) + value
+
+    # Each family's lines form one block: every label set's histogram
+    # first, then the error totals, then the byte totals
+    families = {}
+    for (name, labels), (counts, count, total, errors, size) in sorted(histograms.items()):
+        families.setdefault(_metric_name(name), []).append((labels, counts, count, total, errors, size))
+    lines = []
+    for metric, series in families.items():
+        lines.append(f'# TYPE {metric}_seconds histogram')
+        for labels, counts, count, total, _, _ in series:
+            cumulative = 0
+            for bound, bucket in zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], counts):
+                cumulative += bucket
+                lines.append(f'{metric}_seconds_bucket{_labels(labels + (("le", bound),))} {cumulative}')
+            lines += [f'{metric}_seconds_sum{_labels(labels)} {total}',
+                      f'{metric}_seconds_count{_labels(labels)} {count}']
+        lines.append(f'# TYPE {metric}_errors_total counter')
+        lines += [f'{metric}_errors_total{_labels(labels)} {errors}' for labels, _, _, _, errors, _ in series]
+        lines.append(f'# TYPE {metric}_bytes_total counter')
+        lines += [f'{metric}_bytes_total{_labels(labels)} {size}' for labels, _, _, _, _, size in series]
+    for (name, stat), value in sorted(counters.items()):
+        metric = _metric_name(f'{name}_{stat}_total')
+        lines += [f'# TYPE {metric} counter', f'{metric} {value}']
+    for (name, stat), value in sorted(gauges.items()):
+        metric = _metric_name(f'{name}_{stat}')
+        lines += [f'# TYPE {metric} gauge', f'{metric} {value}']
+    return '\n'.join(lines) + '\n'
+
+
+class SharedSnapshots:
+    """Registry snapshots of several processes exchanged through a directory.
+
+    Each process writes its own snapshot to <directory>/<pid>.json every
+    `interval` seconds once start() has been called, and again just before
+    prometheus() reads them all, so the answering worker is always current
+    and the others lag by at most `interval`.
+    """
+
+    def __init__(self, directory, registry, interval=5.0):
+        self.directory = directory
+        self.registry = registry
+        self.interval = interval
+        self._pid = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self):
+        path = os.path.join(self.directory, f'{os.getpid()}.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.registry.snapshot(), f)
+        os.replace(path + '.tmp', path)
+
+    def read(self):
+        snapshots = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                try:
+                    with open(entry.path) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return snapshots
+
+    def start(self):
+        # Threads don't survive a fork, so every worker starts its own writer
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name='metrics-snapshot', daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                self.write()
+            except OSError:
+                pass
+            time.sleep(self.interval)
+
+    def prometheus(self):
+        self.write()
+        return render_prometheus(self.read())
+
+
+def _ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+def _metric_name(name):
+    return f"{NAMESPACE}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}"
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in labels)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + '}'
+
+
+registry = Registry()
+observe = registry.observe
+span = registry.span
+traced = registry.traced
+register_collector = registry.register_collector
@@ -0,0 +1,27 @@
+# tests/conftest.py
+import os
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def forum(tmp_path_factory):
+    # forum_backend builds its engine on import, so the scratch DB is set first
+    os.environ['FORUM_DATABASE_URL'] = f"sqlite:///{tmp_path_factory.mktemp('forum') / 'forum.db'}"
+    import forum_backend
+    forum_backend.init_db()
+    return forum_backend
+
+
+@pytest.fixture
+def new_post(forum):
+    def create(title='post'):
+        session_db = forum.Session()
+        try:
+            post = forum.Post(title=title, content='', upvotes=0, tags='')
+            session_db.add(post)
+            session_db.commit()
+            return post.id
+        finally:
+            session_db.close()
+    return create
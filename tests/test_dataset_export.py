@@ -0,0 +1,19 @@
+# tests/test_dataset_export.py
+import numpy as np
+
+from dataset_export import daily_sentiment
+from event_study import event_days
+
+
+def test_export_and_event_study_agree_on_news_days():
+    articles = [
+        {'published': '2024-01-02T15:00:00Z', 'sentiment_summary': 0.2, 'sentiment_title': 0.1},  # 10:00 New York
+        {'published': '2024-01-02T21:30:00Z', 'sentiment_summary': 0.6, 'sentiment_title': 0.3},  # after the close
+        {'published': 'Wed, 03 Jan 2024 14:00:00 +0000', 'sentiment_summary': 0.4, 'sentiment_title': 0.5},
+        {'published': 'not a date', 'sentiment_summary': 1.0, 'sentiment_title': 1.0},
+    ]
+    daily = daily_sentiment(articles)
+    assert list(daily.index) == [np.datetime64('2024-01-02'), np.datetime64('2024-01-03')]
+    assert daily.loc[np.datetime64('2024-01-03'), 'sentiment_summary_avg'] == 0.5
+    days = set(event_days({'published': [a['published'] for a in articles]})[:3])
+    assert days == set(daily.index.values.astype('datetime64[D]'))
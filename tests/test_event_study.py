@@ -0,0 +1,40 @@
+# tests/test_event_study.py
+import numpy as np
+import pandas as pd
+
+from event_study import PricePanel, news_days
+
+DAYS = pd.bdate_range('2024-01-01', periods=5)
+CLOSES = [100.0, 110.0, 121.0, 133.1, 146.41]
+
+
+def panel():
+    return PricePanel({'AAA': pd.Series(CLOSES, index=DAYS)})
+
+
+def test_returns_start_at_the_event_close():
+    p = panel()
+    pos = p.locate(['AAA'], [DAYS[1]])
+    returns = p.forward_returns(pos, [1, 2, 3])
+    # h=1 is the day after the event: 110 -> 121
+    np.testing.assert_allclose(returns[0], [0.1, 0.21, 0.331])
+
+
+def test_event_day_move_is_opt_in():
+    p = panel()
+    pos = p.locate(['AAA'], [DAYS[1]])
+    np.testing.assert_allclose(p.forward_returns(pos, [1], from_event_close=False)[0], [0.1])
+    # No close before the first bar
+    assert np.isnan(p.forward_returns(p.locate(['AAA'], [DAYS[0]]), [1], from_event_close=False)[0, 0])
+
+
+def test_windows_past_the_series_are_nan():
+    p = panel()
+    returns = p.forward_returns(p.locate(['AAA', 'AAA', 'ZZZ'], [DAYS[3], DAYS[4], DAYS[0]]), [1, 2])
+    np.testing.assert_allclose(returns[0, 0], 0.1)
+    assert np.isnan(returns[0, 1]) and np.isnan(returns[1]).all() and np.isnan(returns[2]).all()
+
+
+def test_news_after_the_close_belongs_to_the_next_day():
+    days = news_days(['2024-01-02T15:00:00Z', '2024-01-02T21:30:00Z'])
+    assert list(days) == [np.datetime64('2024-01-02'), np.datetime64('2024-01-03')]
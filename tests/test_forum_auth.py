@@ -0,0 +1,58 @@
+# tests/test_forum_auth.py
+import pytest
+
+from forum_auth import RateLimiter
+
+
+@pytest.fixture
+def limited(forum, monkeypatch):
+    # Small limits so the tests reach them quickly
+    monkeypatch.setattr(forum, 'rate_limiter', RateLimiter(limit=3, window=60))
+    monkeypatch.setattr(forum, 'address_limiter', RateLimiter(limit=8, window=60))
+    monkeypatch.setattr(forum, 'register_limiter', RateLimiter(limit=4, window=60))
+    return forum
+
+
+def client_for(forum, address):
+    client = forum.app.test_client()
+    client.environ_base['REMOTE_ADDR'] = address
+    return client
+
+
+def test_failed_logins_only_lock_that_username(limited):
+    client = client_for(limited, '10.0.0.1')
+    credentials = {'username': 'alice', 'password': 'alice-password'}
+    assert client.post('/register', json=credentials).status_code == 201
+    for _ in range(3):
+        assert client.post('/login', json={'username': 'mallory', 'password': 'wrong'}).status_code == 401
+    locked = client.post('/login', json={'username': 'mallory', 'password': 'wrong'})
+    assert locked.status_code == 429 and int(locked.headers['Retry-After']) > 0
+    # Same address, different account
+    assert client.post('/login', json=credentials).status_code == 200
+
+
+def test_one_address_cannot_spray_usernames(limited):
+    client = client_for(limited, '10.0.0.2')
+    codes = [client.post('/login', json={'username': f'spray{i}', 'password': 'wrong'}).status_code
+             for i in range(10)]
+    assert codes == [401] * 8 + [429] * 2
+    # Other addresses are unaffected
+    assert client_for(limited, '10.0.0.3').post('/login', json={'username': 'spray0', 'password': 'x'}).status_code == 401
+
+
+def test_registrations_share_one_limit(limited):
+    codes = [client_for(limited, f'10.1.0.{i}').post('/register', json={'username': f'new{i}', 'password': 'pw'})
+             .status_code for i in range(6)]
+    assert codes == [201] * 4 + [429] * 2
+
+
+def test_limiter_drops_least_recently_used_keys():
+    now = [0.0]
+    limiter = RateLimiter(limit=1, window=60, clock=lambda: now[0], max_keys=3)
+    for key in 'abc':
+        assert limiter.hit(key) == 0
+    assert limiter.hit('a') == 60  # 'a' is now the most recent
+    assert limiter.hit('d') == 0   # evicts 'b'
+    assert len(limiter._windows) == 3
+    assert limiter.hit('b') == 0
+    assert limiter.hit('a') == 60
@@ -0,0 +1,38 @@
+# tests/test_forum_search.py
+import pytest
+
+
+@pytest.fixture
+def client(forum):
+    client = forum.app.test_client()
+    credentials = {'username': 'searcher', 'password': 'searcher-password'}
+    client.post('/register', json=credentials)
+    assert client.post('/login', json=credentials).status_code == 200
+    return client
+
+
+def add_posts(client, titles):
+    for title in titles:
+        assert client.post('/posts', json={'title': title, 'content': 'filler text', 'tags': ''}).status_code == 201
+
+
+def test_old_best_match_is_ranked_first(client):
+    # The best match is the oldest post, behind many weaker newer ones
+    add_posts(client, ['zebracorn zebracorn zebracorn'] + ['a post about zebracorn and more'] * 30)
+    response = client.get('/posts/search', query_string={'q': 'zebracorn', 'limit': 5})
+    assert response.status_code == 200
+    assert response.json[0]['title'] == 'zebracorn zebracorn zebracorn'
+    assert 'X-Search-Window' not in response.headers
+
+
+def test_capped_window_is_reported(forum, client, monkeypatch):
+    add_posts(client, ['quokkafish'] * 10)
+    monkeypatch.setattr(forum, 'SEARCH_WINDOW', 4)
+    response = client.get('/posts/search', query_string={'q': 'quokkafish', 'limit': 20})
+    assert len(response.json) == 4
+    assert response.headers['X-Search-Window'] == '4'
+
+    monkeypatch.setattr(forum, 'SEARCH_WINDOW', 10)
+    response = client.get('/posts/search', query_string={'q': 'quokkafish', 'limit': 20})
+    assert len(response.json) == 10
+    assert 'X-Search-Window' not in response.headers
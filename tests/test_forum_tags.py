@@ -0,0 +1,51 @@
+# tests/test_forum_tags.py
+import threading
+
+
+def tag_names(forum, post_id):
+    session_db = forum.Session()
+    try:
+        return sorted(name for name, in session_db.query(forum.Tag.name).join(
+            forum.PostTag, forum.PostTag.tag_id == forum.Tag.id).filter(forum.PostTag.post_id == post_id))
+    finally:
+        session_db.close()
+
+
+def test_existing_and_new_tags_are_linked_once(forum, new_post):
+    first, second = new_post(), new_post()
+    for post_id in (first, second):
+        session_db = forum.Session()
+        try:
+            forum.tag_post(session_db, post_id, 'Shared, own-%d, shared' % post_id)
+            session_db.commit()
+        finally:
+            session_db.close()
+    assert tag_names(forum, second) == sorted(['own-%d' % second, 'shared'])
+    session_db = forum.Session()
+    assert session_db.query(forum.Tag).filter_by(name='shared').count() == 1
+    session_db.close()
+
+
+def test_concurrent_posts_with_the_same_new_tag(forum):
+    client = forum.app.test_client()
+    credentials = {'username': 'tagger', 'password': 'tagger-password'}
+    assert client.post('/register', json=credentials).status_code == 201
+    assert client.post('/login', json=credentials).status_code == 200
+    barrier = threading.Barrier(8)
+    codes = []
+
+    def create(i):
+        barrier.wait()
+        codes.append(client.post('/posts', json={'title': f'race {i}', 'content': '', 'tags': 'brand-new-tag'})
+                     .status_code)
+
+    threads = [threading.Thread(target=create, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert codes == [201] * 8
+    session_db = forum.Session()
+    tag = session_db.query(forum.Tag).filter_by(name='brand-new-tag').one()
+    assert session_db.query(forum.PostTag).filter_by(tag_id=tag.id).count() == 8
+    session_db.close()
@@ -0,0 +1,78 @@
+# tests/test_fundamentals.py
+import concurrent.futures
+import logging
+
+import pandas as pd
+
+from fundamentals import STATEMENTS, FundamentalsFetcher, FundamentalsStore
+
+
+class ScriptedFetcher(FundamentalsFetcher):
+    """Returns `frame`, or raises it when it is an exception."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = 0
+
+    def fetch(self, ticker, statement):
+        self.calls += 1
+        if isinstance(self.frame, Exception):
+            raise self.frame
+        return self.frame
+
+
+def test_empty_statements_are_stored_with_a_shorter_ttl(tmp_path, caplog):
+    now = [0.0]
+    fetcher = ScriptedFetcher(pd.DataFrame())
+    store = FundamentalsStore(fetcher, str(tmp_path), ttl=1000, empty_ttl=10, clock=lambda: now[0])
+    with caplog.at_level(logging.WARNING, logger='fundamentals'):
+        statements, _, refreshing = store.get('ETF')
+    assert all(frame.empty for frame in statements.values()) and not refreshing
+    assert 'came back empty' in caplog.text
+    # An ETF's empty statements are served from disk like any others
+    assert store.get('ETF')[2] is False
+    assert fetcher.calls == len(STATEMENTS)
+    now[0] = 10.0
+    assert store.get('ETF')[2] is True
+
+
+def test_empty_refresh_keeps_stored_statements(tmp_path):
+    now = [0.0]
+    frame = pd.DataFrame({'2023': [1.0]}, index=['Total Assets'])
+    fetcher = ScriptedFetcher(frame)
+    store = FundamentalsStore(fetcher, str(tmp_path), ttl=10, empty_ttl=5, clock=lambda: now[0])
+    store.get('TEST')
+    now[0] = 100.0
+    fetcher.frame = pd.DataFrame()
+    store.refresh('TEST')
+    statements, meta = store._load('TEST')
+    assert statements['cashflow'].equals(frame) and meta['empty'] == STATEMENTS
+    # so it is checked again after empty_ttl
+    now[0] = 105.0
+    assert store.get('TEST')[2] is True
+
+
+def test_failed_background_refresh_is_logged_and_keeps_stored(tmp_path, caplog):
+    now = [0.0]
+    frame = pd.DataFrame({'2023': [1.0]}, index=['Total Assets'])
+    fetcher = ScriptedFetcher(frame)
+    store = FundamentalsStore(fetcher, str(tmp_path), ttl=10, clock=lambda: now[0])
+    store.get('TEST')
+
+    now[0] = 100.0
+    fetcher.frame = RuntimeError('throttled')
+    with caplog.at_level(logging.WARNING, logger='fundamentals'):
+        statements, fetched_at, refreshing = store.get('TEST')
+        assert refreshing
+        store._pool.shutdown(wait=True)
+    assert 'throttled' in caplog.text
+    assert fetched_at == 0.0 and statements['cashflow'].equals(frame)
+    assert store._load('TEST')[1]['fetched_at'] == 0.0
+
+    # No new attempt until retry_after has passed since the failure
+    store._pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    calls = fetcher.calls
+    now[0] = 100.0 + store.retry_after - 1
+    assert store.get('TEST')[2] is False and fetcher.calls == calls
+    now[0] = 100.0 + store.retry_after
+    assert store.get('TEST')[2] is True
@@ -0,0 +1,99 @@
+# tests/test_http_client.py
+import socket
+import threading
+
+import pytest
+import requests
+
+from http_client import CircuitBreaker, CircuitOpenError, HttpClient, _never_sent
+
+
+def closed_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def hangup_server():
+    # Reads the request, then closes the connection without answering
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen()
+    hits = []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                conn.recv(65536)
+                hits.append(1)
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield f"http://127.0.0.1:{server.getsockname()[1]}", hits
+    server.close()
+
+
+def test_refused_connection_was_never_sent():
+    with pytest.raises(requests.exceptions.ConnectionError) as info:
+        requests.post(f"http://127.0.0.1:{closed_port()}/", timeout=1)
+    assert _never_sent(info.value)
+
+
+def test_dropped_response_was_sent(hangup_server):
+    url, hits = hangup_server
+    with pytest.raises(requests.exceptions.ConnectionError) as info:
+        requests.post(url, timeout=1)
+    assert hits and not _never_sent(info.value)
+
+
+def test_error_text_alone_is_not_a_connect_failure():
+    assert not _never_sent(requests.exceptions.ConnectionError("Connection refused by the upstream app"))
+    assert _never_sent(requests.exceptions.ConnectTimeout())
+
+
+def test_post_is_retried_only_when_never_sent(hangup_server, monkeypatch):
+    monkeypatch.setattr(HttpClient, '_sleep_before_retry', lambda self, attempt: None)
+    url, hits = hangup_server
+    client = HttpClient(retries=2)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post(url)
+    assert len(hits) == 1
+
+    calls = []
+    real = client.session.request
+    client.session.request = lambda *a, **k: calls.append(1) or real(*a, **k)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post(f"http://127.0.0.1:{closed_port()}/")
+    assert len(calls) == 3
+
+
+def test_unexpected_error_frees_the_trial():
+    now = [0.0]
+    client = HttpClient(retries=0, breaker_threshold=1, breaker_cooldown=10)
+    client._breakers['example.test'] = breaker = CircuitBreaker(1, 10, clock=lambda: now[0])
+    breaker.record(False)
+    now[0] = 10
+
+    def explode(*args, **kwargs):
+        raise ValueError("bad hook")
+    client.session.request = explode
+    with pytest.raises(ValueError):
+        client.get('http://example.test/')
+    # Still open, but the next caller gets the trial instead of CircuitOpenError
+    assert breaker.opened_at is not None
+    client.session.request = lambda *a, **k: type('R', (), {'status_code': 200, 'content': b''})()
+    assert client.get('http://example.test/').status_code == 200
+    assert breaker.opened_at is None
+
+
+def test_open_breaker_rejects_without_a_trial():
+    breaker = CircuitBreaker(1, 10, clock=lambda: 0.0)
+    breaker.record(False)
+    client = HttpClient()
+    client._breakers['example.test'] = breaker
+    with pytest.raises(CircuitOpenError):
+        client.get('http://example.test/')
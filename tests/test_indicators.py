@@ -0,0 +1,81 @@
+# tests/test_indicators.py
+# Batch functions, streaming updates and seed-then-append must produce the
+# same series, including histories shorter than an indicator's window.
+import numpy as np
+import pytest
+
+from indicators import INDICATORS, IndicatorPipeline
+
+
+def close_prices(bars, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.cumprod(1 + rng.normal(0.0003, 0.02, size=bars))
+
+
+def outputs(output_names, values):
+    return {output_names[0]: values} if len(output_names) == 1 else dict(zip(output_names, values))
+
+
+def assert_same(expected, actual, mode):
+    assert expected.keys() == actual.keys()
+    for key in expected:
+        assert len(actual[key]) == len(expected[key]), f"{key}: {mode} length"
+        np.testing.assert_allclose(actual[key], expected[key], rtol=1e-9, atol=1e-9, equal_nan=True,
+                                   err_msg=f"{key}: {mode} disagrees with batch")
+
+
+LENGTHS = [0, 1, 2, 5, 13, 14, 15, 19, 20, 21, 30, 60, 500]
+
+
+@pytest.mark.parametrize('name', list(INDICATORS))
+@pytest.mark.parametrize('bars', LENGTHS)
+def test_streaming_matches_batch(name, bars):
+    batch_fn, factory, output_names = INDICATORS[name]
+    prices = close_prices(bars)
+    assert_same(outputs(output_names, batch_fn(prices)), outputs(output_names, factory().extend(prices)),
+                'streaming')
+
+
+@pytest.mark.parametrize('name', list(INDICATORS))
+@pytest.mark.parametrize('bars,split', [(500, 377), (500, 1), (500, 0), (60, 10), (30, 25), (12, 5), (3, 1)])
+def test_seed_then_append_matches_batch(name, bars, split):
+    prices = close_prices(bars, seed=1)
+    expected = IndicatorPipeline([name]).batch(prices)
+    pipeline = IndicatorPipeline([name])
+    head = pipeline.batch(prices[:split])
+    tail = pipeline.append(prices[split:])
+    assert_same(expected, {k: np.concatenate([head[k], tail[k]]) for k in head}, 'seed+append')
+    assert pipeline.length == bars
+
+
+def test_appending_bar_by_bar():
+    prices = close_prices(300, seed=2)
+    pipeline = IndicatorPipeline(list(INDICATORS))
+    head = pipeline.batch(prices[:50])
+    rows = [pipeline.append(prices[i:i + 1]) for i in range(50, 300)]
+    appended = {k: np.concatenate([head[k]] + [row[k] for row in rows]) for k in head}
+    assert_same(IndicatorPipeline(list(INDICATORS)).batch(prices), appended, 'bar-by-bar append')
+
+
+def test_flat_prices_stay_finite():
+    # A flat window must give zero deviation, not rounding noise or NaN
+    prices = np.concatenate([close_prices(40), np.full(100, 123.45)])
+    values = IndicatorPipeline(['Bollinger Bands']).batch(prices)
+    stream = INDICATORS['Bollinger Bands'][1]().extend(prices)
+    np.testing.assert_allclose(stream[1][-50:], values['BB Upper'][-50:], atol=1e-9)
+    np.testing.assert_allclose(stream[1][-50:], 123.45, atol=1e-6)
+
+
+def test_session_cache_recomputes_a_replaced_last_bar(monkeypatch):
+    import streamlit as st
+
+    from sections.common import indicator_series
+    monkeypatch.setattr(st, 'session_state', {})
+    names = list(INDICATORS)
+    close = close_prices(60)
+    dates = np.arange(60)
+    # Day 58 is first seen as a partial bar, then with its final close and a new day after it
+    partial = close.copy()
+    partial[58] *= 1.05
+    indicator_series('TEST', dates[:-1], partial[:-1], names)
+    assert_same(IndicatorPipeline(names).batch(close), indicator_series('TEST', dates, close, names), 'cached')
@@ -0,0 +1,57 @@
+# tests/test_intraday.py
+import numpy as np
+
+from intraday import BAR_DTYPE, IntradayFetcher, IntradayStore, has_session, to_epoch
+
+
+class MinuteFetcher(IntradayFetcher):
+    """One bar a minute across the whole range, or nothing while `down` is set."""
+
+    def __init__(self):
+        self.down = False
+        self.calls = 0
+
+    def fetch(self, ticker, start, end, interval):
+        self.calls += 1
+        if self.down:
+            return np.empty(0, dtype=BAR_DTYPE)
+        bars = np.zeros((end - start) // 60, dtype=BAR_DTYPE)
+        bars['time'] = np.arange(start, start + 60 * len(bars), 60)
+        bars['close'] = 1.0
+        return bars
+
+
+def store(tmp_path, fetcher):
+    return IntradayStore(fetcher, str(tmp_path), clock=lambda: to_epoch('2024-01-20'))
+
+
+def test_empty_fetch_over_a_session_is_retried(tmp_path):
+    fetcher = MinuteFetcher()
+    fetcher.down = True
+    cache = store(tmp_path, fetcher)
+    start, end = '2024-01-10 14:00', '2024-01-10 16:00'  # Wednesday, 09:00-11:00 New York
+    assert len(cache.get('TEST', start, end)) == 0
+    assert cache.coverage('TEST', '1m') is None
+
+    fetcher.down = False
+    assert len(cache.get('TEST', start, end)) == 120
+    assert fetcher.calls == 2
+    assert cache.coverage('TEST', '1m') == (to_epoch(start), to_epoch(end))
+
+
+def test_empty_fetch_outside_sessions_is_covered(tmp_path):
+    fetcher = MinuteFetcher()
+    cache = store(tmp_path, fetcher)
+    cache.get('TEST', '2024-01-12 20:00', '2024-01-12 21:00')
+    fetcher.down = True
+    # Friday after the close through the weekend has no session to wait for
+    cache.get('TEST', '2024-01-12 20:00', '2024-01-14 12:00')
+    assert cache.coverage('TEST', '1m')[1] == to_epoch('2024-01-14 12:00')
+    cache.get('TEST', '2024-01-12 20:00', '2024-01-14 12:00')
+    assert fetcher.calls == 2
+
+
+def test_has_session():
+    assert has_session(to_epoch('2024-01-10 15:59'), to_epoch('2024-01-10 16:01'))
+    assert not has_session(to_epoch('2024-01-10 21:00'), to_epoch('2024-01-11 14:30'))
+    assert not has_session(to_epoch('2024-01-13'), to_epoch('2024-01-15'))
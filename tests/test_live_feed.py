@@ -0,0 +1,24 @@
+# tests/test_live_feed.py
+import sys
+import types
+
+from live_feed import LiveStream, YFinanceQuoteFeed
+
+
+class FakeTicker:
+    def __init__(self, symbol):
+        if symbol == 'BAD':
+            raise KeyError('currentTradingPeriod')
+        self.fast_info = {'last_price': 10.0}
+
+
+def test_one_bad_ticker_does_not_starve_the_others(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'yfinance', types.SimpleNamespace(Ticker=FakeTicker))
+    feed = YFinanceQuoteFeed()
+    stream = LiveStream(feed)
+    stream._thread = object()  # poll by hand instead of from the background thread
+    stream.watch(['AAPL', 'BAD', 'MSFT'])
+    stream.poll_once()
+    assert stream.errors == 0 and feed.errors == {'BAD': 1}
+    assert stream.buffer('AAPL').count == stream.buffer('MSFT').count == 1
+    assert stream.buffer('BAD').count == 0
@@ -0,0 +1,42 @@
+# tests/test_metrics.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics import compute_metrics, correlation_matrix
+
+
+def returns(days=600, tickers=12, seed=0):
+    rng = np.random.default_rng(seed)
+    r = rng.normal(0.0003, 0.02, size=(days, tickers))
+    r[:, 1] = 0.7 * r[:, 0] + 0.3 * r[:, 1]
+    r[:, 2] = -r[:, 0]
+    return r
+
+
+@pytest.mark.parametrize('gaps', [False, True])
+def test_correlation_matches_pairwise_pearson(gaps):
+    r = returns()
+    if gaps:
+        rng = np.random.default_rng(1)
+        r[rng.random(r.shape) < 0.2] = np.nan
+        r[:250, 5] = np.nan  # listed later than the others
+    expected = pd.DataFrame(r).corr().to_numpy()
+    np.testing.assert_allclose(correlation_matrix(r), expected, atol=1e-6)
+
+
+def test_correlation_stays_within_bounds_without_clipping():
+    r = returns()
+    r[::3, 1] = np.nan
+    corr = correlation_matrix(r)
+    assert np.all(np.abs(corr) <= 1 + 1e-6)
+    assert np.all(np.diag(corr) == 1.0)
+    assert corr[0, 2] == pytest.approx(-1.0, abs=1e-6)
+
+
+def test_flat_ticker_has_no_correlation():
+    prices = 100 * np.cumprod(1 + returns(tickers=3), axis=0)
+    prices[:, 1] = 50.0
+    corr = compute_metrics(prices)['correlation']
+    assert np.isnan(corr[1]).all() and np.isnan(corr[:, 1]).all()
+    assert corr[0, 0] == 1.0
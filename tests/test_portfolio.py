@@ -0,0 +1,21 @@
+# tests/test_portfolio.py
+import numpy as np
+import pytest
+
+from portfolio import PortfolioModel
+
+
+def test_flat_prices_raise_value_error():
+    prices = np.full((60, 3), 100.0)
+    with pytest.raises(ValueError):
+        PortfolioModel(prices)
+    with pytest.raises(ValueError):
+        PortfolioModel.from_moments([0.1, 0.2], np.zeros((2, 2)))
+
+
+def test_one_flat_ticker_still_optimizes():
+    rng = np.random.default_rng(0)
+    prices = 100 * np.cumprod(1 + rng.normal(0.0005, 0.01, size=(250, 3)), axis=0)
+    prices[:, 2] = 50.0
+    weights = PortfolioModel(prices).max_sharpe()
+    assert np.isfinite(weights).all() and weights.sum() == pytest.approx(1.0)
@@ -0,0 +1,76 @@
+# tests/test_price_cache.py
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from price_cache import OHLCV_COLUMNS, PriceCache, PriceFetcher
+
+
+class ConstantFetcher(PriceFetcher):
+    """Every calendar day in the range at one price, which tests can change."""
+
+    def __init__(self, price):
+        self.price = price
+        self.calls = []
+
+    def fetch(self, ticker, start, end):
+        self.calls.append((start, end))
+        index = pd.date_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), name='Date')
+        return pd.DataFrame(self.price, index=index, columns=OHLCV_COLUMNS)
+
+
+def test_refetched_bars_replace_stored_ones(tmp_path):
+    # Today's bar is never marked covered, so the next get downloads it again
+    # and the fresh value has to replace the partial one saved earlier
+    today = pd.Timestamp(datetime.date.today())
+    start, end = today - pd.Timedelta(days=10), today + pd.Timedelta(days=1)
+    fetcher = ConstantFetcher(1.0)
+    cache = PriceCache(fetcher, str(tmp_path))
+    first = cache.get('TEST', start, end)
+
+    fetcher.price = 2.0
+    second = cache.get('TEST', start, end)
+    assert len(fetcher.calls) == 2
+    assert first.loc[today, 'Close'] == 1.0
+    assert second.loc[today, 'Close'] == 2.0
+    # Days before today were covered and are not fetched again
+    assert (second.loc[:today - pd.Timedelta(days=1), 'Close'] == 1.0).all()
+    # and the replacement is what was stored
+    assert PriceCache(ConstantFetcher(3.0), str(tmp_path))._load('TEST')[1][-1, 3] == 2.0
+
+
+def test_covered_range_is_served_from_disk(tmp_path):
+    fetcher = ConstantFetcher(5.0)
+    cache = PriceCache(fetcher, str(tmp_path))
+    cache.get('TEST', '2020-01-01', '2021-01-01')
+    frame = cache.get('TEST', '2020-03-01', '2020-04-01')
+    assert len(fetcher.calls) == 1
+    assert cache.stats()['hits'] == 1
+    assert frame.index.min() >= pd.Timestamp('2020-03-01') and frame.index.max() < pd.Timestamp('2020-04-01')
+    assert np.all(frame['Close'] == 5.0)
+
+
+def test_empty_fetch_is_not_marked_covered(tmp_path):
+    # yf.download returns an empty frame instead of raising when it fails
+    fetcher = ConstantFetcher(1.0)
+    fetcher.fetch = lambda ticker, start, end: fetcher.calls.append((start, end)) or pd.DataFrame()
+    cache = PriceCache(fetcher, str(tmp_path))
+    assert cache.get('TEST', '2020-01-01', '2020-02-01').empty
+    assert cache.coverage('TEST') is None
+
+    del fetcher.fetch
+    assert len(cache.get('TEST', '2020-01-01', '2020-02-01')) == 31
+    assert len(fetcher.calls) == 2
+
+
+def test_empty_tail_keeps_the_covered_head(tmp_path):
+    fetcher = ConstantFetcher(1.0)
+    cache = PriceCache(fetcher, str(tmp_path))
+    cache.get('TEST', '2020-01-01', '2020-02-01')
+    fetcher.fetch = lambda ticker, start, end: pd.DataFrame()
+    cache.get('TEST', '2020-01-01', '2020-03-01')
+    assert cache.coverage('TEST') == (np.datetime64('2020-01-01'), np.datetime64('2020-02-01'))
+    # A gap without business days has nothing to wait for
+    cache.get('TEST', '2020-02-01', '2020-02-03')
+    assert cache.coverage('TEST')[1] == np.datetime64('2020-02-03')
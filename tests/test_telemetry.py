@@ -0,0 +1,64 @@
+# tests/test_telemetry.py
+import itertools
+import json
+
+from telemetry import Registry, SharedSnapshots
+
+
+def test_prometheus_families_are_contiguous():
+    registry = Registry()
+    for endpoint in ('a', 'b', 'c'):
+        registry.observe('http_server', 0.02, size=10, endpoint=endpoint)
+    registry.observe('sql_query', 0.001, error=True, kind='SELECT', table='posts')
+    lines = [line for line in registry.prometheus().splitlines() if not line.startswith('#')]
+
+    def family(line):
+        name = line.split('{')[0].split(' ')[0]
+        for suffix in ('_bucket', '_sum', '_count'):
+            if name.endswith(f'_seconds{suffix}'):
+                return name[:-len(suffix)]
+        return name
+
+    # Every family appears in one run of lines
+    runs = [key for key, _ in itertools.groupby(lines, family)]
+    assert len(runs) == len(set(runs))
+    assert 'stockanalyzer_sql_query_errors_total{kind="SELECT",table="posts"} 1' in lines
+
+
+def test_metrics_need_loopback_or_token(forum, monkeypatch):
+    client = forum.app.test_client()
+    assert client.get('/metrics').status_code == 200
+
+    client.environ_base['REMOTE_ADDR'] = '203.0.113.5'
+    assert client.get('/metrics').status_code == 403
+    assert client.get('/auth/metrics').status_code == 403
+
+    monkeypatch.setitem(forum.auth_settings, 'metrics_token', 'secret')
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+    response = client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200 and response.mimetype == 'text/plain'
+
+
+def test_collector_totals_are_counters():
+    registry = Registry()
+    registry.register_collector('cache', lambda: {'hits': 3, 'misses': 1, 'entries': 2})
+    lines = registry.prometheus().splitlines()
+    assert '# TYPE stockanalyzer_cache_hits_total counter' in lines
+    assert 'stockanalyzer_cache_misses_total 1' in lines
+    assert '# TYPE stockanalyzer_cache_entries gauge' in lines
+
+
+def test_shared_snapshots_sum_every_worker(tmp_path):
+    registry = Registry()
+    registry.observe('http_server', 0.02, endpoint='a')
+    registry.register_collector('cache', lambda: {'hits': 3, 'entries': 2})
+    shared = SharedSnapshots(str(tmp_path), registry)
+    # A worker that has since exited: its totals still count, its gauges don't
+    gone = registry.snapshot()
+    gone['pid'] = 2 ** 22 + 1
+    (tmp_path / f"{gone['pid']}.json").write_text(json.dumps(gone))
+
+    lines = shared.prometheus().splitlines()
+    assert 'stockanalyzer_http_server_seconds_count{endpoint="a"} 2' in lines
+    assert 'stockanalyzer_cache_hits_total 6' in lines
+    assert 'stockanalyzer_cache_entries 2' in lines
@@ -0,0 +1,75 @@
+# tests/test_ttl_cache.py
+import threading
+import time
+
+import pytest
+
+from ttl_cache import TTLCache
+
+
+class Interrupted(BaseException):
+    pass
+
+
+def wait_for_waiters(cache, count):
+    deadline = time.monotonic() + 5
+    while cache.stats()['coalesced'] < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_waiters_are_released_when_the_loader_raises_a_base_exception():
+    cache = TTLCache()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def loader():
+        started.set()
+        release.wait()
+        raise Interrupted()
+
+    def waiter():
+        try:
+            cache.get('key', lambda: 'unused')
+        except BaseException as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=lambda: pytest.raises(Interrupted, cache.get, 'key', loader), daemon=True)
+    leader.start()
+    started.wait()
+    waiters = [threading.Thread(target=waiter, daemon=True) for _ in range(4)]
+    for t in waiters:
+        t.start()
+    wait_for_waiters(cache, 4)
+    release.set()
+    for t in [leader, *waiters]:
+        t.join(timeout=5)
+        assert not t.is_alive()
+    assert cache.stats()['coalesced'] == len(errors) == 4
+    assert all(isinstance(e, Interrupted) for e in errors)
+    # Nothing was cached and nothing is left in flight
+    assert cache.get('key', lambda: 'fresh') == 'fresh'
+
+
+def test_coalesced_waiters_share_one_load():
+    cache = TTLCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('key', loader)), daemon=True)
+               for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for t in threads[1:]:
+        t.start()
+    wait_for_waiters(cache, 4)
+    release.set()
+    for t in threads:
+        t.join(timeout=5)
+    assert results == ['value'] * 5 and len(calls) == 1
@@ -0,0 +1,53 @@
+# tests/test_upvotes.py
+import threading
+
+THREADS = 8
+VOTES_PER_THREAD = 50
+
+
+def upvotes(forum, post_id):
+    session_db = forum.Session()
+    try:
+        return session_db.query(forum.Post).get(post_id).upvotes, \
+            session_db.query(forum.Vote).filter_by(post_id=post_id).count()
+    finally:
+        session_db.close()
+
+
+def test_concurrent_upvotes_are_all_counted(forum, new_post):
+    post_id = new_post()
+    results = []
+
+    def worker(thread_index):
+        for i in range(VOTES_PER_THREAD):
+            results.append(forum.vote_batcher.submit(post_id, thread_index * VOTES_PER_THREAD + i + 1))
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    expected = THREADS * VOTES_PER_THREAD
+    assert results.count('ok') == expected
+    assert upvotes(forum, post_id) == (expected, expected)
+
+
+def test_second_vote_by_the_same_user_is_rejected(forum, new_post):
+    post_id = new_post()
+    client = forum.app.test_client()
+    credentials = {'username': 'voter', 'password': 'voter-password'}
+    assert client.post('/register', json=credentials).status_code == 201
+    assert client.post('/login', json=credentials).status_code == 200
+
+    assert client.post(f'/posts/{post_id}/upvote').status_code == 200
+    assert client.post(f'/posts/{post_id}/upvote').status_code == 409
+    # The rejected vote's increment was rolled back with it
+    assert upvotes(forum, post_id) == (1, 1)
+    assert client.post('/posts/999999/upvote').status_code == 404
+
+
+def test_one_batch_resolves_each_vote(forum, new_post):
+    post_id = new_post()
+    batch = [(post_id, 1, None), (post_id, 1, None), (999999, 2, None), (post_id, 2, None)]
+    assert forum.vote_batcher._write(batch) == ['ok', 'duplicate', 'not_found', 'ok']
+    assert upvotes(forum, post_id) == (2, 2)
@@ -0,0 +1,98 @@
+# ttl_cache.py
+# In-process cache shared by the app (news per ticker) and the forum backend
+# (users by id). Standard library only, so the backend doesn't import the
+# news fetching code or its dependencies.
+import concurrent.futures
+import threading
+import time
+from collections import OrderedDict
+
+
+def _entry_size(value):
+    # Rough memory footprint of a cached entry: the text it holds
+    if isinstance(value, dict):
+        return sum(_entry_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_entry_size(v) for v in value)
+    if isinstance(value, str):
+        return len(value)
+    return 8
+
+
+class TTLCache:
+    """Thread-safe TTL + LRU cache with a size budget and coalesced loads.
+
+    get(key, loader) returns the cached value while it is younger than ttl.
+    Otherwise one caller runs loader() and every other caller asking for the
+    same key meanwhile waits for that result instead of fetching again.
+    """
+
+    def __init__(self, ttl=900, max_entries=256, max_bytes=8 * 1024 * 1024, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.bytes = 0
+        self._entries = OrderedDict()  # key -> (fetched_at, size, value)
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'coalesced': self.coalesced,
+                    'entries': len(self._entries), 'bytes': self.bytes}
+
+    def get(self, key, loader):
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and self.clock() - cached[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[2]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        # Waiters block on the future, so it has to be resolved whatever the
+        # loader raises, KeyboardInterrupt and SystemExit included
+        try:
+            value = loader()
+            self._store(key, value)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _store(self, key, value):
+        size = _entry_size(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.bytes -= old[1]
+            self._entries[key] = (self.clock(), size, value)
+            self.bytes += size
+            # Evict least recently used entries, but never the one just stored
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+
+    def invalidate(self, key):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.bytes -= old[1]